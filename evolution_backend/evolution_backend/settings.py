@@ -48,7 +48,7 @@ AUTH_USER_MODEL = 'kanbanapi.CustomUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication', # Enable Token Authentication
+        'kanbanapi.authentication.CachedTokenAuthentication', # Token Authentication with cached token -> user lookups
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated', # Require authentication for API endpoints by default
@@ -102,6 +102,57 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Analytics responses are cached per user and keyed by data versions stored in the database,
+# so any backend works: the local-memory default, or e.g. FileBasedCache / DatabaseCache to share it between processes.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Token -> user lookups cached by kanbanapi.authentication.CachedTokenAuthentication.
+# With several processes and a shared cache backend, set USE_DJANGO_CACHE so revocations reach every process
+# (the per-process LRU still trusts an entry for TTL seconds; set SIZE to 0 for immediate revocation).
+TOKEN_AUTH_CACHE = {
+    'SIZE': 10000,
+    'TTL': 60,
+    'USE_DJANGO_CACHE': False,
+}
+
+# Database job queue (kanbanapi.jobs_logic): badge checks, the per-user habit rollover at login, position rebalancing.
+# With EAGER off, queued jobs only run if at least one `python manage.py run_jobs` worker is running next to the web
+# processes (e.g. as a systemd service); without one, users get no habit trackers/tasks at login and earn no badges.
+# EAGER runs each job in the request right after its transaction commits: the default while DEBUG is on, so a
+# development server works without a worker. Deployments that don't run a worker must set it to True.
+JOB_QUEUE = {
+    'EAGER': DEBUG,
+}
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+# Background job failures (kanbanapi.jobs_logic) are logged with their traceback, which is also kept on the Job row.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'kanbanapi': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
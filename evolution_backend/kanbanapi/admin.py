@@ -1,12 +1,17 @@
 # kanbanapi/admin.py
 from django.contrib import admin
-from .models import Badge, TaskCard, HabitList, HabitTracker, Event, JournalEntry, UserBadge # Import your models, including Badge
+from .models import Badge, TaskCard, HabitList, HabitTracker, HabitDaySummary, HabitYearBitmap, Event, JournalEntry, UserBadge, UserActivityCounters, Tombstone, Job # Import your models, including Badge
 
 # Register your models here.
 admin.site.register(Badge)
 admin.site.register(TaskCard)
 admin.site.register(HabitList)
 admin.site.register(HabitTracker)
+admin.site.register(HabitDaySummary)
+admin.site.register(HabitYearBitmap)
 admin.site.register(Event)
 admin.site.register(JournalEntry)
-admin.site.register(UserBadge)
\ No newline at end of file
+admin.site.register(UserBadge)
+admin.site.register(UserActivityCounters)
+admin.site.register(Tombstone)
+admin.site.register(Job)
@@ -0,0 +1,204 @@
+# kanbanapi/analytics_logic.py
+import datetime
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDay, TruncWeek, TruncMonth
+from django.utils import timezone
+from .models import TaskCard, HabitDaySummary, Event
+from .counters_logic import get_counters, journal_metrics
+from .habits_logic import compute_habit_streaks
+
+
+def current_week(today):
+    """
+    Returns the (Monday, Sunday) dates of the week containing `today`.
+    """
+    start_of_week = today - datetime.timedelta(days=today.weekday())
+    return start_of_week, start_of_week + datetime.timedelta(days=6)
+
+
+def task_counts_data(counters, choices):
+    """
+    Formats the user's task counters for one choice field as [{'name': value, 'value': count}],
+    leaving out values without tasks.
+    """
+    counts = [(value, getattr(counters, f'tasks_{value}')) for value, _ in choices]
+    return [{'name': value, 'value': count} for value, count in counts if count]
+
+
+# Supported granularities of task_completion_series(): the truncation applied to due_date.
+COMPLETION_GRANULARITIES = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+# Upper bound on the number of periods a completion series may contain.
+MAX_COMPLETION_PERIODS = 2000
+
+
+def period_start(day, granularity):
+    """
+    Returns the first day of the period (day, ISO week or month) containing `day`.
+    """
+    if granularity == 'week':
+        return day - datetime.timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_period_start(day, granularity):
+    if granularity == 'week':
+        return day + datetime.timedelta(days=7)
+    if granularity == 'month':
+        return (day.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    return day + datetime.timedelta(days=1)
+
+
+def completion_periods(start, end, granularity):
+    """
+    Returns the start dates of every period between `start` and `end` (inclusive).
+    """
+    periods = []
+    current = period_start(start, granularity)
+    while current <= end:
+        periods.append(current)
+        current = next_period_start(current, granularity)
+    return periods
+
+
+def task_completion_series(user, start, end, granularity='day'):
+    """
+    Task counts per status for each period between `start` and `end` by due date, in one GROUP BY query.
+    Periods without tasks are zero-filled. Returns [{'period': 'YYYY-MM-DD', 'to_do': 0, 'processing': 1, 'done': 2}].
+    """
+    trunc = COMPLETION_GRANULARITIES[granularity]
+    statuses = [value for value, _ in TaskCard.STATUS_CHOICES]
+    counts_by_period = {
+        row.pop('period'): row
+        for row in TaskCard.objects.filter(user=user, due_date__range=(start, end))
+        .annotate(period=trunc('due_date'))
+        .values('period')
+        .annotate(**{value: Count('id', filter=Q(status=value)) for value in statuses})
+        .order_by()
+    }
+    series = []
+    for period in completion_periods(start, end, granularity):
+        counts = counts_by_period.get(period, {})
+        series.append({'period': period.isoformat(), **{value: counts.get(value, 0) for value in statuses}})
+    return series
+
+
+def task_completion_week_data(user, today):
+    """
+    Done / to-do task counts for each day of the current week.
+    """
+    start_of_week, end_of_week = current_week(today)
+    return [
+        {'dueDate': day['period'], 'Done': day['done'], 'ToDo': day['to_do']}
+        for day in task_completion_series(user, start_of_week, end_of_week, 'day')
+    ]
+
+
+def habit_completion_week_data(user, today):
+    """
+    Number of completed habits for each day of the current week, read from the daily summaries.
+    """
+    start_of_week, end_of_week = current_week(today)
+    completed_by_day = dict(
+        HabitDaySummary.objects.filter(user=user, date__range=(start_of_week, end_of_week)).values_list('date', 'completed')
+    )
+    weekly_data = []
+    for i in range(7):
+        current_date = start_of_week + datetime.timedelta(days=i)
+        weekly_data.append({
+            'day': current_date.strftime('%a'),  # Abbreviated day name
+            'completedHabits': completed_by_day.get(current_date, 0),
+        })
+    return weekly_data
+
+
+def habit_streak_data(user):
+    streaks = compute_habit_streaks(user)
+    return {
+        'habitStreak': streaks['current'],
+        'longestStreak': streaks['longest'],
+        'topStreaks': streaks['top'],
+    }
+
+
+def journal_stats_data(user, today):
+    metrics = journal_metrics([user.pk], today)[user.pk]
+    return {
+        'journalDays': metrics['days'],
+        'currentStreak': metrics['current_streak'],
+        'longestStreak': metrics['longest_streak'],
+        'lastEntryDate': metrics['last_date'],
+        'entriesThisWeek': metrics['entries_this_week'],
+        'entriesThisMonth': metrics['entries_this_month'],
+    }
+
+
+def upcoming_events_data(user, now):
+    """
+    Events from `now` until the end of the current month.
+    """
+    # To get the end of the current month (exclusive), we go to the start of the next month.
+    if now.month == 12:
+        next_month_start = now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    else:
+        next_month_start = now.replace(month=now.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    upcoming_events = Event.objects.filter(
+        user=user,
+        start_time__gte=now,          # Filter for events starting from the current date and time onwards
+        start_time__lt=next_month_start # Filter for events starting before the beginning of the next month
+    ).order_by('start_time')
+
+    return [
+        {
+            'id': event.id,
+            'title': event.subject,
+            'location': event.location,
+            'start_time': event.start_time.isoformat(), # Send full ISO 8601 string
+            'end_time': event.end_time.isoformat(),     # Send full ISO 8601 string
+            'description': event.description,
+            'category_color': event.category_color,
+        }
+        for event in upcoming_events
+    ]
+
+
+# Dashboard sections, in response order. The three task count sections share one counters row.
+DASHBOARD_SECTIONS = [
+    'statusCounts', 'priorityCounts', 'typeCounts', 'completionRate', 'weeklyHabits', 'habitStreak', 'upcomingEvents',
+]
+
+
+def dashboard_data(user, sections=None):
+    """
+    Builds the dashboard payload for the requested `sections` (all of them by default).
+    """
+    sections = DASHBOARD_SECTIONS if sections is None else [name for name in DASHBOARD_SECTIONS if name in sections]
+    now = timezone.now()
+    today = now.date()
+    counters = None
+    data = {}
+    for name in sections:
+        if name in ('statusCounts', 'priorityCounts', 'typeCounts'):
+            counters = counters or get_counters(user)
+            choices = {
+                'statusCounts': TaskCard.STATUS_CHOICES,
+                'priorityCounts': TaskCard.PRIORITY_CHOICES,
+                'typeCounts': TaskCard.TASK_TYPE_CHOICES,
+            }[name]
+            data[name] = task_counts_data(counters, choices)
+        elif name == 'completionRate':
+            data[name] = task_completion_week_data(user, today)
+        elif name == 'weeklyHabits':
+            data[name] = habit_completion_week_data(user, today)
+        elif name == 'habitStreak':
+            data[name] = habit_streak_data(user)
+        elif name == 'upcomingEvents':
+            data[name] = upcoming_events_data(user, now)
+    return data
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class KanbanapiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'kanbanapi'
+
+    def ready(self):
+        from . import signals # noqa: F401 (connects the token cache invalidation receivers)
@@ -0,0 +1,124 @@
+# kanbanapi/authentication.py
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+# Settings (see TOKEN_AUTH_CACHE in settings.py):
+#   SIZE: tokens kept in each process's LRU (0 disables it), TTL: seconds an entry is trusted,
+#   USE_DJANGO_CACHE: also share entries through the Django cache, so processes can reuse and revoke them.
+TOKEN_AUTH_CACHE_DEFAULTS = {'SIZE': 10000, 'TTL': 60, 'USE_DJANGO_CACHE': False}
+
+
+def _token_cache_settings():
+    return {**TOKEN_AUTH_CACHE_DEFAULTS, **getattr(settings, 'TOKEN_AUTH_CACHE', {})}
+
+
+def _django_cache_key(key):
+    # Don't put raw tokens into the cache's key space
+    return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+class TokenUserCache:
+    """
+    Thread-safe LRU of token key -> (user, token) with a time-to-live, optionally backed by the Django cache.
+    The per-process LRU can only be invalidated in the process that handles the change; entries in other processes
+    expire after TTL seconds. Set SIZE to 0 and USE_DJANGO_CACHE to True if revocation must be immediate everywhere.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict() # key -> (expires_at, user, token)
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        options = _token_cache_settings()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return entry[1], entry[2]
+                self._discard(key)
+        if options['USE_DJANGO_CACHE']:
+            cached = cache.get(_django_cache_key(key))
+            if cached is not None:
+                self._store_local(key, *cached, options)
+                return cached
+        return None
+
+    def set(self, key, user, token):
+        options = _token_cache_settings()
+        self._store_local(key, user, token, options)
+        if options['USE_DJANGO_CACHE']:
+            cache.set(_django_cache_key(key), (user, token), options['TTL'])
+
+    def invalidate(self, keys):
+        with self._lock:
+            for key in keys:
+                self._discard(key)
+        if _token_cache_settings()['USE_DJANGO_CACHE']:
+            cache.delete_many([_django_cache_key(key) for key in keys])
+
+    def invalidate_user(self, user_id):
+        """
+        Drops every cached token of the user (a user has one token, but a process may still hold a replaced one).
+        """
+        with self._lock:
+            keys = set(self._keys_by_user.get(user_id, ()))
+        keys.update(Token.objects.filter(user_id=user_id).values_list('key', flat=True))
+        self.invalidate(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _store_local(self, key, user, token, options):
+        if not options['SIZE']:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + options['TTL'], user, token)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > options['SIZE']:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            user_keys = self._keys_by_user.get(entry[1].pk)
+            if user_keys is not None:
+                user_keys.discard(key)
+                if not user_keys:
+                    del self._keys_by_user[entry[1].pk]
+
+
+token_user_cache = TokenUserCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for DRF's TokenAuthentication that caches the token -> user lookup,
+    so steady-state requests authenticate without a query.
+    Entries are invalidated when the token is deleted and when the user is saved (password change, deactivation,
+    profile update), see signals.py. Each request gets its own copy of the cached user.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_user_cache.get(key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key) # Raises AuthenticationFailed for unknown tokens or inactive users
+            token_user_cache.set(key, user, token)
+        else:
+            user, token = cached
+        user = copy.copy(user)
+        token = copy.copy(token)
+        token.user = user
+        return user, token
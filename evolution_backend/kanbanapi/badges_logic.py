@@ -1,207 +1,97 @@
 # kanbanapi/badges_logic.py
-from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
-from .models import Badge, UserBadge, TaskCard, HabitTracker, HabitList, Event, JournalEntry  # Import all necessary models
+from .models import Badge, UserBadge
+from .counters_logic import get_counters
+from .cache_logic import bump_data_versions
 
+# --- Badge criteria, expressed as data ---
+# Each rule awards the badge with `title` once the user's `metric` reaches `threshold`.
+# Adding a badge only means adding a rule here (and the Badge row in the database).
+BADGE_RULES = [
+    {'title': 'Organized', 'badge_type': 'task', 'metric': 'tasks_done', 'threshold': 10},
+    {'title': 'Productive', 'badge_type': 'task', 'metric': 'tasks_done', 'threshold': 20},
+    {'title': 'Streak Starter', 'badge_type': 'habit', 'metric': 'habit_streak', 'threshold': 3},
+    {'title': 'Streak Beginner', 'badge_type': 'habit', 'metric': 'habit_streak', 'threshold': 7},
+    {'title': 'Scheduler', 'badge_type': 'schedule', 'metric': 'events_created', 'threshold': 10},
+    {'title': 'Planner', 'badge_type': 'schedule', 'metric': 'events_created', 'threshold': 20},
+    {'title': 'Journal Starter', 'badge_type': 'journal', 'metric': 'journal_days', 'threshold': 7},  # journal for 7 days
+    {'title': 'Journal Beginner', 'badge_type': 'journal', 'metric': 'journal_streak', 'threshold': 7},  # journal for 7 days in a row
+]
 
-def check_organized_badge(user):
-    """
-    Checks if a user has earned the "Organized" badge (completed 10 tasks) and awards it if they have not already earned it.
-    """
-    organized_badge = Badge.objects.get(title="Organized")
-    if UserBadge.objects.filter(user=user, badge=organized_badge).exists():
-        return
-
-    completed_task_count = TaskCard.objects.filter(user=user, status='done').count()
-    if completed_task_count >= 10:
-        UserBadge.objects.create(user=user, badge=organized_badge)
-        print(f"Awarded 'Organized' badge to user: {user.username}")
 
-
-def check_productive_badge(user):
+def badge_types_reached(metric, old_value, new_value):
     """
-    Checks if a user has earned the "Productive" badge (completed 20 tasks) and awards it if they have not already earned it.
+    Returns the badge types with a `metric` rule whose threshold lies in (old_value, new_value], i.e. those a write
+    that moved the metric from `old_value` to `new_value` can have earned. With an unknown old value (None),
+    every badge type with a rule on the metric.
     """
-    productive_badge = Badge.objects.get(title="Productive")
-    if UserBadge.objects.filter(user=user, badge=productive_badge).exists():
-        return
-
-    completed_task_count = TaskCard.objects.filter(user=user, status='done').count()
-    if completed_task_count >= 20:
-        UserBadge.objects.create(user=user, badge=productive_badge)
-        print(f"Awarded 'Productive' badge to user: {user.username}")
-
-
-def check_streak_starter_badge(user):
-    """
-    Checks if a user has earned the "Streak Starter" badge based on their habit_streak field
-    and awards it if not already earned.
-    Criteria: habit_streak is 3 or more.
-    """
-    print(f"Checking 'Streak Starter' badge for user: {user.username}")
-
-    try:
-        # Attempt to get the 'Streak Starter' badge object from the database.
-        # This assumes you have a Badge object with the title "Streak Starter".
-        streak_starter_badge = Badge.objects.get(title="Streak Starter")
-        print(f"Found badge: {streak_starter_badge.title}")
-    except Badge.DoesNotExist:
-        # If the badge doesn't exist in the database, print an error and stop.
-        print("Error: 'Streak Starter' badge not found in the database. Please create it.")
-        return # Cannot award badge if it doesn't exist
-
-    # Check if the user already has this specific badge.
-    # We query the UserBadge model to see if an entry exists linking this user and this badge.
-    if UserBadge.objects.filter(user=user, badge=streak_starter_badge).exists():
-        print(f"User {user.username} already has the 'Streak Starter' badge. Skipping check.")
-        # If they already have it, there's nothing more to do, so we exit the function.
-        return
-
-    # Now, we check the user's 'habit_streak' field directly.
-    # This field is assumed to be updated elsewhere based on their daily habit completion.
-    print(f"User's current habit_streak: {user.habit_streak}")
-
-    # The criteria for the "Streak Starter" badge is a habit streak of 3 or more.
-    if user.habit_streak >= 3:
-        print(f"User {user.username} meets the criteria (streak is {user.habit_streak}, needs >= 3).")
-        # If the user's streak meets the criteria and they don't already have the badge, award it.
-        try:
-            # Create a new entry in the UserBadge table to link the user and the badge.
-            UserBadge.objects.create(user=user, badge=streak_starter_badge)
-            print(f"Successfully awarded 'Streak Starter' badge to user: {user.username}")
-        except Exception as e:
-            # Catch any potential errors during the badge creation process.
-            print(f"Error awarding 'Streak Starter' badge to {user.username}: {e}")
-    else:
-        # If the user's streak is less than 3, they don't meet the criteria yet.
-        print(f"User {user.username} does not meet the criteria (streak is {user.habit_streak}, needs >= 3).")
-
-
-def check_streak_beginner_badge(user):
-    """
-    Checks if a user has earned the "Streak Beginner" badge based on their habit_streak field
-    and awards it if not already earned.
-    Criteria: habit_streak is 7 or more.
-    """
-    print(f"Checking 'Streak Beginner' badge for user: {user.username}")
-
-    try:
-        # Attempt to get the 'Streak Beginner' badge object from the database.
-        # This assumes you have a Badge object with the title "Streak Beginner".
-        streak_beginner_badge = Badge.objects.get(title="Streak Beginner")
-        print(f"Found badge: {streak_beginner_badge.title}")
-    except Badge.DoesNotExist:
-        # If the badge doesn't exist in the database, print an error and stop.
-        print("Error: 'Streak Beginner' badge not found in the database. Please create it.")
-        return # Cannot award badge if it doesn't exist
-
-    # Check if the user already has this specific badge.
-    # We query the UserBadge model to see if an entry exists linking this user and this badge.
-    if UserBadge.objects.filter(user=user, badge=streak_beginner_badge).exists():
-        print(f"User {user.username} already has the 'Streak Beginner' badge. Skipping check.")
-        # If they already have it, there's nothing more to do, so we exit the function.
-        return
-
-    # Now, we check the user's 'habit_streak' field directly.
-    # This field is assumed to be updated elsewhere based on their daily habit completion.
-    print(f"User's current habit_streak: {user.habit_streak}")
-
-    # The criteria for the "Streak Beginner" badge is a habit streak of 7 or more.
-    if user.habit_streak >= 7:
-        print(f"User {user.username} meets the criteria (streak >= 7).")
-        # Award the badge
-        try:
-            # Create a new entry in the UserBadge table to link the user and the badge.
-            UserBadge.objects.create(user=user, badge=streak_beginner_badge)
-            print(f"Successfully awarded 'Streak Beginner' badge to user: {user.username}")
-        except Exception as e:
-            # Catch any potential errors during the badge creation process.
-            print(f"Error awarding 'Streak Beginner' badge to {user.username}: {e}")
-    else:
-        # If the user's streak is less than 7, they don't meet the criteria yet.
-        print(f"User {user.username} does not meet the criteria (streak is {user.habit_streak}, needs >= 7).")
+    return sorted({
+        rule['badge_type'] for rule in BADGE_RULES
+        if rule['metric'] == metric and (old_value is None or old_value < rule['threshold'] <= new_value)
+    })
 
-        
 
-def check_scheduler_badge(user):
+def get_badge_metrics(user):
     """
-    Checks if a user has earned the "Scheduler" badge (created 10 events) and awards it if not already earned.
+    Returns a snapshot of the user's badge metrics, read from the activity counters row,
+    e.g. {'tasks_done': 12, 'habit_streak': 4, ...}.
     """
-    scheduler_badge = Badge.objects.get(title="Scheduler")
-    if UserBadge.objects.filter(user=user, badge=scheduler_badge).exists():
-        return
-
-    event_count = Event.objects.filter(user=user).count()
-    if event_count >= 10:
-        UserBadge.objects.create(user=user, badge=scheduler_badge)
-        print(f"Awarded 'Scheduler' badge to user: {user.username}")
-
-
-def check_planner_badge(user):
-    """
-    Checks if a user has earned the "Planner" badge (created 20 events) and awards it if not already earned.
-    """
-    planner_badge = Badge.objects.get(title="Planner")
-    if UserBadge.objects.filter(user=user, badge=planner_badge).exists():
-        return
-
-    event_count = Event.objects.filter(user=user).count()
-    if event_count >= 20:
-        UserBadge.objects.create(user=user, badge=planner_badge)
-        print(f"Awarded 'Planner' badge to user: {user.username}")
-
-
-def check_journal_starter_badge(user):
-    """
-    Checks if a user has earned the "Journal Starter" badge (journal for 7 days) and awards it if not already earned.
-    """
-    journal_starter_badge = Badge.objects.get(title="Journal Starter")
-    if UserBadge.objects.filter(user=user, badge=journal_starter_badge).exists():
-        return
-
-    journal_entry_days = JournalEntry.objects.filter(user_id=user).dates('date_created', 'day') # Get unique days with journal entries
-    if len(journal_entry_days) >= 7:
-        UserBadge.objects.create(user=user, badge=journal_starter_badge)
-        print(f"Awarded 'Journal Starter' badge to user: {user.username}")
-
-
-def check_journal_beginner_badge(user):
-    """
-    Checks if a user has earned the "Journal Beginner" badge (journal for 7 days in a row) and awards it if not already earned.
-    """
-    journal_beginner_badge = Badge.objects.get(title="Journal Beginner")
-    if UserBadge.objects.filter(user=user, badge=journal_beginner_badge).exists():
-        return
-
-    journal_entries = JournalEntry.objects.filter(user_id=user).order_by('-date_created') # Get journal entries ordered by date
-    if journal_entries.count() < 7:
-        return # Not enough entries to form a 7-day streak
-
-    consecutive_days = 0
-    today = timezone.now().date()
-    for day_offset in range(7): # Check past 7 days
-        check_date = today - timedelta(days=day_offset)
-        entry_on_date = JournalEntry.objects.filter(user_id=user, date_created__date=check_date).exists()
-        if entry_on_date:
-            consecutive_days += 1
-        else:
-            break # Streak broken
-
-    if consecutive_days == 7:
-        UserBadge.objects.create(user=user, badge=journal_beginner_badge)
-        print(f"Awarded 'Journal Beginner' badge to user: {user.username}")
+    counters = get_counters(user)
+    return {
+        'tasks_done': counters.tasks_done,
+        'events_created': counters.events_created,
+        'journal_days': counters.journal_days,
+        'journal_streak': counters.current_journal_streak(timezone.now().date()),
+        'journal_longest_streak': counters.journal_longest_streak,
+        'habit_streak': counters.user.habit_streak,
+    }
 
 
 # --- Main function to check all badges for a user ---
-def check_and_award_badges(user):
-    """
-    Checks all badge criteria for a user and awards any unearned badges.
-    """
-    check_organized_badge(user)
-    check_productive_badge(user)
-    check_streak_starter_badge(user)
-    check_streak_beginner_badge(user)
-    check_scheduler_badge(user)
-    check_planner_badge(user)
-    check_journal_starter_badge(user)
-    check_journal_beginner_badge(user)
\ No newline at end of file
+def check_and_award_badges(user, badge_types=None):
+    """
+    Checks badge criteria for a user and awards any unearned badges.
+    `badge_types` limits the check to rules of those Badge.badge_type values (e.g. ['task'] after a task is done);
+    all rules are checked by default.
+    Costs a fixed number of queries regardless of how many badge rules exist:
+    one for the badges and whether they are earned, one for the counters row, and one bulk insert.
+    Returns the list of newly awarded badges.
+    """
+    candidate_rules = [rule for rule in BADGE_RULES if badge_types is None or rule['badge_type'] in badge_types]
+    if not candidate_rules:
+        return []
+
+    badges = (
+        Badge.objects.filter(title__in=[rule['title'] for rule in candidate_rules])
+        .annotate(earned=Exists(UserBadge.objects.filter(user=user, badge=OuterRef('pk'))))
+    )
+    unearned = {badge.title: badge for badge in badges if not badge.earned}
+    if not unearned:
+        return []
+
+    rules = [rule for rule in candidate_rules if rule['title'] in unearned]
+    metrics = get_badge_metrics(user)
+    new_badges = [
+        unearned[rule['title']]
+        for rule in rules
+        if metrics[rule['metric']] >= rule['threshold']
+    ]
+    if new_badges:
+        UserBadge.objects.bulk_create(
+            [UserBadge(user=user, badge=badge) for badge in new_badges],
+            ignore_conflicts=True,
+        )
+        bump_data_versions(user.pk, 'badges')
+        print(f"Awarded {', '.join(badge.title for badge in new_badges)} badge(s) to user: {user.username}")
+    return new_badges
+
+
+def check_badges_for_user(user_id, badge_types=None):
+    """
+    Job handler ('check_badges'): check_and_award_badges() for a user id.
+    """
+    user = get_user_model().objects.filter(pk=user_id).first()
+    if user is not None: # The user may have been deleted since the job was queued
+        check_and_award_badges(user, badge_types)
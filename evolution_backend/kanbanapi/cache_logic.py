@@ -0,0 +1,117 @@
+# kanbanapi/cache_logic.py
+import functools
+import hashlib
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .models import UserDataVersion
+
+
+# How long a cached analytics response is kept. Correctness doesn't depend on it:
+# entries are keyed by the data versions, so a write makes them unreachable.
+RESPONSE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def bump_data_versions(user_ids, *scopes):
+    """
+    Marks `scopes` (e.g. 'tasks', 'habits') as changed for one user id or a list of user ids.
+    Call it inside the transaction of the write, so readers never see new data with an old version.
+    """
+    if not isinstance(user_ids, (list, tuple, set)):
+        user_ids = [user_ids]
+    if not user_ids or not scopes:
+        return
+    updated = UserDataVersion.objects.filter(user_id__in=user_ids, scope__in=scopes).update(
+        version=F('version') + 1, updated_at=timezone.now()
+    )
+    if updated < len(user_ids) * len(scopes):
+        # First write to some of these resources: create their markers (existing ones are left as they are)
+        UserDataVersion.objects.bulk_create(
+            [UserDataVersion(user_id=user_id, scope=scope) for user_id in user_ids for scope in scopes],
+            ignore_conflicts=True,
+        )
+
+
+def get_data_versions(user, scopes):
+    """
+    Returns {scope: (version, updated_at)} for the user's `scopes`, in one query.
+    Scopes that were never written are missing from the result.
+    """
+    return {
+        scope: (version, updated_at)
+        for scope, version, updated_at in UserDataVersion.objects.filter(user=user, scope__in=scopes)
+        .values_list('scope', 'version', 'updated_at')
+    }
+
+
+def _response_cache_key(view, request, scopes, versions, period):
+    """
+    Builds the cache key of a response from the view, the user, the versions of the data scopes it depends on,
+    the current period (for time-dependent results) and the query string.
+    """
+    version_part = ','.join(f'{scope}:{versions[scope][0] if scope in versions else 0}' for scope in sorted(scopes))
+    raw_key = f'{version_part}|{period}|{request.GET.urlencode()}'
+    digest = hashlib.md5(raw_key.encode()).hexdigest()
+    return f'response:{type(view).__name__}:{request.user.pk}:{digest}'
+
+
+def cache_per_user(scopes, period='day'):
+    """
+    Decorator for an APIView `get` method: serves the response data from the cache, keyed by the user
+    and the current versions of the data `scopes` the view reads, so a write to any of them is visible at once.
+    `period` ('day' or 'minute') is added to the key for views whose result also depends on the clock.
+    Works with any Django cache backend (local memory, file, database).
+    """
+    def decorator(get):
+        @functools.wraps(get)
+        def wrapper(view, request, *args, **kwargs):
+            versions = get_data_versions(request.user, scopes)
+            now = timezone.now()
+            current_period = now.strftime('%Y-%m-%dT%H:%M') if period == 'minute' else now.date().isoformat()
+            cache_key = _response_cache_key(view, request, scopes, versions, current_period)
+
+            data = cache.get(cache_key)
+            if data is not None:
+                return Response(data)
+
+            response = get(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(cache_key, response.data, RESPONSE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
+
+
+class ConditionalListMixin:
+    """
+    Adds a weak ETag header to a view's `list` action, derived from the user's data version for `etag_scope`,
+    and answers 304 Not Modified without touching the queryset or serializer when the client already has the
+    current collection (If-None-Match).
+    No Last-Modified is sent and If-Modified-Since is ignored: HTTP dates have whole-second precision, so a write
+    in the same second as the client's last read would be answered with a stale 304. The version is exact.
+    Set `etag_daily = True` for collections that also change with the date (e.g. today's habit trackers).
+    """
+    etag_scope = None
+    etag_daily = False
+
+    def list(self, request, *args, **kwargs):
+        version, _ = get_data_versions(request.user, [self.etag_scope]).get(self.etag_scope, (0, None))
+        tag = f'{self.etag_scope}-{request.user.pk}-{version}'
+        if self.etag_daily:
+            tag += f'-{timezone.now().date().isoformat()}'
+        if request.GET:
+            tag += f'-{hashlib.md5(request.GET.urlencode().encode()).hexdigest()[:12]}'
+        etag = f'W/"{tag}"'
+
+        if_none_match = request.headers.get('If-None-Match', '')
+        not_modified = etag in [candidate.strip() for candidate in if_none_match.split(',')] or if_none_match.strip() == '*'
+
+        if not_modified:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
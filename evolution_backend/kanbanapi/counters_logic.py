@@ -0,0 +1,201 @@
+# kanbanapi/counters_logic.py
+import datetime
+from collections import Counter, defaultdict
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Q, F, Case, When, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from .models import UserActivityCounters, TaskCard, Event, JournalEntry
+
+
+User = get_user_model()
+
+# Number of users recomputed per pass of rebuild_counters().
+REBUILD_CHUNK_SIZE = 500
+
+def task_counter_fields(task):
+    """
+    Returns the counter fields a task contributes to, e.g. ['tasks_done', 'tasks_high', 'tasks_personal'].
+    `task` can be a TaskCard or a dict with 'status', 'priority' and 'task_type' keys.
+    """
+    if isinstance(task, dict):
+        values = (task['status'], task['priority'], task['task_type'])
+    else:
+        values = (task.status, task.priority, task.task_type)
+    return [f'tasks_{value}' for value in values]
+
+
+def apply_counter_deltas(user_id, deltas):
+    """
+    Adds `deltas` ({field: amount}) to the user's counters row with a single UPDATE.
+    Call it inside the transaction of the write it accounts for, after the write itself:
+    if the user has no counters row yet it is built from the current data, which already includes the write.
+    """
+    deltas = {field: amount for field, amount in deltas.items() if amount}
+    if not deltas:
+        return
+    updated = UserActivityCounters.objects.filter(user_id=user_id).update(
+        **{field: F(field) + amount for field, amount in deltas.items()}
+    )
+    if not updated:
+        rebuild_counters([user_id])
+
+
+def record_task_change(user_id, old=None, new=None):
+    """
+    Updates the task counters for a created (old=None), updated, or deleted (new=None) task.
+    """
+    deltas = Counter()
+    if old is not None:
+        deltas.subtract(task_counter_fields(old))
+    if new is not None:
+        deltas.update(task_counter_fields(new))
+    apply_counter_deltas(user_id, deltas)
+
+
+def record_journal_day(user_id, day):
+    """
+    Accounts for a journal entry written on `day`: counts the day once and extends or restarts the streak.
+    """
+    new_streak = Case(
+        When(journal_last_date=day - datetime.timedelta(days=1), then=F('journal_streak') + 1),
+        default=Value(1),
+    )
+    updated = (
+        UserActivityCounters.objects.filter(user_id=user_id)
+        .filter(Q(journal_last_date__lt=day) | Q(journal_last_date__isnull=True))
+        .update(
+            journal_days=F('journal_days') + 1,
+            journal_last_date=day,
+            journal_streak=new_streak,
+            journal_longest_streak=Greatest(F('journal_longest_streak'), new_streak),
+        )
+    )
+    if not updated and not UserActivityCounters.objects.filter(user_id=user_id).exists():
+        rebuild_counters([user_id])
+
+
+def get_counters(user):
+    """
+    Returns the user's counters row (with a freshly loaded user), building it on first use.
+    """
+    counters = UserActivityCounters.objects.select_related('user')
+    try:
+        return counters.get(user=user)
+    except UserActivityCounters.DoesNotExist:
+        rebuild_counters([user.pk])
+        return counters.get(user=user)
+
+
+def _journal_streaks(days):
+    """
+    Given a user's sorted distinct journal days, returns (last_date, streak ending on last_date, longest streak).
+    """
+    streak = longest = 0
+    previous_day = None
+    for day in days:
+        if previous_day is not None and day == previous_day + datetime.timedelta(days=1):
+            streak += 1
+        else:
+            streak = 1
+        longest = max(longest, streak)
+        previous_day = day
+    return previous_day, streak, longest
+
+
+def journal_metrics(user_ids, today=None):
+    """
+    Computes the journal metrics of `user_ids` with one query, an ordered read of the unique (user_id, entry_date)
+    index (one row per journal day). Returns {user_id: metrics} with:
+    days (distinct days written), last_date, last_streak (streak ending on last_date), current_streak (still alive
+    today, i.e. ending today or yesterday), longest_streak, entries_this_week (since Monday) and entries_this_month.
+    """
+    today = today or timezone.now().date()
+    week_start = today - datetime.timedelta(days=today.weekday())
+    month_start = today.replace(day=1)
+    journal_days = defaultdict(list)
+    journal_rows = (
+        JournalEntry.objects.filter(user_id__in=user_ids)
+        .values_list('user_id', 'entry_date')
+        .order_by('user_id', 'entry_date')
+    )
+    for user_id, day in journal_rows:
+        journal_days[user_id].append(day)
+
+    metrics = {}
+    for user_id in user_ids:
+        days = journal_days[user_id]
+        last_date, streak, longest = _journal_streaks(days)
+        metrics[user_id] = {
+            'days': len(days),
+            'last_date': last_date,
+            'last_streak': streak,
+            'current_streak': streak if last_date and last_date >= today - datetime.timedelta(days=1) else 0,
+            'longest_streak': longest,
+            'entries_this_week': sum(1 for day in days if week_start <= day <= today),
+            'entries_this_month': sum(1 for day in days if month_start <= day <= today),
+        }
+    return metrics
+
+
+def rebuild_counters(user_ids):
+    """
+    Recomputes the counters rows of `user_ids` from the source tables with one grouped query per table
+    and writes them with a single upsert.
+    """
+    user_ids = list(user_ids)
+    task_counts = {
+        row.pop('user_id'): row
+        for row in TaskCard.objects.filter(user_id__in=user_ids)
+        .values('user_id')
+        .annotate(**{
+            f'tasks_{value}': Count('id', filter=Q(**{field: value}))
+            for field, choices in (
+                ('status', TaskCard.STATUS_CHOICES),
+                ('priority', TaskCard.PRIORITY_CHOICES),
+                ('task_type', TaskCard.TASK_TYPE_CHOICES),
+            )
+            for value, _ in choices
+        })
+        .order_by()
+    }
+    event_counts = dict(
+        Event.objects.filter(user_id__in=user_ids).values_list('user_id').annotate(count=Count('id')).order_by()
+    )
+    journal = journal_metrics(user_ids)
+
+    counters = []
+    for user_id in user_ids:
+        counters.append(UserActivityCounters(
+            user_id=user_id,
+            events_created=event_counts.get(user_id, 0),
+            journal_days=journal[user_id]['days'],
+            journal_last_date=journal[user_id]['last_date'],
+            journal_streak=journal[user_id]['last_streak'],
+            journal_longest_streak=journal[user_id]['longest_streak'],
+            **task_counts.get(user_id, {}),
+        ))
+    update_fields = [
+        field.name for field in UserActivityCounters._meta.concrete_fields
+        if field.name not in ('id', 'user')
+    ]
+    UserActivityCounters.objects.bulk_create(
+        counters, update_conflicts=True, unique_fields=['user'], update_fields=update_fields,
+    )
+
+
+def rebuild_all_counters(chunk_size=REBUILD_CHUNK_SIZE):
+    """
+    Recomputes the counters of every user in chunks of `chunk_size` users. Returns the number of users rebuilt.
+    """
+    user_ids = User.objects.order_by('pk').values_list('pk', flat=True)
+    rebuilt = 0
+    last_pk = 0
+    while True:
+        chunk = list(user_ids.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            break
+        rebuild_counters(chunk)
+        rebuilt += len(chunk)
+        last_pk = chunk[-1]
+    return rebuilt
@@ -0,0 +1,128 @@
+# kanbanapi/export_logic.py
+import csv
+import io
+import json
+import zipfile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from .models import TaskCard, HabitList, HabitTracker, Event, JournalEntry, UserBadge
+from .serializers import (
+    TaskCardSerializer, HabitListSerializer, HabitTrackerSerializer, EventSerializer, JournalEntrySerializer,
+    UserBadgeSerializer,
+)
+
+
+# Rows fetched per database round trip while exporting (QuerySet.iterator chunk size).
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+
+def _export_sources(user):
+    """
+    Returns [(name, queryset of the user's rows, serializer class)] in export order.
+    """
+    return [
+        ('tasks', TaskCard.objects.filter(user=user).select_related('user'), TaskCardSerializer),
+        ('habits', HabitList.objects.filter(user=user), HabitListSerializer),
+        ('habit_trackers', HabitTracker.objects.filter(habit__user=user).select_related('habit'), HabitTrackerSerializer),
+        ('events', Event.objects.filter(user=user), EventSerializer),
+        ('journal_entries', JournalEntry.objects.filter(user_id=user), JournalEntrySerializer),
+        ('badges', UserBadge.objects.filter(user=user).select_related('badge'), UserBadgeSerializer),
+    ]
+
+
+def _export_tables(user, chunk_size):
+    """
+    Yields (source name, serializer field names, row iterator) for every source. Each table is read in
+    primary key order with a chunked iterator, so only one chunk of rows is in memory at a time.
+    """
+    for name, queryset, serializer_class in _export_sources(user):
+        serializer = serializer_class() # One instance for all rows; to_representation() is per row
+        rows = (serializer.to_representation(instance) for instance in queryset.order_by('pk').iterator(chunk_size=chunk_size))
+        yield name, list(serializer.fields), rows
+
+
+def export_filename(user, export_format):
+    extension = 'ndjson' if export_format == 'ndjson' else 'zip'
+    return f"evolution-export-{user.username}-{timezone.now().date().isoformat()}.{extension}"
+
+
+def iter_ndjson_export(user, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields the user's data as newline-delimited JSON (bytes): a header line, then one
+    {"type": <source>, "data": {...}} line per row.
+    """
+    encoder = DjangoJSONEncoder()
+    header = {'type': 'export', 'data': {'username': user.username, 'exported_at': timezone.now()}}
+    yield (encoder.encode(header) + '\n').encode()
+    lines = []
+    for name, _, rows in _export_tables(user, chunk_size):
+        for row in rows:
+            lines.append(encoder.encode({'type': name, 'data': row}))
+            if len(lines) >= chunk_size:
+                yield ('\n'.join(lines) + '\n').encode()
+                lines = []
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode()
+
+
+class _ZipStream:
+    """
+    Write-only file object collecting what zipfile writes, so it can be yielded piece by piece.
+    Without tell()/seek(), zipfile writes a streamable archive (sizes in data descriptors).
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _csv_value(value):
+    # Nested objects (e.g. a user badge's badge) and lists are written as JSON
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    return value
+
+
+def iter_csv_zip_export(user, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields a zip archive (bytes) with one CSV file per source (tasks.csv, events.csv, ...),
+    each with a header row of the serializer's field names.
+    """
+    stream = _ZipStream()
+    archive = zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_DEFLATED)
+    for name, field_names, rows in _export_tables(user, chunk_size):
+        with archive.open(f'{name}.csv', mode='w', force_zip64=True) as entry:
+            text = io.TextIOWrapper(entry, encoding='utf-8', newline='')
+            writer = csv.writer(text)
+            writer.writerow(field_names)
+            for count, row in enumerate(rows, start=1):
+                writer.writerow([_csv_value(row[field]) for field in field_names])
+                if count % chunk_size == 0:
+                    text.flush()
+                    yield stream.pop()
+            text.flush()
+            text.detach() # Closing the wrapper would close the entry before the with block does
+        yield stream.pop()
+    archive.close()
+    yield stream.pop()
+
+
+def iter_export(user, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    if export_format == 'ndjson':
+        return iter_ndjson_export(user, chunk_size)
+    if export_format == 'csv':
+        return iter_csv_zip_export(user, chunk_size)
+    raise ValueError(f"Unknown export format: {export_format}")
@@ -0,0 +1,99 @@
+# kanbanapi/filters_logic.py
+import datetime
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+
+# Query-string parsers for the list endpoints' filters. Each returns None when the parameter is absent
+# and raises ValidationError (400) when it is malformed.
+
+def choice_param(params, name, choices):
+    """
+    Parses a comma-separated list of values from `choices`, e.g. ?status=to_do,processing.
+    """
+    value = params.get(name)
+    if not value:
+        return None
+    allowed = {choice for choice, _ in choices}
+    values = value.split(',')
+    invalid = [item for item in values if item not in allowed]
+    if invalid:
+        raise ValidationError({name: f"Invalid value(s): {', '.join(invalid)}. Expected any of: {', '.join(sorted(allowed))}."})
+    return values
+
+
+def bool_param(params, name):
+    value = params.get(name)
+    if value is None or value == '':
+        return None
+    if value.lower() in ('true', '1'):
+        return True
+    if value.lower() in ('false', '0'):
+        return False
+    raise ValidationError({name: "Expected 'true' or 'false'."})
+
+
+def id_param(params, name):
+    """
+    Parses an object id given as a JSON integer or a string of digits, e.g. {"after_id": 3}.
+    """
+    value = params.get(name)
+    if value is None or value == '':
+        return None
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValidationError({name: 'Expected an id (positive integer) or null.'})
+    return value
+
+
+def date_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Expected a date (YYYY-MM-DD).'})
+    return parsed
+
+
+def datetime_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None and parse_date(value):
+            parsed = start_of_day(parse_date(value))
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Expected an ISO 8601 date or datetime.'})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def start_of_day(day):
+    """
+    Returns midnight at the start of `day` in the current time zone, as an aware datetime.
+    """
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def fields_param(params, allowed, name='fields'):
+    """
+    Parses a sparse fieldset, e.g. ?fields=id,title,position, into a set of names from `allowed`.
+    """
+    value = params.get(name)
+    if not value:
+        return None
+    values = {item.strip() for item in value.split(',') if item.strip()}
+    invalid = sorted(values - set(allowed))
+    if invalid:
+        raise ValidationError({name: f"Unknown field(s): {', '.join(invalid)}. Expected any of: {', '.join(sorted(allowed))}."})
+    return values
@@ -0,0 +1,445 @@
+# kanbanapi/habits_logic.py
+import base64
+import datetime
+from collections import Counter, defaultdict
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Q, F, Value, DecimalField, ExpressionWrapper, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from .models import TaskCard, HabitList, HabitTracker, HabitDaySummary, HabitYearBitmap
+from .jobs_logic import enqueue_many, badge_check_job
+from .badges_logic import badge_types_reached
+from .counters_logic import apply_counter_deltas, task_counter_fields
+from .cache_logic import bump_data_versions
+from .sync_logic import record_deletions
+from .positions_logic import key_between
+
+
+User = get_user_model()
+
+# Number of users handled per set-based pass of the rollover.
+ROLLOVER_CHUNK_SIZE = 500
+
+# A day counts towards the habit streak when at least this percentage of its habits were completed.
+STREAK_PERCENTAGE = 80
+
+# Number of longest streaks returned by compute_habit_streaks().
+TOP_STREAKS = 3
+
+
+def _apply_rollover_counter_deltas(counter_deltas):
+    """
+    Applies the task counter changes of a rollover batch, one UPDATE per user whose counts changed,
+    and marks those users' tasks as changed.
+    """
+    for user_id, deltas in counter_deltas.items():
+        apply_counter_deltas(user_id, deltas)
+    bump_data_versions(list(counter_deltas), 'tasks')
+
+
+def rollover_users(user_ids, today_date=None):
+    """
+    Performs the new-day habit rollover for a batch of users with a fixed number of set-based queries:
+    deletes old habit task cards, finalizes the previous tracked day's HabitDaySummary,
+    updates habit streaks, and materializes today's HabitTracker entries, summary and habit task cards.
+    Returns the number of users that were rolled over (users already on today are skipped).
+    Idempotent and safe to run concurrently for the same users (login job and cron): the batch's user rows are
+    locked first, so a second run waits and then finds them already on today.
+    """
+    today_date = today_date or datetime.date.today()
+    user_ids = list(user_ids)
+    if not user_ids:
+        return 0
+
+    with transaction.atomic():
+        # Lock in primary key order so overlapping batches can't deadlock
+        user_ids = list(User.objects.select_for_update().filter(pk__in=user_ids).order_by('pk').values_list('pk', flat=True))
+
+        # 1. Delete previous days' habit task cards
+        counter_deltas = defaultdict(Counter)
+        old_habit_tasks = TaskCard.objects.filter(user_id__in=user_ids, is_habit=True, due_date__lt=today_date)
+        for row in old_habit_tasks.values('user_id', 'status', 'priority', 'task_type').annotate(count=Count('id')).order_by():
+            for field in task_counter_fields(row):
+                counter_deltas[row['user_id']][field] -= row['count']
+        record_deletions('task', old_habit_tasks.values_list('user_id', 'id'))
+        old_habit_tasks.delete()
+
+        # Last tracked day per user; users already tracking today are done.
+        last_dates = dict(
+            HabitTracker.objects.filter(habit__user_id__in=user_ids)
+            .values_list('habit__user_id')
+            .annotate(last_date=Max('tracking_date'))
+        )
+        pending_ids = [user_id for user_id in user_ids if last_dates.get(user_id) != today_date]
+        if not pending_ids:
+            _apply_rollover_counter_deltas(counter_deltas)
+            return 0
+
+        # 2. Finalize the previous tracked day's summary, one grouped query for the whole batch
+        previous_dates = {last_dates[user_id] for user_id in pending_ids if last_dates.get(user_id)}
+        day_stats = {}
+        day_rows = (
+            HabitTracker.objects.filter(habit__user_id__in=pending_ids, tracking_date__in=previous_dates)
+            .values('habit__user_id', 'tracking_date')
+            .annotate(total=Count('id'), completed=Count('id', filter=Q(is_completed=True)))
+        )
+        for row in day_rows:
+            user_id = row['habit__user_id']
+            if row['tracking_date'] == last_dates[user_id]:
+                day_stats[user_id] = (row['total'], row['completed'])
+
+        # Streak carried over from the (already finalized) day before each finalized day
+        carried_streaks = {
+            (user_id, day): streak
+            for user_id, day, streak in HabitDaySummary.objects.filter(
+                user_id__in=pending_ids,
+                date__in={day - datetime.timedelta(days=1) for day in previous_dates},
+            ).values_list('user_id', 'date', 'streak_at_day')
+        }
+
+        # --- Habit Streak Calculation ---
+        finalized_summaries = []
+        new_streaks = {}
+        for user_id in pending_ids:
+            total, completed = day_stats.get(user_id, (0, 0))
+            if not total:
+                new_streaks[user_id] = 0
+                continue
+            last_date = last_dates[user_id]
+            percentage = (completed / total) * 100
+            if percentage >= STREAK_PERCENTAGE:
+                streak = carried_streaks.get((user_id, last_date - datetime.timedelta(days=1)), 0) + 1
+            else:
+                streak = 0
+            finalized_summaries.append(HabitDaySummary(
+                user_id=user_id, date=last_date, total=total, completed=completed,
+                percentage=round(percentage, 2), streak_at_day=streak,
+            ))
+            # The streak only carries into today if the finalized day was yesterday
+            new_streaks[user_id] = streak if last_date == today_date - datetime.timedelta(days=1) else 0
+        HabitDaySummary.objects.bulk_create(
+            finalized_summaries,
+            update_conflicts=True,
+            unique_fields=['user', 'date'],
+            update_fields=['total', 'completed', 'percentage', 'streak_at_day'],
+        )
+        User.objects.bulk_update(
+            [User(pk=user_id, habit_streak=streak) for user_id, streak in new_streaks.items()],
+            ['habit_streak'],
+        )
+        streak_ids = [user_id for user_id, streak in new_streaks.items() if streak > 0]
+
+        # Record the finalized days in the per-habit completion bitmaps
+        finalized_trackers = HabitTracker.objects.filter(
+            habit__user_id__in=[summary.user_id for summary in finalized_summaries],
+            tracking_date__in=previous_dates,
+        ).values_list('habit__user_id', 'habit_id', 'tracking_date', 'is_completed')
+        mark_habit_days([
+            (habit_id, tracking_date, is_completed)
+            for user_id, habit_id, tracking_date, is_completed in finalized_trackers
+            if tracking_date == last_dates[user_id]
+        ])
+
+        # 3. Create today's HabitTracker entries
+        habits = list(HabitList.objects.filter(user_id__in=pending_ids))
+        HabitTracker.objects.bulk_create(
+            [HabitTracker(habit=habit, tracking_date=today_date, is_completed=False) for habit in habits],
+            ignore_conflicts=True,
+        )
+        habit_counts = Counter(habit.user_id for habit in habits)
+        HabitDaySummary.objects.bulk_create(
+            [HabitDaySummary(user_id=user_id, date=today_date, total=total) for user_id, total in habit_counts.items()],
+            ignore_conflicts=True,
+        )
+
+        # 4. Create the habit task cards for today's trackers that don't have one yet
+        habits_by_id = {habit.pk: habit for habit in habits}
+        unlinked_trackers = HabitTracker.objects.filter(
+            habit_id__in=habits_by_id, tracking_date=today_date, task_card__isnull=True,
+        )
+        new_task_cards = []
+        for tracker in unlinked_trackers:
+            habit = habits_by_id[tracker.habit_id]
+            new_task_cards.append(TaskCard(
+                user_id=habit.user_id,
+                is_habit=True,
+                title=habit.habit_name,
+                summary=habit.habit_description if habit.habit_description else "",
+                due_date=today_date,
+                status='to_do',
+                habit_tracker=tracker,
+            ))
+        # Append them to the end of each user's to-do column
+        last_positions = dict(
+            TaskCard.objects.filter(user_id__in={task_card.user_id for task_card in new_task_cards}, status='to_do')
+            .values_list('user_id')
+            .annotate(last=Max('position'))
+            .order_by()
+        )
+        for task_card in new_task_cards:
+            task_card.position = last_positions[task_card.user_id] = key_between(last_positions.get(task_card.user_id) or None, None)
+        # The one-to-one habit_tracker link turns a duplicate into a no-op; the user locks above make it unreachable,
+        # which keeps the counter deltas below exact.
+        TaskCard.objects.bulk_create(new_task_cards, ignore_conflicts=True)
+        for task_card in new_task_cards:
+            counter_deltas[task_card.user_id].update(task_counter_fields(task_card))
+        _apply_rollover_counter_deltas(counter_deltas)
+        bump_data_versions(pending_ids, 'tasks', 'habits')
+
+        # Streak badges can only be earned on the days a streak grows.
+        enqueue_many([badge_check_job(user_id, ['habit']) for user_id in streak_ids])
+
+    invalidate_habit_streaks(pending_ids, today_date)
+
+    return len(pending_ids)
+
+
+def rollover_user(user_id, today_date=None):
+    """
+    Job handler ('rollover_user'): rolls one user over to `today_date` (an ISO date string, today by default).
+    """
+    return rollover_users([user_id], datetime.date.fromisoformat(today_date) if today_date else None)
+
+
+def _percentage_expression(completed):
+    """
+    SQL expression for a summary's completion percentage given an expression for its completed count.
+    """
+    return ExpressionWrapper(
+        completed * Value(100.0) / F('total'),
+        output_field=DecimalField(max_digits=5, decimal_places=2),
+    )
+
+
+def record_habit_toggle(user_id, tracker):
+    """
+    Adjusts the user's summary for the tracker's day after the tracker was completed or un-completed.
+    Past days are also updated in the habit's completion bitmap (today's bit is written at rollover).
+    """
+    tracking_date = tracker.tracking_date
+    completed_delta = 1 if tracker.is_completed else -1
+    if tracking_date < datetime.date.today():
+        mark_habit_days([(tracker.habit_id, tracking_date, tracker.is_completed)])
+    updated = HabitDaySummary.objects.filter(user_id=user_id, date=tracking_date, total__gt=0).update(
+        completed=F('completed') + completed_delta,
+        percentage=_percentage_expression(F('completed') + completed_delta),
+    )
+    if not updated:
+        rebuild_day_summaries(user_id, [tracking_date])
+    invalidate_habit_streaks(user_id) # Cached under today, past days count towards it
+
+
+def set_habit_completion(user_id, tracker, completed, task_card=None, tasks_done=None, bump_scopes=()):
+    """
+    Marks a habit tracker entry as completed or not, and moves its habit task (if given) to 'done' / 'to_do',
+    with one queryset UPDATE per changed row plus the day's summary, the task counters and one data versions
+    UPDATE for the changed scopes and `bump_scopes` (the caller's own, so they share it).
+    `tasks_done` is the user's done task count before the toggle, when the caller read it: a task badge check is
+    then only queued when completing the task reaches a badge threshold (an unknown count always queues one).
+    `tracker` and `task_card` are updated in place. Call it inside the transaction of the toggle.
+    The UPDATEs only match rows still in the other state, and the summary, counters and bitmap are only adjusted
+    when a row changed: a replayed or concurrent toggle read from stale objects changes nothing twice.
+    Returns True if the tracker entry changed.
+    """
+    now = timezone.now()
+    changed_scopes = list(bump_scopes)
+    toggled = HabitTracker.objects.filter(pk=tracker.pk, is_completed=not completed).update(
+        is_completed=completed, updated_at=now,
+    ) == 1
+    if toggled:
+        tracker.is_completed = completed
+        tracker.updated_at = now
+        record_habit_toggle(user_id, tracker)
+        changed_scopes.append('habits')
+
+    # --- TaskCard Sync (Habit to Task) ---
+    new_status = 'done' if completed else 'to_do'
+    if task_card is not None and task_card.status != new_status and TaskCard.objects.filter(
+        pk=task_card.pk, status=task_card.status,
+    ).update(status=new_status, updated_at=now):
+        deltas = Counter()
+        deltas.subtract(task_counter_fields(task_card))
+        task_card.status = new_status
+        task_card.updated_at = now
+        deltas.update(task_counter_fields(task_card))
+        apply_counter_deltas(user_id, deltas)
+        changed_scopes.append('tasks')
+        if completed:
+            badge_types = badge_types_reached('tasks_done', tasks_done, (tasks_done or 0) + 1)
+            if badge_types:
+                enqueue_many([badge_check_job(user_id, badge_types)])
+    if changed_scopes:
+        bump_data_versions(user_id, *dict.fromkeys(changed_scopes))
+    return toggled
+
+
+def mark_habit_days(habit_days):
+    """
+    Writes a list of (habit_id, day, is_completed) into the habits' year bitmaps:
+    one locking read of the affected bitmaps, then one bulk insert and one bulk update.
+    """
+    if not habit_days:
+        return
+    keys = {(habit_id, day.year) for habit_id, day, _ in habit_days}
+    with transaction.atomic():
+        bitmaps = {
+            (bitmap.habit_id, bitmap.year): bitmap
+            for bitmap in HabitYearBitmap.objects.select_for_update().filter(
+                habit_id__in={habit_id for habit_id, _ in keys},
+                year__in={year for _, year in keys},
+            )
+        }
+        existing_bitmaps = [bitmaps[key] for key in keys if key in bitmaps]
+        new_bitmaps = []
+        for habit_id, year in keys - bitmaps.keys():
+            bitmaps[(habit_id, year)] = HabitYearBitmap(habit_id=habit_id, year=year)
+            new_bitmaps.append(bitmaps[(habit_id, year)])
+        for habit_id, day, is_completed in habit_days:
+            bitmaps[(habit_id, day.year)].set_completed(day, is_completed)
+        HabitYearBitmap.objects.bulk_create(new_bitmaps)
+        HabitYearBitmap.objects.bulk_update(existing_bitmaps, ['bits'])
+
+
+def habit_heatmap(user, start, end, habit_id=None):
+    """
+    Per-day completion between `start` and `end` (inclusive), for the user and per habit:
+    {'start': ..., 'end': ..., 'days': [percentage, ...], 'habits': [{'id', 'habit_name', 'bits'}, ...]}.
+    `days` comes from the daily summaries. Each habit's `bits` packs one bit per day of the range
+    (bit i of byte i // 8 is day start + i), read from the year bitmaps plus today's trackers.
+    """
+    today_date = datetime.date.today()
+    day_count = (end - start).days + 1
+
+    percentages = dict(
+        HabitDaySummary.objects.filter(user=user, date__range=(start, end)).values_list('date', 'percentage')
+    )
+    days = [
+        int(percentages.get(start + datetime.timedelta(days=offset), 0))
+        for offset in range(day_count)
+    ]
+
+    habits = HabitList.objects.filter(user=user).order_by('id')
+    if habit_id is not None:
+        habits = habits.filter(pk=habit_id)
+    habits = list(habits.values('id', 'habit_name'))
+    habit_ids = [habit['id'] for habit in habits]
+
+    bitmaps = {
+        (bitmap.habit_id, bitmap.year): bitmap
+        for bitmap in HabitYearBitmap.objects.filter(habit_id__in=habit_ids, year__range=(start.year, end.year))
+    }
+    completed_today = set()
+    if start <= today_date <= end:
+        completed_today = set(
+            HabitTracker.objects.filter(habit_id__in=habit_ids, tracking_date=today_date, is_completed=True)
+            .values_list('habit_id', flat=True)
+        )
+
+    for habit in habits:
+        bits = bytearray((day_count + 7) // 8)
+        for offset in range(day_count):
+            day = start + datetime.timedelta(days=offset)
+            if day == today_date:
+                completed = habit['id'] in completed_today
+            else:
+                bitmap = bitmaps.get((habit['id'], day.year))
+                completed = bitmap is not None and bitmap.is_completed(day)
+            if completed:
+                bits[offset // 8] |= 1 << (offset % 8)
+        habit['bits'] = base64.b64encode(bytes(bits)).decode('ascii')
+
+    return {'start': start.isoformat(), 'end': end.isoformat(), 'days': days, 'habits': habits}
+
+
+def rebuild_day_summaries(user_id, dates):
+    """
+    Recomputes the totals of the user's summaries for `dates` from the HabitTracker rows
+    (e.g. after a habit, and with it its trackers, was deleted). Streaks are left as they are.
+    """
+    day_rows = (
+        HabitTracker.objects.filter(habit__user_id=user_id, tracking_date__in=dates)
+        .values('tracking_date')
+        .annotate(total=Count('id'), completed=Count('id', filter=Q(is_completed=True)))
+        .order_by()
+    )
+    day_stats = {row['tracking_date']: (row['total'], row['completed']) for row in day_rows}
+    summaries = []
+    for day in dates:
+        total, completed = day_stats.get(day, (0, 0))
+        percentage = round((completed / total) * 100, 2) if total else 0
+        summaries.append(HabitDaySummary(user_id=user_id, date=day, total=total, completed=completed, percentage=percentage))
+    HabitDaySummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=['user', 'date'],
+        update_fields=['total', 'completed', 'percentage'],
+    )
+
+
+def _habit_streaks_cache_key(user_id, today_date):
+    return f'habit-streaks:{user_id}:{today_date.isoformat()}'
+
+
+def invalidate_habit_streaks(user_ids, today_date=None):
+    """
+    Drops the cached streaks of one user id or a list of user ids.
+    """
+    today_date = today_date or datetime.date.today()
+    if not isinstance(user_ids, (list, tuple, set)):
+        user_ids = [user_ids]
+    cache.delete_many([_habit_streaks_cache_key(user_id, today_date) for user_id in user_ids])
+
+
+def compute_habit_streaks(user, today_date=None):
+    """
+    Returns the user's habit streaks from the daily summaries before today:
+    {'current': 4, 'longest': 9, 'top': [{'start': date, 'end': date, 'length': 9}, ...]}.
+    Qualifying days are fetched in one query numbered with ROW_NUMBER(); consecutive days share the same
+    (day - row number) value, so each such group is one streak (gaps and islands).
+    The result only changes at rollover and when a tracker is toggled, so it is cached per user per day.
+    """
+    today_date = today_date or datetime.date.today()
+    cache_key = _habit_streaks_cache_key(user.pk, today_date)
+    streaks = cache.get(cache_key)
+    if streaks is not None:
+        return streaks
+
+    qualifying_days = (
+        HabitDaySummary.objects.filter(user=user, date__lt=today_date, percentage__gte=STREAK_PERCENTAGE)
+        .annotate(row_number=Window(RowNumber(), order_by=F('date').asc()))
+        .values_list('date', 'row_number')
+    )
+    islands = {}
+    for day, row_number in qualifying_days:
+        island = islands.setdefault(day.toordinal() - row_number, {'start': day, 'end': day, 'length': 0})
+        island['end'] = day
+        island['length'] += 1
+
+    yesterday = today_date - datetime.timedelta(days=1)
+    ranked = sorted(islands.values(), key=lambda island: (island['length'], island['end']), reverse=True)
+    streaks = {
+        'current': next((island['length'] for island in islands.values() if island['end'] == yesterday), 0),
+        'longest': ranked[0]['length'] if ranked else 0,
+        'top': ranked[:TOP_STREAKS],
+    }
+    cache.set(cache_key, streaks, timeout=60 * 60 * 24)
+    return streaks
+
+
+def rollover_all_users(today_date=None, chunk_size=ROLLOVER_CHUNK_SIZE):
+    """
+    Runs the habit rollover for every active user in chunks of `chunk_size` users.
+    Returns the total number of users rolled over.
+    """
+    user_ids = User.objects.filter(is_active=True).order_by('pk').values_list('pk', flat=True)
+    rolled_over = 0
+    last_pk = 0
+    while True:
+        chunk = list(user_ids.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            break
+        rolled_over += rollover_users(chunk, today_date)
+        last_pk = chunk[-1]
+    return rolled_over
@@ -0,0 +1,221 @@
+# kanbanapi/import_logic.py
+import csv
+import datetime
+import io
+from collections import Counter
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from .models import TaskCard, Event
+from .serializers import TaskCardSerializer, EventSerializer
+from .counters_logic import apply_counter_deltas, task_counter_fields
+from .cache_logic import bump_data_versions
+from .jobs_logic import enqueue_badge_check
+from .positions_logic import next_positions
+
+
+# Validated rows written per bulk insert.
+IMPORT_BATCH_SIZE = 1000
+
+# Upper bound on the rows of one import, and on the row errors listed in its report.
+MAX_IMPORT_ROWS = 50000
+MAX_REPORTED_ERRORS = 100
+
+# Columns read from the file for each kind; other columns (e.g. the ids and timestamps of an export) are ignored.
+IMPORT_COLUMNS = {
+    'tasks': ('title', 'summary', 'status', 'task_type', 'priority', 'due_date', 'is_event'),
+    'events': ('subject', 'location', 'start_time', 'end_time', 'category_color', 'description'),
+}
+
+IMPORT_FORMATS = ('csv', 'ics')
+
+
+class ImportFileError(Exception):
+    """
+    The file can't be imported at all (unsupported format, too many rows...), as opposed to invalid rows.
+    """
+
+
+# --- Parsers: each yields (row number, {column: value}) without reading the whole file ---
+
+def iter_csv_rows(binary_file):
+    """
+    Rows of a CSV file with a header line (UTF-8, optional BOM). Row numbers are 1-based data rows.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline=''))
+    for number, row in enumerate(reader, start=1):
+        yield number, row
+
+
+def _unfolded_lines(text_file):
+    # RFC 5545 content lines are folded: a line starting with a space or tab continues the previous one
+    current = None
+    for line in text_file:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _ics_text(value):
+    return value.replace('\\n', '\n').replace('\\N', '\n').replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\')
+
+
+def _ics_datetime(value, params):
+    """
+    Converts an iCalendar DATE or DATE-TIME (UTC 'Z', TZID=..., or floating) to an ISO 8601 string.
+    """
+    if params.get('VALUE') == 'DATE' or len(value) == 8:
+        day = datetime.datetime.strptime(value, '%Y%m%d')
+        return timezone.make_aware(day).isoformat()
+    if value.endswith('Z'):
+        return datetime.datetime.strptime(value, '%Y%m%dT%H%M%SZ').replace(tzinfo=datetime.timezone.utc).isoformat()
+    moment = datetime.datetime.strptime(value, '%Y%m%dT%H%M%S')
+    try:
+        zone = ZoneInfo(params['TZID']) if 'TZID' in params else timezone.get_current_timezone()
+    except (ZoneInfoNotFoundError, ValueError):
+        zone = timezone.get_current_timezone()
+    return moment.replace(tzinfo=zone).isoformat()
+
+
+def iter_ics_events(binary_file):
+    """
+    VEVENTs of an iCalendar file as event rows (subject, location, description, start_time, end_time).
+    Row numbers count the VEVENTs. Events without DTEND end when they start (all-day events a day later).
+    """
+    text_file = io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline='')
+    number = 0
+    event = None
+    for line in _unfolded_lines(text_file):
+        if line == 'BEGIN:VEVENT':
+            number += 1
+            event = {}
+            continue
+        if event is None:
+            continue
+        if line == 'END:VEVENT':
+            if 'end_time' not in event and event.get('start_time'):
+                event['end_time'] = event['start_time']
+                if event.pop('_all_day', False):
+                    event['end_time'] = (datetime.datetime.fromisoformat(event['start_time']) + datetime.timedelta(days=1)).isoformat()
+            event.pop('_all_day', None)
+            yield number, event
+            event = None
+            continue
+        name_part, _, value = line.partition(':')
+        name, *raw_params = name_part.split(';')
+        params = dict(param.partition('=')[::2] for param in raw_params)
+        name = name.upper()
+        try:
+            if name == 'SUMMARY':
+                event['subject'] = _ics_text(value)
+            elif name == 'LOCATION':
+                event['location'] = _ics_text(value)
+            elif name == 'DESCRIPTION':
+                event['description'] = _ics_text(value)
+            elif name == 'DTSTART':
+                event['start_time'] = _ics_datetime(value, params)
+                event['_all_day'] = params.get('VALUE') == 'DATE' or len(value) == 8
+            elif name == 'DTEND':
+                event['end_time'] = _ics_datetime(value, params)
+        except ValueError:
+            event[{'DTSTART': 'start_time', 'DTEND': 'end_time'}[name]] = value # Left to the serializer to reject
+
+
+def iter_import_rows(binary_file, kind, file_format):
+    if file_format == 'csv':
+        return iter_csv_rows(binary_file)
+    if file_format == 'ics':
+        if kind != 'events':
+            raise ImportFileError('iCalendar files can only be imported as events.')
+        return iter_ics_events(binary_file)
+    raise ImportFileError(f"Unsupported file format: {file_format}. Expected one of: {', '.join(IMPORT_FORMATS)}.")
+
+
+def guess_import_format(filename):
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return 'ics' if extension in ('ics', 'ical', 'ifb') else 'csv'
+
+
+# --- Writing ---
+
+def _write_tasks(user, tasks, counter_deltas):
+    for column in {task.status for task in tasks}:
+        column_tasks = [task for task in tasks if task.status == column]
+        for task, key in zip(column_tasks, next_positions(user.pk, column, len(column_tasks))):
+            task.position = key
+    TaskCard.objects.bulk_create(tasks)
+    for task in tasks:
+        counter_deltas.update(task_counter_fields(task))
+
+
+def _write_events(user, events, counter_deltas):
+    Event.objects.bulk_create(events)
+    counter_deltas['events_created'] += len(events)
+
+
+IMPORT_TARGETS = {
+    # kind: (model, serializer class, writer, data version scope, badge type)
+    'tasks': (TaskCard, TaskCardSerializer, _write_tasks, 'tasks', 'task'),
+    'events': (Event, EventSerializer, _write_events, 'events', 'schedule'),
+}
+
+
+class _Rollback(Exception):
+    pass
+
+
+def import_rows(user, kind, rows, skip_invalid=False, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Validates `rows` ((row number, {column: value}) pairs) with the kind's serializer rules and bulk-inserts them
+    in batches of `batch_size`, all in one transaction with the counters, data versions and badge check.
+    Blank cells are treated as missing. Unless `skip_invalid` is set, a single invalid row cancels the import.
+    Returns {'created': n, 'error_count': n, 'errors': [{'row': n, 'errors': {...}}, ...] (first MAX_REPORTED_ERRORS)}.
+    """
+    if kind not in IMPORT_TARGETS:
+        raise ImportFileError(f"Unknown import kind: {kind}. Expected one of: {', '.join(IMPORT_TARGETS)}.")
+    model, serializer_class, write_batch, scope, badge_type = IMPORT_TARGETS[kind]
+    serializer = serializer_class() # One instance validates every row
+    columns = IMPORT_COLUMNS[kind]
+    report = {'created': 0, 'error_count': 0, 'errors': []}
+    counter_deltas = Counter()
+    batch = []
+
+    def flush():
+        write_batch(user, batch, counter_deltas)
+        report['created'] += len(batch)
+        batch.clear()
+
+    try:
+        with transaction.atomic():
+            for count, (number, row) in enumerate(rows, start=1):
+                if count > MAX_IMPORT_ROWS:
+                    raise ImportFileError(f"Imports are limited to {MAX_IMPORT_ROWS} rows.")
+                data = {column: row[column] for column in columns if row.get(column) not in (None, '')}
+                try:
+                    validated = serializer.run_validation(data)
+                except serializers.ValidationError as error:
+                    report['error_count'] += 1
+                    if len(report['errors']) < MAX_REPORTED_ERRORS:
+                        report['errors'].append({'row': number, 'errors': error.detail})
+                    continue
+                batch.append(model(user=user, **validated))
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+            if report['error_count'] and not skip_invalid:
+                raise _Rollback()
+            apply_counter_deltas(user.pk, counter_deltas)
+            if report['created']:
+                bump_data_versions(user.pk, scope)
+                enqueue_badge_check(user.pk, [badge_type])
+    except _Rollback:
+        report['created'] = 0 # Nothing was written
+    return report
@@ -0,0 +1,206 @@
+# kanbanapi/index_advisor_logic.py
+import datetime
+import json
+import logging
+import random
+import re
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+from .models import TaskCard, HabitList, HabitTracker, HabitDaySummary, Event, JournalEntry
+from .habits_logic import rollover_users
+
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+# Endpoints replayed by the advisor, as (path, query params). Cover every list filter and analytics view.
+ADVISOR_REQUESTS = [
+    ('/api/tasks/', {}),
+    ('/api/tasks/', {'status': 'done'}),
+    ('/api/tasks/', {'due_after': '{month_ago}', 'due_before': '{today}'}),
+    ('/api/tasks/', {'is_habit': 'true'}),
+    ('/api/tasks/', {'page_size': '50'}),
+    ('/api/events/', {}),
+    ('/api/events/', {'start_after': '{today}'}),
+    ('/api/habits/', {}),
+    ('/api/habittrackers/', {}),
+    ('/api/journalentries/', {}),
+    ('/api/journalentries/', {'date_from': '{month_ago}'}),
+    ('/api/journalentries/stats/', {}),
+    ('/api/users/badges/', {}),
+    ('/api/tasks/status-counts/', {}),
+    ('/api/tasks/completion-rate/', {}),
+    ('/api/tasks/completion-series/', {'start': '{year_ago}', 'end': '{today}', 'granularity': 'week'}),
+    ('/api/habits/weekly-completion/', {}),
+    ('/api/habits/streak/', {}),
+    ('/api/habits/heatmap/', {'start': '{year_ago}', 'end': '{today}'}),
+    ('/api/events/upcoming/', {}),
+    ('/api/dashboard/', {}),
+    ('/api/sync/', {'since': '{now}'}),
+]
+
+# Tables that are expected to be read in full (small catalogs).
+DEFAULT_IGNORED_TABLES = {'kanbanapi_badge', 'django_content_type'}
+
+# Database backends whose EXPLAIN output explain_query() can read.
+SUPPORTED_VENDORS = ('postgresql', 'sqlite')
+
+_EXPLAINABLE = re.compile(r'^\s*(SELECT|UPDATE|DELETE)\b', re.IGNORECASE)
+
+
+def seed_advisor_data(users=20, tasks_per_user=500, events_per_user=200, habits_per_user=5, days=365, journal_days=60):
+    """
+    Creates `users` users with a realistic amount of tasks, events, habits (with `days` of trackers and summaries)
+    and journal entries, using bulk inserts. Returns the first user, whose requests are replayed.
+    Call it inside a transaction that is rolled back.
+    """
+    rng = random.Random(0)
+    today = datetime.date.today()
+    now = timezone.now()
+    User.objects.bulk_create([User(username=f'index-advisor-{n}') for n in range(users)])
+    created_users = list(User.objects.filter(username__startswith='index-advisor-').order_by('pk'))
+
+    task_cards, events, habits, summaries = [], [], [], []
+    for user in created_users:
+        for n in range(tasks_per_user):
+            task_cards.append(TaskCard(
+                user=user, title=f'Task {n}',
+                status=rng.choice(TaskCard.STATUS_CHOICES)[0],
+                priority=rng.choice(TaskCard.PRIORITY_CHOICES)[0],
+                task_type=rng.choice(TaskCard.TASK_TYPE_CHOICES)[0],
+                due_date=today - datetime.timedelta(days=rng.randrange(-30, days)),
+                is_habit=n % 10 == 0,
+            ))
+        for n in range(events_per_user):
+            start_time = now + datetime.timedelta(hours=rng.randrange(-24 * days, 24 * 60))
+            events.append(Event(user=user, subject=f'Event {n}', start_time=start_time, end_time=start_time + datetime.timedelta(hours=1)))
+        for n in range(habits_per_user):
+            habits.append(HabitList(user=user, habit_name=f'Habit {n}'))
+        for n in range(days):
+            summaries.append(HabitDaySummary(user=user, date=today - datetime.timedelta(days=n), total=habits_per_user))
+    TaskCard.objects.bulk_create(task_cards, batch_size=2000)
+    Event.objects.bulk_create(events, batch_size=2000)
+    HabitList.objects.bulk_create(habits)
+    HabitDaySummary.objects.bulk_create(summaries, batch_size=2000)
+
+    habits = HabitList.objects.filter(user__in=created_users)
+    HabitTracker.objects.bulk_create([
+        HabitTracker(habit=habit, tracking_date=today - datetime.timedelta(days=n), is_completed=rng.random() < 0.7)
+        for habit in habits for n in range(days)
+    ], batch_size=2000)
+
+    JournalEntry.objects.bulk_create([
+        JournalEntry(user_id=user, title='Entry', content='...', entry_date=today - datetime.timedelta(days=offset))
+        for user in created_users for offset in range(journal_days)
+    ], batch_size=2000)
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE') # Planner statistics for the seeded data
+    return created_users[0]
+
+
+def capture_endpoint_queries(user, requests=ADVISOR_REQUESTS):
+    """
+    Replays `requests` as `user` through the API (with response caching disabled), then the user's rollover
+    to tomorrow, and returns [(path, sql)] for every SELECT / UPDATE / DELETE they executed.
+    """
+    # Test tooling, only needed by the advisor command: not imported with the app
+    from django.test.utils import CaptureQueriesContext, override_settings
+    from rest_framework.test import APIClient
+
+    today = datetime.date.today()
+    placeholders = {
+        'today': today.isoformat(),
+        'month_ago': (today - datetime.timedelta(days=30)).isoformat(),
+        'year_ago': (today - datetime.timedelta(days=364)).isoformat(),
+        'now': (timezone.now() - datetime.timedelta(hours=1)).isoformat(),
+    }
+    client = APIClient()
+    client.force_authenticate(user)
+    captured = []
+    with override_settings(
+        ALLOWED_HOSTS=['testserver'],
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    ):
+        for path, params in requests:
+            params = {name: value.format(**placeholders) for name, value in params.items()}
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(path, params)
+            if response.status_code >= 400:
+                logger.warning("Index advisor: %s returned %s", path, response.status_code)
+            captured.extend((path, query['sql']) for query in queries.captured_queries if _EXPLAINABLE.match(query['sql']))
+
+        with CaptureQueriesContext(connection) as queries:
+            rollover_users([user.pk], today + datetime.timedelta(days=1))
+        captured.extend(('rollover_habits', query['sql']) for query in queries.captured_queries if _EXPLAINABLE.match(query['sql']))
+    return captured
+
+
+def explain_query(sql):
+    """
+    Runs EXPLAIN on `sql` and returns (sequentially scanned tables, index names used).
+    Supports PostgreSQL (JSON plans) and SQLite (EXPLAIN QUERY PLAN).
+    """
+    scanned, used = set(), set()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            nodes = [plan[0]['Plan']]
+            while nodes:
+                node = nodes.pop()
+                if node.get('Node Type') == 'Seq Scan':
+                    scanned.add(node['Relation Name'])
+                if node.get('Index Name'):
+                    used.add(node['Index Name'])
+                nodes.extend(node.get('Plans', []))
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            for row in cursor.fetchall():
+                detail = row[-1]
+                match = re.match(r'SCAN (?:TABLE )?(\w+)', detail)
+                if match and 'USING' not in detail:
+                    scanned.add(match.group(1))
+                match = re.search(r'USING (?:COVERING )?INDEX (\w+)', detail)
+                if match:
+                    used.add(match.group(1))
+        else:
+            raise NotImplementedError(f"EXPLAIN parsing is not implemented for {connection.vendor}.")
+    return scanned, used
+
+
+def declared_indexes():
+    """
+    Returns {index name: table} for the non-unique, non-primary-key indexes of the kanbanapi tables.
+    Unique indexes are left out: they enforce constraints even if no read uses them.
+    """
+    indexes = {}
+    with connection.cursor() as cursor:
+        for model in apps.get_app_config('kanbanapi').get_models():
+            table = model._meta.db_table
+            for name, constraint in connection.introspection.get_constraints(cursor, table).items():
+                if constraint['index'] and not constraint['unique'] and not constraint['primary_key']:
+                    indexes[name] = table
+    return indexes
+
+
+def advise_indexes(user, ignored_tables=DEFAULT_IGNORED_TABLES):
+    """
+    Replays the endpoint queries and explains them.
+    Returns {'queries': count, 'seq_scans': [(path, table, sql)], 'unused_indexes': [(index, table)]}.
+    """
+    captured = capture_endpoint_queries(user)
+    seq_scans = []
+    used_indexes = set()
+    for path, sql in captured:
+        scanned, used = explain_query(sql)
+        used_indexes |= used
+        seq_scans.extend((path, table, sql) for table in sorted(scanned - set(ignored_tables)))
+    unused_indexes = sorted(
+        (name, table) for name, table in declared_indexes().items() if name not in used_indexes
+    )
+    return {'queries': len(captured), 'seq_scans': seq_scans, 'unused_indexes': unused_indexes}
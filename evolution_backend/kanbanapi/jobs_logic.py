@@ -0,0 +1,148 @@
+# kanbanapi/jobs_logic.py
+import datetime
+import logging
+import traceback
+import uuid
+from django.conf import settings
+from django.db import IntegrityError, transaction, close_old_connections
+from django.db.models import F, Min
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .models import Job
+
+
+logger = logging.getLogger(__name__)
+
+# Job kinds and the functions that run them (called with the job's payload as keyword arguments).
+# Dotted paths keep this module free of imports of the modules that enqueue jobs.
+JOB_HANDLERS = {
+    'check_badges': 'kanbanapi.badges_logic.check_badges_for_user',
+    'rollover_user': 'kanbanapi.habits_logic.rollover_user',
+    'rebalance_positions': 'kanbanapi.positions_logic.rebalance_positions',
+}
+
+# Delay before retry n is RETRY_BASE_DELAY * 2 ** (n - 1).
+RETRY_BASE_DELAY = datetime.timedelta(seconds=10)
+
+# A running job whose worker hasn't finished it after this long is assumed lost (crashed worker) and claimed again.
+JOB_LOCK_TIMEOUT = datetime.timedelta(minutes=10)
+
+
+def _run_eagerly():
+    # JOB_QUEUE = {'EAGER': True} runs jobs right after the enqueuing transaction commits, without a worker.
+    # Unset, it follows DEBUG: a development server has no run_jobs worker by default.
+    return getattr(settings, 'JOB_QUEUE', {}).get('EAGER', settings.DEBUG)
+
+
+def _run_eager_job(kind, payload):
+    """
+    Runs a job in the enqueuing request, after its commit. Errors are logged like a worker's, not raised:
+    the write already committed, so the request must still succeed.
+    """
+    try:
+        import_string(JOB_HANDLERS[kind])(**payload)
+    except Exception:
+        logger.exception("Eager job (%s) failed", kind)
+
+
+def enqueue_many(jobs):
+    """
+    Enqueues [(kind, payload, dedupe_key)] with one insert. Jobs whose dedupe_key is already pending are dropped.
+    Call it inside the transaction of the write that needs the work, so the job exists only if the write commits.
+    """
+    jobs = list(jobs)
+    for kind, _, _ in jobs:
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+    if _run_eagerly():
+        for kind, payload, _ in jobs:
+            transaction.on_commit(lambda kind=kind, payload=payload: _run_eager_job(kind, payload))
+        return
+    Job.objects.bulk_create(
+        [Job(kind=kind, payload=payload, dedupe_key=dedupe_key) for kind, payload, dedupe_key in jobs],
+        ignore_conflicts=True,
+    )
+
+
+def enqueue(kind, payload, dedupe_key=None):
+    enqueue_many([(kind, payload, dedupe_key)])
+
+
+def badge_check_job(user_id, badge_types=None):
+    """
+    Returns the (kind, payload, dedupe_key) of a badge check for the user, for enqueue_many().
+    """
+    badge_types = sorted(badge_types) if badge_types else None
+    dedupe_key = f"check_badges:{user_id}:{','.join(badge_types or ['all'])}"
+    return 'check_badges', {'user_id': user_id, 'badge_types': badge_types}, dedupe_key
+
+
+def enqueue_badge_check(user_id, badge_types=None):
+    """
+    Queues a badge check for the user (deduplicated while one for the same badge types is pending).
+    """
+    enqueue_many([badge_check_job(user_id, badge_types)])
+
+
+def claim_jobs(limit, worker_id=None):
+    """
+    Claims up to `limit` due jobs for this worker and returns their ids.
+    Rows locked by another worker's claim are skipped (SKIP LOCKED) instead of waited for; the conditional
+    UPDATE keeps claiming safe on databases without row locks (SQLite).
+    """
+    now = timezone.now()
+    claim_id = f'{worker_id or "worker"}:{uuid.uuid4().hex[:12]}'
+    with transaction.atomic():
+        # Jobs of crashed workers go back to the queue, unless the same work is already pending again
+        stale_jobs = Job.objects.filter(status='running', locked_at__lt=now - JOB_LOCK_TIMEOUT)
+        stale_jobs.filter(dedupe_key__in=Job.objects.filter(status='pending').values('dedupe_key')).delete()
+        # Only one of several stale jobs with the same dedupe key can be pending (unique_pending_job_dedupe_key)
+        first_stale_ids = stale_jobs.exclude(dedupe_key=None).values('dedupe_key').annotate(first_id=Min('id')).values('first_id')
+        stale_jobs.exclude(dedupe_key=None).exclude(pk__in=first_stale_ids).delete()
+        stale_jobs.update(status='pending', locked_by='')
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', run_after__lte=now)
+            .order_by('run_after', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Job.objects.filter(pk__in=ids, status='pending').update(
+            status='running', locked_by=claim_id, locked_at=now, attempts=F('attempts') + 1,
+        )
+    return list(Job.objects.filter(pk__in=ids, locked_by=claim_id).values_list('id', flat=True))
+
+
+def run_job(job_id):
+    """
+    Runs one claimed job. It is deleted when it succeeds; on error it is retried with exponential backoff
+    until max_attempts, then kept with status 'failed'. Returns True if the job succeeded.
+    Module-level so process pools can call it; it closes its database connection afterwards.
+    """
+    close_old_connections()
+    try:
+        job = Job.objects.get(pk=job_id, status='running')
+        try:
+            import_string(JOB_HANDLERS[job.kind])(**job.payload)
+        except Exception:
+            error = traceback.format_exc()
+            logger.exception("Job %s (%s) failed (attempt %s/%s)", job.pk, job.kind, job.attempts, job.max_attempts)
+            if job.attempts >= job.max_attempts:
+                Job.objects.filter(pk=job.pk).update(status='failed', last_error=error, locked_by='', locked_at=None)
+            else:
+                try:
+                    with transaction.atomic():
+                        Job.objects.filter(pk=job.pk).update(
+                            status='pending', last_error=error, locked_by='', locked_at=None,
+                            run_after=timezone.now() + RETRY_BASE_DELAY * 2 ** (job.attempts - 1),
+                        )
+                except IntegrityError:
+                    # The same work was queued again meanwhile: that job is the retry, it keeps the error
+                    Job.objects.filter(dedupe_key=job.dedupe_key, status='pending').update(last_error=error)
+                    Job.objects.filter(pk=job.pk).delete()
+            return False
+        Job.objects.filter(pk=job.pk).delete()
+        return True
+    finally:
+        close_old_connections()
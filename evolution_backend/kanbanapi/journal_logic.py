@@ -0,0 +1,33 @@
+# kanbanapi/journal_logic.py
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from .models import JournalEntry
+from .counters_logic import record_journal_day
+from .cache_logic import bump_data_versions
+from .jobs_logic import enqueue_badge_check
+
+
+def save_journal_entry(user, entry_date, data):
+    """
+    Writes the user's journal entry for `entry_date` with `data` (validated title/content): updates the existing
+    entry in place, or creates it. The unique (user, entry_date) constraint decides between concurrent saves;
+    the loser of a create race updates the winner's entry instead. Returns (entry, created).
+    """
+    entries = JournalEntry.objects.filter(user_id=user, entry_date=entry_date)
+    with transaction.atomic():
+        if entries.update(**data, updated_at=timezone.now()):
+            bump_data_versions(user.pk, 'journal')
+            return entries.get(), False
+        try:
+            with transaction.atomic(): # Savepoint, so a lost race doesn't abort the outer transaction
+                entry = JournalEntry.objects.create(user_id=user, entry_date=entry_date, **data)
+        except IntegrityError:
+            # Created by a concurrent request since the update: update it. Any other integrity error is raised.
+            if not entries.update(**data, updated_at=timezone.now()):
+                raise
+            bump_data_versions(user.pk, 'journal')
+            return entries.get(), False
+        record_journal_day(user.pk, entry_date)
+        bump_data_versions(user.pk, 'journal')
+        enqueue_badge_check(user.pk, ['journal'])
+        return entry, True
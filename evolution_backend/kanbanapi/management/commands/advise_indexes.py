@@ -0,0 +1,54 @@
+# kanbanapi/management/commands/advise_indexes.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from kanbanapi.index_advisor_logic import seed_advisor_data, advise_indexes, DEFAULT_IGNORED_TABLES, SUPPORTED_VENDORS
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Seeds a realistic dataset, replays the ORM queries of the kanbanapi endpoints, runs EXPLAIN on each
+    and reports sequential scans and indexes no endpoint uses. Everything runs in one transaction that is
+    rolled back, so it can be pointed at a staging copy of the database before a deploy.
+    """
+    help = "Reports sequential scans and unused indexes in the queries of the kanbanapi endpoints (EXPLAIN based)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help='Number of seeded users.')
+        parser.add_argument('--tasks', type=int, default=500, help='Tasks per seeded user.')
+        parser.add_argument('--days', type=int, default=365, help='Days of habit history per seeded user.')
+        parser.add_argument('--ignore-table', action='append', default=[], help='Table whose sequential scans are expected (repeatable).')
+        parser.add_argument('--fail-on-seq-scan', action='store_true', help='Exit with an error if any sequential scan is found (for CI).')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in SUPPORTED_VENDORS:
+            # Checked before seeding, so an unsupported database isn't filled with data only to fail on the first EXPLAIN
+            raise CommandError(
+                f"advise_indexes can't read {connection.display_name} query plans; "
+                f"point it at one of: {', '.join(SUPPORTED_VENDORS)}."
+            )
+        try:
+            with transaction.atomic():
+                user = seed_advisor_data(users=options['users'], tasks_per_user=options['tasks'], days=options['days'])
+                report = advise_indexes(user, ignored_tables=DEFAULT_IGNORED_TABLES | set(options['ignore_table']))
+                raise _Rollback()
+        except _Rollback:
+            pass # Seeded data is discarded
+
+        self.stdout.write(f"Explained {report['queries']} queries.")
+        if report['seq_scans']:
+            self.stdout.write(self.style.WARNING(f"{len(report['seq_scans'])} sequential scan(s):"))
+            for path, table, sql in report['seq_scans']:
+                self.stdout.write(f"  {path}: {table}\n    {sql[:300]}")
+        else:
+            self.stdout.write(self.style.SUCCESS("No sequential scans."))
+        if report['unused_indexes']:
+            self.stdout.write(self.style.WARNING("Indexes not used by any endpoint query (check the write paths before dropping them):"))
+            for name, table in report['unused_indexes']:
+                self.stdout.write(f"  {table}.{name}")
+
+        if report['seq_scans'] and options['fail_on_seq_scan']:
+            raise CommandError("Sequential scans found.")
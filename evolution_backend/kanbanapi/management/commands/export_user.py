@@ -0,0 +1,38 @@
+# kanbanapi/management/commands/export_user.py
+import sys
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from kanbanapi.export_logic import iter_export, export_filename, EXPORT_FORMATS, EXPORT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    """
+    Writes a user's full export (the same data as GET /api/export/) to a file, streaming it chunk by chunk.
+    """
+    help = "Exports all of a user's data as NDJSON or as a zip of CSV files."
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--format', dest='export_format', choices=EXPORT_FORMATS, default='ndjson')
+        parser.add_argument('--output', help="File to write (default: the export's file name in the current directory; '-' for stdout).")
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Rows read per database round trip.')
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist.")
+
+        chunks = iter_export(user, options['export_format'], options['chunk_size'])
+        output = options['output'] or export_filename(user, options['export_format'])
+        if output == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+        written = 0
+        with open(output, 'wb') as export_file:
+            for chunk in chunks:
+                export_file.write(chunk)
+                written += len(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Exported {user.username} to {output} ({written} bytes)."))
@@ -0,0 +1,43 @@
+# kanbanapi/management/commands/import_user_data.py
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from kanbanapi.import_logic import (
+    import_rows, iter_import_rows, guess_import_format, ImportFileError, IMPORT_TARGETS, IMPORT_FORMATS, IMPORT_BATCH_SIZE,
+)
+
+
+class Command(BaseCommand):
+    """
+    Imports tasks or events for a user from a CSV or iCalendar file, with the same validation as POST /api/import/.
+    """
+    help = "Bulk-imports tasks or events for a user from a CSV or .ics file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('path')
+        parser.add_argument('--kind', choices=list(IMPORT_TARGETS), default='tasks')
+        parser.add_argument('--file-format', choices=IMPORT_FORMATS, help='Default: from the file extension.')
+        parser.add_argument('--skip-invalid', action='store_true', help='Import the valid rows even if some rows are invalid.')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Rows per bulk insert.')
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist.")
+
+        file_format = options['file_format'] or guess_import_format(options['path'])
+        try:
+            with open(options['path'], 'rb') as import_file:
+                rows = iter_import_rows(import_file, options['kind'], file_format)
+                report = import_rows(user, options['kind'], rows, skip_invalid=options['skip_invalid'], batch_size=options['batch_size'])
+        except (ImportFileError, OSError, UnicodeDecodeError) as error:
+            raise CommandError(str(error))
+
+        for error in report['errors']:
+            self.stdout.write(self.style.WARNING(f"Row {error['row']}: {error['errors']}"))
+        if report['error_count'] > len(report['errors']):
+            self.stdout.write(self.style.WARNING(f"... and {report['error_count'] - len(report['errors'])} more invalid row(s)."))
+        if report['error_count'] and not options['skip_invalid']:
+            raise CommandError(f"{report['error_count']} invalid row(s), nothing was imported (use --skip-invalid to import the valid rows).")
+        self.stdout.write(self.style.SUCCESS(f"Imported {report['created']} {options['kind']} for {user.username}."))
@@ -0,0 +1,15 @@
+# kanbanapi/management/commands/purge_tombstones.py
+from django.core.management.base import BaseCommand
+from kanbanapi.sync_logic import purge_tombstones, TOMBSTONE_RETENTION
+
+
+class Command(BaseCommand):
+    """
+    Deletes the delta-sync tombstones older than TOMBSTONE_RETENTION.
+    Meant to run daily from cron; clients with an older cursor get a full snapshot from /api/sync/.
+    """
+    help = "Deletes delete-tombstones that are older than the sync retention period."
+
+    def handle(self, *args, **options):
+        deleted = purge_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} tombstone(s) older than {TOMBSTONE_RETENTION.days} days."))
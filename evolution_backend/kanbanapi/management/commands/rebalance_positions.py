@@ -0,0 +1,17 @@
+# kanbanapi/management/commands/rebalance_positions.py
+from django.core.management.base import BaseCommand
+from kanbanapi.positions_logic import columns_to_rebalance, rebalance_positions, MAX_POSITION_LENGTH
+
+
+class Command(BaseCommand):
+    """
+    Rewrites the card positions of every column that holds keys longer than MAX_POSITION_LENGTH.
+    Meant to run periodically (e.g. nightly from cron); moves only ever rewrite the moved card.
+    """
+    help = "Rebalances task card position keys that have grown too long."
+
+    def handle(self, *args, **options):
+        columns = columns_to_rebalance()
+        for user_id, status in columns:
+            rebalance_positions(user_id, status)
+        self.stdout.write(self.style.SUCCESS(f"Rebalanced {len(columns)} column(s) with keys longer than {MAX_POSITION_LENGTH} characters."))
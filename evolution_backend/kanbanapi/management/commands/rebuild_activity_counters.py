@@ -0,0 +1,18 @@
+# kanbanapi/management/commands/rebuild_activity_counters.py
+from django.core.management.base import BaseCommand
+from kanbanapi.counters_logic import rebuild_all_counters, REBUILD_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    """
+    Recomputes every user's UserActivityCounters row from the source tables.
+    Use it to backfill the table or to repair drift (e.g. after rows were edited in the admin).
+    """
+    help = "Rebuilds the per-user activity counters (tasks, events, journal days and streaks) for all users."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=REBUILD_CHUNK_SIZE, help='Number of users processed per batch.')
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_all_counters(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt activity counters for {rebuilt} user(s)."))
@@ -0,0 +1,27 @@
+# kanbanapi/management/commands/rollover_habits.py
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from kanbanapi.habits_logic import rollover_all_users, ROLLOVER_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    """
+    Runs the daily habit rollover for all users.
+    Meant to be scheduled shortly after midnight (e.g. from cron).
+    """
+    help = "Rolls habits over to a new day for all users: finalizes the previous day and creates today's trackers and habit task cards."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Day to roll over to (YYYY-MM-DD). Defaults to today.')
+        parser.add_argument('--chunk-size', type=int, default=ROLLOVER_CHUNK_SIZE, help='Number of users processed per batch.')
+
+    def handle(self, *args, **options):
+        today_date = None
+        if options['date']:
+            try:
+                today_date = datetime.date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError(f"Invalid --date '{options['date']}', expected YYYY-MM-DD.")
+
+        rolled_over = rollover_all_users(today_date, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rolled over habits for {rolled_over} user(s)."))
@@ -0,0 +1,67 @@
+# kanbanapi/management/commands/run_jobs.py
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from django.core.management.base import BaseCommand
+from django.db import connections
+from kanbanapi.jobs_logic import claim_jobs, run_job
+
+
+class Command(BaseCommand):
+    """
+    Background worker for the database job queue (kanbanapi.models.Job).
+    Claims due jobs and runs them on a pool of threads (default) or processes, until stopped with SIGINT/SIGTERM.
+    Several workers can run side by side: claiming uses SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    help = "Runs queued background jobs (badge checks, per-user habit rollover, position rebalancing)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Number of jobs run at the same time.')
+        parser.add_argument('--processes', action='store_true', help='Use a process pool instead of a thread pool.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--once', action='store_true', help='Exit once no job is due instead of polling.')
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        if options['processes']:
+            connections.close_all() # Forked processes must not share the parent's connection
+            pool = ProcessPoolExecutor(max_workers=concurrency)
+        else:
+            pool = ThreadPoolExecutor(max_workers=concurrency)
+
+        self.stdout.write(f"Worker {worker_id} started ({concurrency} {'processes' if options['processes'] else 'threads'}).")
+        running = set()
+        succeeded = failed = 0
+        try:
+            while not self._stopping:
+                job_ids = claim_jobs(concurrency - len(running), worker_id) if len(running) < concurrency else []
+                running.update(pool.submit(run_job, job_id) for job_id in job_ids)
+                if not running:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                done, running = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.result():
+                        succeeded += 1
+                    else:
+                        failed += 1
+        finally:
+            pool.shutdown(wait=True) # Let running jobs finish
+            for future in running:
+                if future.result():
+                    succeeded += 1
+                else:
+                    failed += 1
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker_id} stopped: {succeeded} job(s) succeeded, {failed} failed."))
+
+    def _stop(self, signum, frame):
+        self._stopping = True
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0013_customuser_habit_streak'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserActivityCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tasks_to_do', models.IntegerField(default=0)),
+                ('tasks_processing', models.IntegerField(default=0)),
+                ('tasks_done', models.IntegerField(default=0)),
+                ('tasks_low', models.IntegerField(default=0)),
+                ('tasks_medium', models.IntegerField(default=0)),
+                ('tasks_high', models.IntegerField(default=0)),
+                ('tasks_personal', models.IntegerField(default=0)),
+                ('tasks_professional', models.IntegerField(default=0)),
+                ('tasks_educational', models.IntegerField(default=0)),
+                ('tasks_health_wellness', models.IntegerField(default=0)),
+                ('tasks_financial', models.IntegerField(default=0)),
+                ('tasks_other', models.IntegerField(default=0)),
+                ('events_created', models.IntegerField(default=0)),
+                ('journal_days', models.IntegerField(default=0, help_text='Number of distinct days with a journal entry.')),
+                ('journal_last_date', models.DateField(blank=True, help_text='Most recent day with a journal entry.', null=True)),
+                ('journal_streak', models.IntegerField(default=0, help_text='Consecutive journal days ending on journal_last_date.')),
+                ('journal_longest_streak', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='activity_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0014_useractivitycounters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HabitDaySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total', models.IntegerField(default=0, help_text='Number of habits tracked on this day.')),
+                ('completed', models.IntegerField(default=0, help_text='Number of habits completed on this day.')),
+                ('percentage', models.DecimalField(decimal_places=2, default=0.0, max_digits=5)),
+                ('streak_at_day', models.IntegerField(default=0, help_text='Habit streak at the end of this day (set when the day is finalized).')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='habit_day_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'date')},
+            },
+        ),
+    ]
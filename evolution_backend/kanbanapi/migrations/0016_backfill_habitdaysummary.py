@@ -0,0 +1,48 @@
+import datetime
+from django.db import migrations
+from django.db.models import Count, Q
+
+
+def backfill_habit_day_summaries(apps, schema_editor):
+    """
+    Builds a HabitDaySummary row for every (user, day) that has HabitTracker entries,
+    including the streak at the end of each day.
+    """
+    HabitTracker = apps.get_model('kanbanapi', 'HabitTracker')
+    HabitDaySummary = apps.get_model('kanbanapi', 'HabitDaySummary')
+
+    day_rows = (
+        HabitTracker.objects.values('habit__user_id', 'tracking_date')
+        .annotate(total=Count('id'), completed=Count('id', filter=Q(is_completed=True)))
+        .order_by('habit__user_id', 'tracking_date')
+    )
+    summaries = []
+    previous = (None, None, 0) # (user_id, date, streak)
+    for row in day_rows.iterator():
+        user_id, day = row['habit__user_id'], row['tracking_date']
+        percentage = (row['completed'] / row['total']) * 100 if row['total'] else 0
+        previous_user_id, previous_day, previous_streak = previous
+        if percentage >= 80:
+            consecutive = previous_user_id == user_id and previous_day == day - datetime.timedelta(days=1)
+            streak = previous_streak + 1 if consecutive else 1
+        else:
+            streak = 0
+        summaries.append(HabitDaySummary(
+            user_id=user_id, date=day, total=row['total'], completed=row['completed'],
+            percentage=round(percentage, 2), streak_at_day=streak,
+        ))
+        previous = (user_id, day, streak)
+        if len(summaries) >= 1000:
+            HabitDaySummary.objects.bulk_create(summaries, ignore_conflicts=True)
+            summaries = []
+    HabitDaySummary.objects.bulk_create(summaries, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kanbanapi", "0015_habitdaysummary"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_habit_day_summaries, migrations.RunPython.noop),
+    ]
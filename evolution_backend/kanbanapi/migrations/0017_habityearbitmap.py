@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0016_backfill_habitdaysummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HabitYearBitmap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('bits', models.BinaryField(default=b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00', max_length=46)),
+                ('habit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='year_bitmaps', to='kanbanapi.habitlist')),
+            ],
+            options={
+                'unique_together': {('habit', 'year')},
+            },
+        ),
+    ]
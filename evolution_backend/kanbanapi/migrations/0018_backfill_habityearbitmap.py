@@ -0,0 +1,40 @@
+import datetime
+from django.db import migrations
+
+
+BITMAP_BYTES = 46
+
+
+def backfill_habit_year_bitmaps(apps, schema_editor):
+    """
+    Builds the year bitmaps of every habit from its completed HabitTracker entries before today.
+    """
+    HabitTracker = apps.get_model('kanbanapi', 'HabitTracker')
+    HabitYearBitmap = apps.get_model('kanbanapi', 'HabitYearBitmap')
+
+    completed_days = (
+        HabitTracker.objects.filter(is_completed=True, tracking_date__lt=datetime.date.today())
+        .values_list('habit_id', 'tracking_date')
+        .order_by('habit_id', 'tracking_date')
+    )
+    bitmaps = {}
+    for habit_id, day in completed_days.iterator():
+        bits = bitmaps.setdefault((habit_id, day.year), bytearray(BITMAP_BYTES))
+        index = day.timetuple().tm_yday - 1
+        bits[index // 8] |= 1 << (index % 8)
+
+    HabitYearBitmap.objects.bulk_create(
+        [HabitYearBitmap(habit_id=habit_id, year=year, bits=bytes(bits)) for (habit_id, year), bits in bitmaps.items()],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kanbanapi", "0017_habityearbitmap"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_habit_year_bitmaps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0018_backfill_habityearbitmap'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('tasks', 'Tasks'), ('habits', 'Habits'), ('events', 'Events'), ('journal', 'Journal'), ('badges', 'Badges')], max_length=20)),
+                ('version', models.BigIntegerField(default=1)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='data_versions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'scope')},
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0019_userdataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(choices=[('task', 'Task'), ('event', 'Event'), ('habit', 'Habit'), ('habit_tracker', 'Habit Tracker'), ('journal_entry', 'Journal Entry')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='journalentry',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='taskcard',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['user', 'updated_at'], name='kanbanapi_e_user_id_3f1933_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['user_id', 'updated_at'], name='kanbanapi_j_user_id_5d4049_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcard',
+            index=models.Index(fields=['user', 'updated_at'], name='kanbanapi_t_user_id_0fc117_idx'),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tombstones', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['user', 'deleted_at'], name='kanbanapi_t_user_id_3ada20_idx'),
+        ),
+    ]
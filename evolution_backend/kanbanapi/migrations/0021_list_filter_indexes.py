@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0020_sync_updated_at_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['user', 'start_time'], name='kanbanapi_e_user_id_ce7387_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcard',
+            index=models.Index(fields=['user', 'status'], name='kanbanapi_t_user_id_935311_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcard',
+            index=models.Index(fields=['user', 'due_date'], name='kanbanapi_t_user_id_1a1591_idx'),
+        ),
+    ]
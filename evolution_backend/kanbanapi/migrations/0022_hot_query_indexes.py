@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0021_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='habittracker',
+            index=models.Index(fields=['habit', 'tracking_date', 'is_completed'], name='kanbanapi_h_habit_i_950e59_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcard',
+            index=models.Index(fields=['user', 'is_habit', 'due_date'], name='kanbanapi_t_user_id_a47a7f_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+
+POSITION_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def evenly_spaced_keys(count):
+    """
+    Frozen copy of positions_logic.evenly_spaced_keys().
+    """
+    base = len(POSITION_DIGITS)
+    length = 1
+    while base ** length <= count * 4:
+        length += 1
+    step = base ** length // (count + 1)
+    keys = []
+    for i in range(1, count + 1):
+        value = i * step
+        digits = []
+        for _ in range(length):
+            value, digit = divmod(value, base)
+            digits.append(POSITION_DIGITS[digit])
+        keys.append(''.join(reversed(digits)).rstrip('0'))
+    return keys
+
+
+def backfill_positions(apps, schema_editor):
+    """
+    Gives every existing card a position within its (user, status) column, in id order (the order the lists had so far).
+    """
+    TaskCard = apps.get_model('kanbanapi', 'TaskCard')
+    columns = TaskCard.objects.values_list('user_id', 'status').distinct().order_by()
+    for user_id, status in columns:
+        tasks = list(TaskCard.objects.filter(user_id=user_id, status=status).order_by('id').only('id'))
+        for task, key in zip(tasks, evenly_spaced_keys(len(tasks))):
+            task.position = key
+        TaskCard.objects.bulk_update(tasks, ['position'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0022_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='taskcard',
+            name='kanbanapi_t_user_id_935311_idx',
+        ),
+        migrations.AddField(
+            model_name='taskcard',
+            name='position',
+            field=models.CharField(default='', help_text='Sort key of the card within its column.', max_length=255, verbose_name='Position'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcard',
+            index=models.Index(fields=['user', 'status', 'position'], name='kanbanapi_t_user_id_66da12_idx'),
+        ),
+        migrations.RunPython(backfill_positions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0023_taskcard_position'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(help_text='Handler name, see jobs_logic.JOB_HANDLERS.', max_length=50)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Keyword arguments of the handler.')),
+                ('dedupe_key', models.CharField(blank=True, max_length=200, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('max_attempts', models.IntegerField(default=5)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text='The job is not claimed before this time (used for retry backoff).')),
+                ('locked_by', models.CharField(blank=True, default='', max_length=100)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'run_after'], name='kanbanapi_j_status_acdb3e_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('dedupe_key',), name='unique_pending_job_dedupe_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:32
+
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def remove_duplicate_habit_tasks(apps, schema_editor):
+    """
+    Keeps one task of every habit tracker entry that was materialized more than once (concurrent rollovers)
+    and deletes the others, with their delete tombstones and task counter adjustments.
+    The kept task is the oldest one whose status agrees with the tracker ('done' when it is completed, any other
+    status when it isn't), or the oldest one when none agrees, so the tracker and its task stay in sync.
+    """
+    TaskCard = apps.get_model('kanbanapi', 'TaskCard')
+    Tombstone = apps.get_model('kanbanapi', 'Tombstone')
+    UserActivityCounters = apps.get_model('kanbanapi', 'UserActivityCounters')
+    duplicated_tracker_ids = (
+        TaskCard.objects.filter(habit_tracker__isnull=False)
+        .values('habit_tracker_id')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values_list('habit_tracker_id', flat=True)
+    )
+    tasks_by_tracker = {}
+    tasks = (
+        TaskCard.objects.filter(habit_tracker_id__in=list(duplicated_tracker_ids))
+        .annotate(tracker_completed=F('habit_tracker__is_completed'))
+        .order_by('habit_tracker_id', 'id')
+    )
+    for task in tasks:
+        tasks_by_tracker.setdefault(task.habit_tracker_id, []).append(task)
+    duplicates = []
+    for tracker_tasks in tasks_by_tracker.values():
+        kept = next(
+            (task for task in tracker_tasks if (task.status == 'done') == task.tracker_completed),
+            tracker_tasks[0],
+        )
+        duplicates.extend(task for task in tracker_tasks if task is not kept)
+    if not duplicates:
+        return
+
+    for task in duplicates:
+        UserActivityCounters.objects.filter(user_id=task.user_id).update(**{
+            f'tasks_{value}': F(f'tasks_{value}') - 1 for value in (task.status, task.priority, task.task_type)
+        })
+    Tombstone.objects.bulk_create([
+        Tombstone(user_id=task.user_id, model_name='task', object_id=task.pk) for task in duplicates if task.user_id
+    ])
+    TaskCard.objects.filter(pk__in=[task.pk for task in duplicates]).delete()
+    print(f"Removed {len(duplicates)} duplicate habit task cards.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0024_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_habit_tasks, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='taskcard',
+            constraint=models.UniqueConstraint(fields=('habit_tracker',), name='unique_task_per_habit_tracker'),
+        ),
+    ]
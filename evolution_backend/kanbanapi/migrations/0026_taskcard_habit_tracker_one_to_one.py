@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0025_taskcard_unique_habit_tracker'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='taskcard',
+            name='unique_task_per_habit_tracker',
+        ),
+        migrations.AlterField(
+            model_name='taskcard',
+            name='habit_tracker',
+            field=models.OneToOneField(blank=True, help_text='The Habit Tracker entry associated with this task (for habit tasks).', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='task_card', to='kanbanapi.habittracker', verbose_name='Related Habit Tracker Entry'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:34
+
+import datetime
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+# Separates the text of merged same-day entries in the entry that is kept
+MERGED_ENTRY_SEPARATOR = '\n\n---\n\n'
+
+
+def backfill_entry_dates(apps, schema_editor):
+    """
+    Sets entry_date from date_created, then merges the entries of each (user, day) into the most recently
+    updated one: the old unique_together on the full timestamp never enforced one entry per day.
+    The other entries' titles and contents are appended to the kept entry's content (oldest first)
+    before those rows are removed, so no text is lost. The day counters are unaffected, they count distinct days.
+    """
+    JournalEntry = apps.get_model('kanbanapi', 'JournalEntry')
+    Tombstone = apps.get_model('kanbanapi', 'Tombstone')
+    JournalEntry.objects.update(entry_date=TruncDate('date_created'))
+
+    duplicated_days = (
+        JournalEntry.objects.values('user_id', 'entry_date')
+        .annotate(count=Count('journal_entry_id'))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    now = timezone.now()
+    duplicates = []
+    for day in duplicated_days:
+        entries = list(
+            JournalEntry.objects.filter(user_id=day['user_id'], entry_date=day['entry_date'])
+            .order_by('-updated_at', '-journal_entry_id')
+        )
+        kept, merged = entries[0], entries[:0:-1]
+        content = MERGED_ENTRY_SEPARATOR.join(
+            [kept.content] + [f"{entry.title}\n\n{entry.content}" for entry in merged]
+        )
+        # updated_at moves forward so sync clients fetch the merged content
+        JournalEntry.objects.filter(pk=kept.pk).update(content=content, updated_at=now)
+        duplicates.extend((day['user_id'], entry.pk) for entry in merged)
+    if not duplicates:
+        return
+    Tombstone.objects.bulk_create([
+        Tombstone(user_id=user_id, model_name='journal_entry', object_id=entry_id) for user_id, entry_id in duplicates
+    ])
+    JournalEntry.objects.filter(journal_entry_id__in=[entry_id for _, entry_id in duplicates]).delete()
+    print(f"Merged {len(duplicates)} duplicate journal entries into the entry kept for their day.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanbanapi', '0026_taskcard_habit_tracker_one_to_one'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='journalentry',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='journalentry',
+            name='entry_date',
+            field=models.DateField(default=datetime.date.today, verbose_name='Entry Date'),
+        ),
+        migrations.RunPython(backfill_entry_dates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='journalentry',
+            constraint=models.UniqueConstraint(fields=('user_id', 'entry_date'), name='unique_journal_entry_per_day'),
+        ),
+    ]
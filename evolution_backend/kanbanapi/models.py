@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+import datetime
 
 
 class CustomUser(AbstractUser):
@@ -60,7 +62,21 @@ class TaskCard(models.Model):
     related_event = models.ForeignKey('Event', on_delete=models.SET_NULL, null=True, blank=True, related_name='related_tasks', verbose_name="Related Event", help_text="The event this task is related to (optional).")
 
     # New field to link to HabitTracker
-    habit_tracker = models.ForeignKey('HabitTracker', on_delete=models.SET_NULL, null=True, blank=True, related_name='task_card', verbose_name="Related Habit Tracker Entry", help_text="The Habit Tracker entry associated with this task (for habit tasks).")
+    habit_tracker = models.OneToOneField('HabitTracker', on_delete=models.SET_NULL, null=True, blank=True, related_name='task_card', verbose_name="Related Habit Tracker Entry", help_text="The Habit Tracker entry associated with this task (for habit tasks).")
+
+    # Order within the (user, status) column: a fractional base-36 key, see positions_logic
+    position = models.CharField(max_length=255, default='', verbose_name="Position", help_text="Sort key of the card within its column.")
+
+    # Set on every save; queryset .update() calls must set it explicitly so delta sync sees the change
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'updated_at']), # Delta sync
+            models.Index(fields=['user', 'status', 'position']), # Columns in order; also serves status filters
+            models.Index(fields=['user', 'due_date']),
+            models.Index(fields=['user', 'is_habit', 'due_date']), # Rollover: previous days' habit tasks
+        ]
 
     def __str__(self):
         return self.title
@@ -88,18 +104,77 @@ class HabitTracker(models.Model):
     habit = models.ForeignKey(HabitList, on_delete=models.CASCADE) # Link to HabitList model
     tracking_date = models.DateField(null=False, blank=False)
     is_completed = models.BooleanField(default=False, null=False, blank=False)
-    completion_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0.00) # Store daily completion %
+    completion_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0.00) # No longer written: see HabitDaySummary.percentage
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('habit', 'tracking_date') # Ensure unique entries per habit per day
+        indexes = [
+            models.Index(fields=['habit', 'tracking_date', 'is_completed']), # Day completion counts without reading rows
+        ]
 
     def __str__(self):
         return f"{self.habit.habit_name} - {self.tracking_date}"
     
 
 
+class HabitDaySummary(models.Model):
+    """
+    Per-user daily habit summary: how many of the day's habits were completed.
+    Kept up to date when trackers are toggled and finalized (streak_at_day) by the daily rollover,
+    so streak, weekly and heatmap reads are a range scan over (user, date).
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='habit_day_summaries')
+    date = models.DateField()
+    total = models.IntegerField(default=0, help_text='Number of habits tracked on this day.')
+    completed = models.IntegerField(default=0, help_text='Number of habits completed on this day.')
+    percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)
+    streak_at_day = models.IntegerField(default=0, help_text='Habit streak at the end of this day (set when the day is finalized).')
+
+    class Meta:
+        unique_together = ('user', 'date') # One summary per user per day
+
+    def __str__(self):
+        return f"{self.user} - {self.date}: {self.completed}/{self.total}"
+
+
+class HabitYearBitmap(models.Model):
+    """
+    Compact completion history of one habit for one calendar year:
+    bit (day_of_year - 1) is set when the habit was completed that day (46 bytes per habit per year).
+    Written for finalized days by the daily rollover, so heatmaps don't need to scan HabitTracker rows.
+    """
+    BITMAP_BYTES = 46 # 366 days, rounded up to whole bytes
+
+    habit = models.ForeignKey(HabitList, on_delete=models.CASCADE, related_name='year_bitmaps')
+    year = models.IntegerField()
+    bits = models.BinaryField(max_length=BITMAP_BYTES, default=bytes(BITMAP_BYTES))
+
+    class Meta:
+        unique_together = ('habit', 'year') # One bitmap per habit per year
+
+    @staticmethod
+    def day_index(day):
+        return day.timetuple().tm_yday - 1
+
+    def is_completed(self, day):
+        index = self.day_index(day)
+        return bool(self.bits[index // 8] & (1 << (index % 8)))
+
+    def set_completed(self, day, completed):
+        index = self.day_index(day)
+        bits = bytearray(self.bits)
+        if completed:
+            bits[index // 8] |= 1 << (index % 8)
+        else:
+            bits[index // 8] &= ~(1 << (index % 8))
+        self.bits = bytes(bits)
+
+    def __str__(self):
+        return f"{self.habit.habit_name} - {self.year}"
+
+
 class Event(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     subject = models.CharField(max_length=200)
@@ -108,6 +183,13 @@ class Event(models.Model):
     end_time = models.DateTimeField()
     description = models.TextField(blank=True, null=True)
     category_color = models.CharField(max_length=200, blank=True, null=True) # You can use this for color-coding events
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'updated_at']), # Delta sync
+            models.Index(fields=['user', 'start_time']), # Event list window, upcoming events
+        ]
 
     def __str__(self):
         return self.subject
@@ -118,11 +200,19 @@ class JournalEntry(models.Model):
     title = models.CharField(max_length=200)  # Or adjust max_length as needed
     content = models.TextField()
     date_created = models.DateTimeField(auto_now_add=True) # Automatically set on creation
+    # Calendar day the entry belongs to, stored so "today's entry" is an index lookup
+    entry_date = models.DateField(default=datetime.date.today, verbose_name="Entry Date")
     user_id = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        # Ensure only one journal entry per user per day
-        unique_together = ('user_id', 'date_created') # Corrected unique_together
+        constraints = [
+            # Ensure only one journal entry per user per day
+            models.UniqueConstraint(fields=['user_id', 'entry_date'], name='unique_journal_entry_per_day'),
+        ]
+        indexes = [
+            models.Index(fields=['user_id', 'updated_at']), # Delta sync
+        ]
 
         def __str__(self):
             return f"{self.title} - {self.date_created.strftime('%Y-%m-%d')}"
@@ -164,4 +254,139 @@ class UserBadge(models.Model):
         unique_together = ('user', 'badge') # Ensure a user can earn each badge only once
 
     def __str__(self):
-        return f"{self.user.username} - {self.badge.title}"
\ No newline at end of file
+        return f"{self.user.username} - {self.badge.title}"
+
+
+class UserActivityCounters(models.Model):
+    """
+    Materialized per-user activity counters, kept up to date by the TaskCard/Event/JournalEntry write paths
+    so analytics and badge checks read a single row instead of recounting.
+    The `rebuild_activity_counters` management command recomputes them from scratch to repair drift.
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='activity_counters')
+
+    # Tasks by status
+    tasks_to_do = models.IntegerField(default=0)
+    tasks_processing = models.IntegerField(default=0)
+    tasks_done = models.IntegerField(default=0)
+    # Tasks by priority
+    tasks_low = models.IntegerField(default=0)
+    tasks_medium = models.IntegerField(default=0)
+    tasks_high = models.IntegerField(default=0)
+    # Tasks by type
+    tasks_personal = models.IntegerField(default=0)
+    tasks_professional = models.IntegerField(default=0)
+    tasks_educational = models.IntegerField(default=0)
+    tasks_health_wellness = models.IntegerField(default=0)
+    tasks_financial = models.IntegerField(default=0)
+    tasks_other = models.IntegerField(default=0)
+
+    events_created = models.IntegerField(default=0)
+
+    # Journal
+    journal_days = models.IntegerField(default=0, help_text='Number of distinct days with a journal entry.')
+    journal_last_date = models.DateField(null=True, blank=True, help_text='Most recent day with a journal entry.')
+    journal_streak = models.IntegerField(default=0, help_text='Consecutive journal days ending on journal_last_date.')
+    journal_longest_streak = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def current_journal_streak(self, today):
+        """
+        Returns the journal streak that is still alive on `today` (it may end today or yesterday).
+        """
+        if self.journal_last_date and self.journal_last_date >= today - datetime.timedelta(days=1):
+            return self.journal_streak
+        return 0
+
+    def __str__(self):
+        return f"Activity counters for {self.user}"
+
+
+class UserDataVersion(models.Model):
+    """
+    Per-user, per-resource change marker. `version` is bumped by every write to the resource,
+    so caches keyed by it can never serve data older than the last write.
+    """
+    SCOPE_CHOICES = [
+        ('tasks', 'Tasks'),
+        ('habits', 'Habits'),
+        ('events', 'Events'),
+        ('journal', 'Journal'),
+        ('badges', 'Badges'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='data_versions')
+    scope = models.CharField(max_length=20, choices=SCOPE_CHOICES)
+    version = models.BigIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'scope') # One marker per user per resource
+
+    def __str__(self):
+        return f"{self.user} - {self.scope} v{self.version}"
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted row, so delta sync (/api/sync/) can tell clients what to remove.
+    Written by every delete path (including the rollover's bulk delete of old habit tasks)
+    and purged after sync_logic.TOMBSTONE_RETENTION by the `purge_tombstones` management command.
+    """
+    MODEL_CHOICES = [
+        ('task', 'Task'),
+        ('event', 'Event'),
+        ('habit', 'Habit'),
+        ('habit_tracker', 'Habit Tracker'),
+        ('journal_entry', 'Journal Entry'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='tombstones')
+    model_name = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.model_name} #{self.object_id}"
+
+
+class Job(models.Model):
+    """
+    Background job stored in the database (no external broker): enqueued by request handlers with jobs_logic.enqueue()
+    and executed by the `run_jobs` worker command, which claims pending jobs with SELECT ... FOR UPDATE SKIP LOCKED.
+    A pending job's dedupe_key is unique, so enqueueing the same work twice before it runs is a no-op.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('failed', 'Failed'), # Gave up after max_attempts; succeeded jobs are deleted
+    ]
+
+    kind = models.CharField(max_length=50, help_text='Handler name, see jobs_logic.JOB_HANDLERS.')
+    payload = models.JSONField(default=dict, blank=True, help_text='Keyword arguments of the handler.')
+    dedupe_key = models.CharField(max_length=200, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now, help_text='The job is not claimed before this time (used for retry backoff).')
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after']), # Claiming
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['dedupe_key'], condition=models.Q(status='pending'), name='unique_pending_job_dedupe_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
@@ -0,0 +1,27 @@
+# kanbanapi/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination that is only applied when the client asks for it with `?page_size=N`,
+    so existing clients keep receiving plain lists. The `next`/`previous` links keep the page size.
+    Views set `ordering` to a field covered by an index together with the user column.
+    """
+    page_size = None
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = 'id'
+
+
+class TaskCursorPagination(OptionalCursorPagination):
+    # Column by column, each in card order: position keys are only comparable within one (user, status) column
+    ordering = ('status', 'position', 'id')
+
+
+class EventCursorPagination(OptionalCursorPagination):
+    ordering = 'start_time'
+
+
+class JournalEntryCursorPagination(OptionalCursorPagination):
+    ordering = '-entry_date' # Newest first, like the unpaginated list (one entry per day)
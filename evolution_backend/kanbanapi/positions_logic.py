@@ -0,0 +1,164 @@
+# kanbanapi/positions_logic.py
+import logging
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import Length
+from django.utils import timezone
+from .models import TaskCard
+from .cache_logic import bump_data_versions
+
+
+logger = logging.getLogger(__name__)
+
+# --- Fractional position keys ---
+# A card's position within its (user, status) column is a base-36 fraction written as a string ("i" = 0.5),
+# so keys compare lexicographically in the same order as the fractions they represent and a key can always
+# be generated between two others: a move only rewrites the moved card.
+# Digits and lowercase letters sort the same way in every database collation.
+POSITION_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+POSITION_BASE = len(POSITION_DIGITS)
+
+# Columns whose keys grow longer than this (after many moves to the same spot) are rebalanced.
+MAX_POSITION_LENGTH = 16
+
+# Cards added at either end of a column step the neighbouring key by one unit at this many digits,
+# so about a million cards can be appended one after another before a key gets longer.
+STEP_KEY_LENGTH = 4
+
+
+def is_valid_position(key):
+    return bool(key) and all(char in POSITION_DIGITS for char in key) and not key.endswith('0')
+
+
+def _midpoint(a, b):
+    """
+    Returns a key strictly between `a` and `b` ('' is the lowest bound, None the highest). Neither may end in '0'.
+    """
+    if b is not None:
+        # Keep the common prefix (treating missing digits of `a` as 0)
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else '0') == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = POSITION_DIGITS.index(a[0]) if a else 0
+    digit_b = POSITION_DIGITS.index(b[0]) if b is not None else POSITION_BASE
+    if digit_b - digit_a > 1:
+        return POSITION_DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[0]
+    return POSITION_DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _step(key, delta):
+    """
+    Adds `delta` (1 or -1) to the last digit of `key` padded to STEP_KEY_LENGTH digits, with carry.
+    Returns the new key (trailing zeros stripped), or None when there is no room left at that length.
+    """
+    digits = [POSITION_DIGITS.index(char) for char in key.ljust(STEP_KEY_LENGTH, '0')]
+    for i in range(len(digits) - 1, -1, -1):
+        digits[i] += delta
+        if 0 <= digits[i] < POSITION_BASE:
+            break
+        digits[i] %= POSITION_BASE
+    else:
+        return None # Overflowed past 'zzzz' or below '0000'
+    new_key = ''.join(POSITION_DIGITS[digit] for digit in digits).rstrip('0')
+    return new_key or None
+
+
+def key_between(a, b):
+    """
+    Returns a position key strictly between `a` and `b`. Either may be None (start or end of the column).
+    """
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"Position {a!r} is not before {b!r}.")
+    if a and b is None:
+        return _step(a, 1) or _midpoint(a, None)
+    if b and a is None:
+        return _step(b, -1) or _midpoint('', b)
+    return _midpoint(a or '', b)
+
+
+def evenly_spaced_keys(count):
+    """
+    Returns `count` increasing keys of equal length, spread over the whole key space (with room between them).
+    """
+    length = 1
+    while POSITION_BASE ** length <= count * 4:
+        length += 1
+    step = POSITION_BASE ** length // (count + 1)
+    keys = []
+    for i in range(1, count + 1):
+        value = i * step
+        digits = []
+        for _ in range(length):
+            value, digit = divmod(value, POSITION_BASE)
+            digits.append(POSITION_DIGITS[digit])
+        keys.append(''.join(reversed(digits)).rstrip('0'))
+    return keys
+
+
+def next_positions(user_id, status, count=1):
+    """
+    Returns `count` increasing keys after the last card of the user's `status` column.
+    """
+    last = TaskCard.objects.filter(user_id=user_id, status=status).aggregate(last=Max('position'))['last']
+    keys = []
+    for _ in range(count):
+        last = key_between(last or None, None)
+        keys.append(last)
+    return keys
+
+
+def needs_rebalance(key):
+    return len(key) > MAX_POSITION_LENGTH
+
+
+def rebalance_positions(user_id, status):
+    """
+    Rewrites the keys of one (user, status) column as evenly spaced short keys, keeping the order.
+    Returns the number of cards rewritten.
+    """
+    with transaction.atomic():
+        tasks = list(
+            TaskCard.objects.select_for_update().filter(user_id=user_id, status=status).order_by('position', 'id').only('id', 'position', 'updated_at')
+        )
+        now = timezone.now()
+        for task, key in zip(tasks, evenly_spaced_keys(len(tasks))):
+            task.position = key
+            task.updated_at = now # Delta sync clients must receive the new keys
+        TaskCard.objects.bulk_update(tasks, ['position', 'updated_at'], batch_size=1000)
+        bump_data_versions(user_id, 'tasks')
+    logger.info("Rebalanced %s '%s' card positions for user %s.", len(tasks), status, user_id)
+    return len(tasks)
+
+
+def columns_to_rebalance():
+    """
+    Returns the (user_id, status) columns holding at least one key longer than MAX_POSITION_LENGTH.
+    """
+    return list(
+        TaskCard.objects.annotate(key_length=Length('position'))
+        .filter(key_length__gt=MAX_POSITION_LENGTH)
+        .values_list('user_id', 'status')
+        .distinct()
+    )
+
+
+def move_position(user, status, after_id=None, before_id=None):
+    """
+    Returns the key placing a card in the user's `status` column right after the card `after_id`
+    and before the card `before_id` (either may be None; with neither, the card goes to the end).
+    Raises ValueError if a neighbour is not in that column or they are out of order.
+    """
+    if after_id is None and before_id is None:
+        return next_positions(user.pk, status)[0]
+    neighbours = dict(
+        TaskCard.objects.filter(user=user, status=status, pk__in=[pk for pk in (after_id, before_id) if pk is not None])
+        .values_list('pk', 'position')
+    )
+    for pk in (after_id, before_id):
+        if pk is not None and pk not in neighbours:
+            raise ValueError(f"Task {pk} is not in the '{status}' column.")
+    return key_between(neighbours.get(after_id), neighbours.get(before_id))
@@ -4,10 +4,76 @@ from django.contrib.auth import get_user_model
 from .models import TaskCard, HabitList, HabitTracker, Event, JournalEntry, Badge, UserBadge
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from django.db.models.functions import Substr
+from .filters_logic import fields_param
 
 
 User = get_user_model() # Get the User model
 
+# Length of the text previews (summary_preview, content_preview) offered to list views.
+PREVIEW_LENGTH = 200
+
+
+class PreviewField(serializers.Field):
+    """
+    Read-only preview: the first PREVIEW_LENGTH characters of the model's `text_field`.
+    Read from the queryset annotation of the same name when the view added one (see SparseFieldsetMixin),
+    so the full text doesn't have to be loaded.
+    """
+
+    def __init__(self, text_field, **kwargs):
+        self.text_field = text_field
+        super().__init__(source='*', read_only=True, **kwargs)
+
+    def to_representation(self, instance):
+        if self.field_name in instance.__dict__:
+            return instance.__dict__[self.field_name]
+        return (getattr(instance, self.text_field) or '')[:PREVIEW_LENGTH]
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin for the opt-in ?fields= parameter of GET requests, e.g. ?fields=id,title,position:
+    only the listed fields are serialized. Fields in Meta.opt_in_fields (previews) are only serialized when listed.
+    List views pass their queryset through sparse_queryset() so the columns left out aren't loaded either.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.requested_fields(self.context.get('request'))
+        opt_in_fields = getattr(self.Meta, 'opt_in_fields', ())
+        for name in list(self.fields):
+            if (requested is not None and name not in requested) or (requested is None and name in opt_in_fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, request):
+        if request is None or request.method != 'GET':
+            return None # Writes always validate and return the full representation
+        return fields_param(request.query_params, cls.Meta.fields)
+
+    @classmethod
+    def sparse_queryset(cls, queryset, request):
+        """
+        Defers the text columns the requested fields don't use and annotates the requested previews with their
+        database-side prefix. Without ?fields= the queryset is returned as is.
+        """
+        requested = cls.requested_fields(request)
+        if requested is None:
+            return queryset
+        declared = cls._declared_fields
+        used_sources = {declared[name].source if name in declared else name for name in requested}
+        unused_text = [
+            field.name for field in queryset.model._meta.concrete_fields
+            if isinstance(field, models.TextField) and field.name not in used_sources
+        ]
+        previews = {
+            name: Substr(declared[name].text_field, 1, PREVIEW_LENGTH)
+            for name in requested if isinstance(declared.get(name), PreviewField)
+        }
+        return queryset.defer(*unused_text).annotate(**previews)
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration.
@@ -52,19 +118,22 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
-class TaskCardSerializer(serializers.ModelSerializer):
+class TaskCardSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the TaskCard model.
     """
     user_username = serializers.SerializerMethodField(read_only=True) # Added user_username field
+    summary_preview = PreviewField('summary')
 
     class Meta:
         model = TaskCard
         fields = [
             'id', 'title', 'summary', 'status', 'task_type', 'priority', 'due_date',
-            'user', 'user_username', 'is_habit', 'is_event', 'related_event' # Added new fields
+            'user', 'user_username', 'is_habit', 'is_event', 'related_event', # Added new fields
+            'position', 'updated_at', 'summary_preview',
         ]
-        read_only_fields = ['user', 'user_username'] # user and user_username are read-only in API output
+        opt_in_fields = ['summary_preview'] # Only with ?fields=
+        read_only_fields = ['user', 'user_username', 'position', 'updated_at'] # position changes through /tasks/<id>/move/ # user and user_username are read-only in API output
 
     def get_user_username(self, obj):
         """
@@ -75,7 +144,7 @@ class TaskCardSerializer(serializers.ModelSerializer):
         return None # Or handle case where user might be null
     
 
-class HabitListSerializer(serializers.ModelSerializer):
+class HabitListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = HabitList
         fields = ['id', 'habit_name', 'habit_description', 'created_at', 'updated_at'] # Include 'id' to get habit_id in response
@@ -83,31 +152,36 @@ class HabitListSerializer(serializers.ModelSerializer):
 
 
 # --- HabitTracker Serializer ---
-class HabitTrackerSerializer(serializers.ModelSerializer):
+class HabitTrackerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     habit_name = serializers.CharField(source='habit.habit_name', read_only=True)
     habit_description = serializers.CharField(source='habit.habit_description', read_only=True)
 
     class Meta:
         model = HabitTracker
-        fields = ['id', 'habit', 'habit_name', 'habit_description', 'tracking_date', 'is_completed', 'completion_percentage']
-        read_only_fields = ['id', 'habit', 'tracking_date', 'completion_percentage', 'habit_name', 'habit_description'] # Keep read-only fields
+        # The day's completion percentage is HabitDaySummary.percentage (weekly habits, heatmap, dashboard)
+        fields = ['id', 'habit', 'habit_name', 'habit_description', 'tracking_date', 'is_completed']
+        read_only_fields = ['id', 'habit', 'tracking_date', 'habit_name', 'habit_description'] # Keep read-only fields
         # Remove 'is_completed' from read_only_fields to make it writable for updates
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Event
-        fields = ['id', 'subject', 'location', 'start_time', 'end_time', 'category_color', 'description'] # Include 'id'
+        fields = ['id', 'subject', 'location', 'start_time', 'end_time', 'category_color', 'description', 'updated_at'] # Include 'id'
+        read_only_fields = ['updated_at']
+
 
+class JournalEntrySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    content_preview = PreviewField('content')
 
-class JournalEntrySerializer(serializers.ModelSerializer):
     class Meta:
         model = JournalEntry
-        fields = ['journal_entry_id', 'title', 'content', 'date_created'] # Include date_created for retrieval
-        read_only_fields = ['journal_entry_id', 'date_created'] # These fields should not be updated directly during create/update
+        fields = ['journal_entry_id', 'title', 'content', 'date_created', 'entry_date', 'updated_at', 'content_preview'] # Include date_created for retrieval
+        opt_in_fields = ['content_preview'] # Only with ?fields=
+        read_only_fields = ['journal_entry_id', 'date_created', 'entry_date', 'updated_at'] # These fields should not be updated directly during create/update
 
 
-class BadgeSerializer(serializers.ModelSerializer):
+class BadgeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the Badge model.
     """
@@ -118,7 +192,7 @@ class BadgeSerializer(serializers.ModelSerializer):
 
 
 # NEW SERIALIZER FOR UserBadge MODEL
-class UserBadgeSerializer(serializers.ModelSerializer):
+class UserBadgeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the UserBadge model.
     """
@@ -0,0 +1,24 @@
+# kanbanapi/signals.py
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .authentication import token_user_cache
+
+
+# --- Token cache invalidation ---
+# Connected through signals rather than explicit calls because tokens and users are also changed
+# outside this app's views (admin, `changepassword`, shell).
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    token_user_cache.invalidate([instance.key])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_saved_user_tokens(sender, instance, created, **kwargs):
+    """
+    A saved user may have a new password, be deactivated or have a new profile: drop the cached copies.
+    """
+    if not created:
+        token_user_cache.invalidate_user(instance.pk)
@@ -0,0 +1,88 @@
+# kanbanapi/sync_logic.py
+import datetime
+from collections import defaultdict
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import TaskCard, HabitList, HabitTracker, Event, JournalEntry, Tombstone
+from .serializers import TaskCardSerializer, HabitListSerializer, HabitTrackerSerializer, EventSerializer, JournalEntrySerializer
+
+
+# Rows are re-sent if they changed up to this long before the cursor: a write whose transaction
+# commits shortly after its updated_at was taken would otherwise be missed by a concurrent sync.
+SYNC_CURSOR_OVERLAP = datetime.timedelta(seconds=5)
+
+# How long tombstones are kept. Clients whose cursor is older get a full snapshot (reset=True) instead.
+TOMBSTONE_RETENTION = datetime.timedelta(days=30)
+
+
+def record_deletions(model_name, deleted_rows):
+    """
+    Writes a tombstone for each (user_id, object_id) in `deleted_rows`, with a single insert.
+    Call it inside the transaction of the delete.
+    """
+    Tombstone.objects.bulk_create([
+        Tombstone(user_id=user_id, model_name=model_name, object_id=object_id)
+        for user_id, object_id in deleted_rows
+    ])
+
+
+def parse_cursor(value):
+    """
+    Parses a sync cursor (an ISO 8601 timestamp, as returned by sync_data()). Raises ValueError if it is invalid.
+    """
+    cursor = parse_datetime(value)
+    if cursor is None:
+        raise ValueError(f"Invalid sync cursor: {value!r}")
+    if timezone.is_naive(cursor):
+        cursor = timezone.make_aware(cursor, datetime.timezone.utc)
+    return cursor
+
+
+def _sync_sources(user):
+    """
+    Returns {response key: (queryset of the user's rows, serializer class, tombstone model name)}.
+    """
+    return {
+        'tasks': (TaskCard.objects.filter(user=user).select_related('user'), TaskCardSerializer, 'task'),
+        'events': (Event.objects.filter(user=user), EventSerializer, 'event'),
+        'habits': (HabitList.objects.filter(user=user), HabitListSerializer, 'habit'),
+        'habitTrackers': (HabitTracker.objects.filter(habit__user=user).select_related('habit'), HabitTrackerSerializer, 'habit_tracker'),
+        'journalEntries': (JournalEntry.objects.filter(user_id=user), JournalEntrySerializer, 'journal_entry'),
+    }
+
+
+def sync_data(user, since=None):
+    """
+    Returns the user's rows created or changed since the cursor `since` and the ids deleted since then:
+    {'cursor': ..., 'reset': False, 'tasks': {'changed': [...], 'deleted': [ids]}, 'events': ..., ...}.
+    Without a cursor, or with one older than the tombstone retention, every row is returned with reset=True
+    and the client should replace its local copy. Clients pass the returned cursor to their next call.
+    """
+    now = timezone.now()
+    reset = since is None or since < now - TOMBSTONE_RETENTION
+    changed_after = None if reset else since - SYNC_CURSOR_OVERLAP
+
+    deleted_ids = defaultdict(list)
+    if not reset:
+        tombstones = Tombstone.objects.filter(user=user, deleted_at__gte=changed_after).values_list('model_name', 'object_id')
+        for model_name, object_id in tombstones:
+            deleted_ids[model_name].append(object_id)
+
+    data = {'cursor': now.isoformat(), 'reset': reset}
+    for key, (queryset, serializer_class, model_name) in _sync_sources(user).items():
+        if not reset:
+            queryset = queryset.filter(updated_at__gte=changed_after)
+        data[key] = {
+            'changed': serializer_class(queryset, many=True).data,
+            'deleted': deleted_ids[model_name],
+        }
+    return data
+
+
+def purge_tombstones(now=None):
+    """
+    Deletes the tombstones older than TOMBSTONE_RETENTION. Returns the number of tombstones deleted.
+    """
+    now = now or timezone.now()
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=now - TOMBSTONE_RETENTION).delete()
+    return deleted
@@ -0,0 +1,158 @@
+# kanbanapi/tasks_logic.py
+from collections import Counter
+from django.db import transaction
+from django.utils import timezone
+from .models import TaskCard, HabitTracker
+from .serializers import TaskCardSerializer
+from .counters_logic import apply_counter_deltas, task_counter_fields
+from .cache_logic import bump_data_versions
+from .habits_logic import record_habit_toggle
+from .sync_logic import record_deletions
+from .jobs_logic import enqueue_badge_check
+from .positions_logic import next_positions, is_valid_position
+
+
+# Upper bound on the number of operations accepted by one bulk request.
+MAX_BULK_OPERATIONS = 500
+
+BULK_OPERATIONS = ('create', 'update', 'delete')
+
+
+def _validate_task_operations(user, operations, tasks_by_id):
+    """
+    Validates every operation without writing anything.
+    Returns ([(operation, serializer or task)], {index: errors}).
+    """
+    validated = []
+    errors = {}
+    seen_ids = set()
+    for index, operation in enumerate(operations):
+        op = operation.get('op') if isinstance(operation, dict) else None
+        if op not in BULK_OPERATIONS:
+            errors[index] = {'op': [f"Expected one of: {', '.join(BULK_OPERATIONS)}."]}
+            continue
+        if op == 'create':
+            serializer = TaskCardSerializer(data=operation.get('data') or {})
+            if serializer.is_valid():
+                validated.append((operation, serializer))
+            else:
+                errors[index] = serializer.errors
+            continue
+
+        task = tasks_by_id.get(operation.get('id'))
+        if task is None:
+            errors[index] = {'id': ['Task not found.']}
+        elif task.pk in seen_ids:
+            errors[index] = {'id': ['A task can only appear once per request.']}
+        elif op == 'update':
+            serializer = TaskCardSerializer(task, data=operation.get('data') or {}, partial=True)
+            if 'position' in operation and not is_valid_position(operation['position']):
+                errors[index] = {'position': ['Invalid position key.']}
+            elif serializer.is_valid():
+                validated.append((operation, serializer))
+            else:
+                errors[index] = serializer.errors
+        else:
+            validated.append((operation, task))
+        if task is not None:
+            seen_ids.add(task.pk)
+    return validated, errors
+
+
+def apply_task_operations(user, operations):
+    """
+    Executes a list of task operations in one transaction:
+    {'op': 'create', 'data': {...}}, {'op': 'update', 'id': 1, 'data': {...}} or {'op': 'delete', 'id': 2}.
+    An update may also carry a 'position' key (see positions_logic); created cards, and updated cards that change
+    column without one, are appended to the end of their column.
+    Writes are batched (one bulk insert, one bulk update per set of changed fields, one delete), together with
+    the habit-tracker sync of habit tasks, the counters, the data versions and the delete tombstones.
+    Returns (results, ok). If any operation is invalid nothing is written and `results` holds the per-item errors.
+    """
+    ids = [operation.get('id') for operation in operations if isinstance(operation, dict) and operation.get('op') in ('update', 'delete')]
+    tasks_by_id = {
+        task.pk: task
+        for task in TaskCard.objects.filter(user=user, pk__in=[task_id for task_id in ids if isinstance(task_id, int)])
+        .select_related('habit_tracker')
+    }
+    for task in tasks_by_id.values():
+        task.user = user # Serializer output reads user.username
+
+    validated, errors = _validate_task_operations(user, operations, tasks_by_id)
+    if errors:
+        return [
+            {'index': index, 'status': 'error', 'errors': errors[index]} if index in errors else {'index': index, 'status': 'ok'}
+            for index in range(len(operations))
+        ], False
+
+    now = timezone.now()
+    counter_deltas = Counter()
+    results = []
+    new_tasks, updated_tasks, deleted_tasks, toggled_trackers = [], [], [], []
+    appended_tasks = [] # Cards that get a position at the end of their column
+    updated_fields = set()
+    completed_count = 0
+    with transaction.atomic():
+        for operation, item in validated:
+            if operation['op'] == 'create':
+                task = TaskCard(user=user, **item.validated_data)
+                new_tasks.append(task)
+                appended_tasks.append(task)
+                counter_deltas.update(task_counter_fields(task))
+                completed_count += task.status == 'done'
+                results.append(('created', task))
+            elif operation['op'] == 'update':
+                task = item.instance
+                counter_deltas.subtract(task_counter_fields(task))
+                previous_status = task.status
+                for field, value in item.validated_data.items():
+                    setattr(task, field, value)
+                updated_fields.update(item.validated_data)
+                if 'position' in operation:
+                    task.position = operation['position']
+                    updated_fields.add('position')
+                elif task.status != previous_status:
+                    appended_tasks.append(task)
+                    updated_fields.add('position')
+                task.updated_at = now # bulk_update doesn't apply auto_now
+                updated_tasks.append(task)
+                counter_deltas.update(task_counter_fields(task))
+                completed_count += task.status == 'done' and previous_status != 'done'
+
+                # --- Habit Tracker Sync (Task to Habit), as in TaskCardViewSet.update ---
+                new_status = item.validated_data.get('status')
+                tracker = task.habit_tracker
+                if task.is_habit and tracker and new_status in ('done', 'to_do') and tracker.is_completed != (new_status == 'done'):
+                    tracker.is_completed = new_status == 'done'
+                    tracker.updated_at = now
+                    toggled_trackers.append(tracker)
+                results.append(('updated', task))
+            else:
+                deleted_tasks.append(item)
+                counter_deltas.subtract(task_counter_fields(item))
+                results.append(('deleted', item))
+
+        for column in {task.status for task in appended_tasks}:
+            column_tasks = [task for task in appended_tasks if task.status == column]
+            for task, key in zip(column_tasks, next_positions(user.pk, column, len(column_tasks))):
+                task.position = key
+        TaskCard.objects.bulk_create(new_tasks)
+        if updated_tasks:
+            TaskCard.objects.bulk_update(updated_tasks, sorted(updated_fields) + ['updated_at'])
+        if deleted_tasks:
+            record_deletions('task', [(user.pk, task.pk) for task in deleted_tasks])
+            TaskCard.objects.filter(pk__in=[task.pk for task in deleted_tasks]).delete()
+        if toggled_trackers:
+            HabitTracker.objects.bulk_update(toggled_trackers, ['is_completed', 'updated_at'])
+            for tracker in toggled_trackers:
+                record_habit_toggle(user.pk, tracker)
+            bump_data_versions(user.pk, 'habits')
+        apply_counter_deltas(user.pk, counter_deltas)
+        bump_data_versions(user.pk, 'tasks')
+        if completed_count:
+            enqueue_badge_check(user.pk, ['task'])
+
+    return [
+        {'index': index, 'status': result_status, 'id': task.pk, 'data': TaskCardSerializer(task).data if result_status != 'deleted' else None}
+        for index, (result_status, task) in enumerate(results)
+    ], True
@@ -0,0 +1,126 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from kanbanapi.models import HabitList
+from kanbanapi.analytics_logic import DASHBOARD_SECTIONS
+from kanbanapi.habits_logic import rollover_users
+
+
+User = get_user_model()
+
+
+class AnalyticsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('analyst', 'analyst@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = timezone.now().date()
+
+    def create_task(self, title, **data):
+        response = self.client.post('/api/tasks/', {'title': title, **data}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def get_json(self, url, params=None):
+        response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+
+class DashboardTests(AnalyticsTestCase):
+
+    # Dashboard section -> the endpoint serving the same data on its own
+    SECTION_ENDPOINTS = {
+        'statusCounts': '/api/tasks/status-counts/',
+        'priorityCounts': '/api/tasks/priority-counts/',
+        'typeCounts': '/api/tasks/type-counts/',
+        'completionRate': '/api/tasks/completion-rate/',
+        'weeklyHabits': '/api/habits/weekly-completion/',
+        'habitStreak': '/api/habits/streak/',
+        'upcomingEvents': '/api/events/upcoming/',
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.create_task('Report', status='done', priority='high', task_type='financial', due_date=self.today.isoformat())
+        self.create_task('Call', due_date=self.today.isoformat())
+        HabitList.objects.create(user=self.user, habit_name='Stretch')
+        rollover_users([self.user.pk], self.today)
+        start = timezone.now() + datetime.timedelta(minutes=1)
+        self.client.post('/api/events/', {
+            'subject': 'Soon', 'start_time': start.isoformat(), 'end_time': (start + datetime.timedelta(minutes=30)).isoformat(),
+        }, format='json')
+
+    def test_every_section_equals_its_own_endpoint(self):
+        dashboard = self.get_json('/api/dashboard/')
+
+        self.assertEqual(list(dashboard), DASHBOARD_SECTIONS)
+        for section, url in self.SECTION_ENDPOINTS.items():
+            with self.subTest(section=section):
+                self.assertEqual(dashboard[section], self.get_json(url))
+        self.assertEqual(dashboard['statusCounts'], [{'name': 'to_do', 'value': 2}, {'name': 'done', 'value': 1}])
+
+    def test_sections_select_part_of_the_payload(self):
+        dashboard = self.get_json('/api/dashboard/', {'sections': 'habitStreak, statusCounts'})
+
+        # Returned in dashboard order, whatever the order asked for
+        self.assertEqual(list(dashboard), ['statusCounts', 'habitStreak'])
+
+    def test_unknown_sections_are_rejected(self):
+        response = self.client.get('/api/dashboard/', {'sections': 'statusCounts,weather'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('weather', response.data['error'])
+
+
+class CompletionSeriesTests(AnalyticsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for due_date, status in (('2026-01-05', 'done'), ('2026-01-07', 'to_do'), ('2026-01-20', 'processing'), ('2026-03-02', 'done')):
+            self.create_task(f'Due {due_date}', status=status, due_date=due_date)
+
+    def series(self, **params):
+        return [
+            (row['period'], row['to_do'], row['processing'], row['done'])
+            for row in self.get_json('/api/tasks/completion-series/', params)
+        ]
+
+    def test_weeks_are_zero_filled(self):
+        self.assertEqual(self.series(start='2026-01-01', end='2026-01-25', granularity='week'), [
+            ('2025-12-29', 0, 0, 0),
+            ('2026-01-05', 1, 0, 1),
+            ('2026-01-12', 0, 0, 0),
+            ('2026-01-19', 0, 1, 0),
+        ])
+
+    def test_months_are_zero_filled(self):
+        self.assertEqual(self.series(start='2026-01-15', end='2026-03-10', granularity='month'), [
+            ('2026-01-01', 0, 1, 0),
+            ('2026-02-01', 0, 0, 0),
+            ('2026-03-01', 0, 0, 1),
+        ])
+
+    def test_days_default_to_the_current_week(self):
+        series = self.series()
+
+        self.assertEqual(len(series), 7)
+        self.assertEqual(datetime.date.fromisoformat(series[0][0]).weekday(), 0)
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in (
+            {'granularity': 'year'},
+            {'start': '2026-13-01'},
+            {'end': 'tomorrow'},
+            {'start': '2026-02-01', 'end': '2026-01-01'},
+            {'start': '2000-01-01', 'end': '2026-01-01', 'granularity': 'day'},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get('/api/tasks/completion-series/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.data)
@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from kanbanapi.authentication import token_user_cache
+
+
+User = get_user_model()
+
+
+class CachedTokenAuthenticationTests(TestCase):
+
+    def setUp(self):
+        token_user_cache.clear()
+        cache.clear()
+        self.user = User.objects.create_user('holder', 'holder@example.com', 'pw')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def tearDown(self):
+        token_user_cache.clear()
+
+    def get_tasks(self):
+        return self.client.get('/api/tasks/')
+
+    def test_repeated_requests_skip_the_token_lookup(self):
+        self.assertEqual(self.get_tasks().status_code, 200)
+        with self.assertNumQueries(2): # Data version + tasks; no token/user query
+            self.assertEqual(self.get_tasks().status_code, 200)
+
+    def test_deleted_token_is_rejected_at_once(self):
+        self.get_tasks()
+
+        self.token.delete()
+
+        self.assertEqual(self.get_tasks().status_code, 401)
+
+    def test_deactivated_user_is_rejected_at_once(self):
+        self.get_tasks()
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.get_tasks().status_code, 401)
+
+    def test_saved_user_is_loaded_again(self):
+        self.get_tasks()
+        self.user.name = 'Renamed'
+        self.user.save()
+
+        self.assertIsNone(token_user_cache.get(self.token.key))
+        self.get_tasks()
+        self.assertEqual(token_user_cache.get(self.token.key)[0].name, 'Renamed')
+
+    @override_settings(TOKEN_AUTH_CACHE={'SIZE': 0, 'TTL': 60, 'USE_DJANGO_CACHE': True})
+    def test_shared_cache_entries_are_revoked_too(self):
+        key = self.token.key
+        self.get_tasks()
+        self.assertIsNotNone(token_user_cache.get(key))
+
+        self.token.delete()
+
+        self.assertIsNone(token_user_cache.get(key))
+        self.assertEqual(self.get_tasks().status_code, 401)
+
+    @override_settings(TOKEN_AUTH_CACHE={'SIZE': 10000, 'TTL': 0, 'USE_DJANGO_CACHE': False})
+    def test_expired_entries_are_looked_up_again(self):
+        self.get_tasks()
+
+        self.assertIsNone(token_user_cache.get(self.token.key))
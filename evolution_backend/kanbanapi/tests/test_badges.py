@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from kanbanapi.models import Badge, UserBadge, UserActivityCounters
+from kanbanapi.badges_logic import BADGE_RULES, check_and_award_badges
+from kanbanapi.counters_logic import get_counters
+
+
+User = get_user_model()
+
+
+class BadgeTests(TestCase):
+
+    def setUp(self):
+        for rule in BADGE_RULES:
+            Badge.objects.create(title=rule['title'], description=rule['title'], criteria='', badge_type=rule['badge_type'])
+        self.user = User.objects.create_user('earner', 'earner@example.com', 'pw')
+        get_counters(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def earned(self):
+        return sorted(UserBadge.objects.filter(user=self.user).values_list('badge__title', flat=True))
+
+    def test_badges_are_awarded_once_their_threshold_is_reached(self):
+        UserActivityCounters.objects.filter(user=self.user).update(tasks_done=10, events_created=25)
+
+        self.assertEqual(sorted(badge.title for badge in check_and_award_badges(self.user)), ['Organized', 'Planner', 'Scheduler'])
+        self.assertEqual(check_and_award_badges(self.user), []) # Already earned
+
+    def test_check_is_limited_to_the_given_badge_types(self):
+        UserActivityCounters.objects.filter(user=self.user).update(tasks_done=10, events_created=25)
+
+        check_and_award_badges(self.user, ['task'])
+
+        self.assertEqual(self.earned(), ['Organized'])
+
+    @override_settings(JOB_QUEUE={'EAGER': True})
+    def test_completing_the_tenth_task_awards_a_badge_after_commit(self):
+        UserActivityCounters.objects.filter(user=self.user).update(tasks_done=9)
+        task_id = self.client.post('/api/tasks/', {'title': 'Tenth'}, format='json').data['id']
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.client.put(f'/api/tasks/{task_id}/', {'title': 'Tenth', 'status': 'done'}, format='json')
+            self.assertEqual(self.earned(), []) # Not before the write commits
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.earned(), ['Organized'])
@@ -0,0 +1,152 @@
+import datetime
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+from kanbanapi.models import TaskCard, Event, JournalEntry, HabitDaySummary
+from kanbanapi.cache_logic import bump_data_versions
+from kanbanapi.counters_logic import record_task_change
+from kanbanapi.habits_logic import invalidate_habit_streaks
+
+
+User = get_user_model()
+
+
+class ConditionalListTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('cacher', 'cacher@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.post('/api/tasks/', {'title': 'First'}, format='json')
+
+    def test_matching_etag_is_answered_with_304_until_a_write(self):
+        first = self.client.get('/api/tasks/')
+        etag = first['ETag']
+
+        self.assertEqual(self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.post('/api/tasks/', {'title': 'Second'}, format='json')
+        response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_the_query(self):
+        etag = self.client.get('/api/tasks/')['ETag']
+
+        self.assertEqual(self.client.get('/api/tasks/?status=done', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_modified_since_is_ignored(self):
+        # Whole-second dates can't tell a write in the same second apart from the last read
+        response = self.client.get('/api/tasks/', HTTP_IF_MODIFIED_SINCE=http_date())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+
+
+class ResponseCacheTests(TestCase):
+    """
+    Each write below goes behind the views' backs (no data version bump), so a cached response stays stale
+    until its scope's version is bumped, as every API write does.
+    """
+
+    # Decorated analytics endpoint -> the data scopes it is cached under
+    CACHED_ENDPOINTS = {
+        '/api/tasks/status-counts/': ['tasks'],
+        '/api/tasks/priority-counts/': ['tasks'],
+        '/api/tasks/type-counts/': ['tasks'],
+        '/api/tasks/completion-rate/': ['tasks'],
+        '/api/tasks/completion-series/': ['tasks'],
+        '/api/habits/weekly-completion/': ['habits'],
+        '/api/habits/heatmap/': ['habits'],
+        '/api/habits/streak/': ['habits'],
+        '/api/events/upcoming/': ['events'],
+        '/api/journalentries/stats/': ['journal'],
+        '/api/dashboard/': ['tasks', 'habits', 'events'],
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('cached', 'cached@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.now = timezone.now()
+        # Freeze the clock of the cache keys, so 'minute' entries don't roll over during a test
+        clock = mock.patch('kanbanapi.cache_logic.timezone')
+        self.cache_clock = clock.start()
+        self.cache_clock.now.return_value = self.now
+        self.addCleanup(clock.stop)
+
+    def write_behind_the_cache(self, scope):
+        today = datetime.date.today()
+        if scope == 'tasks':
+            task = TaskCard.objects.create(user=self.user, title='Quiet', status='done', priority='high', due_date=today)
+            record_task_change(self.user.pk, new=task)
+        elif scope == 'habits':
+            # One more habit completed today, and the streak grown by one more past day
+            summary, _ = HabitDaySummary.objects.get_or_create(user=self.user, date=today)
+            summary.total = summary.completed = summary.completed + 1
+            summary.percentage = 100
+            summary.save()
+            streak_days = HabitDaySummary.objects.filter(user=self.user, date__lt=today).count()
+            HabitDaySummary.objects.create(
+                user=self.user, date=today - datetime.timedelta(days=streak_days + 1), total=1, completed=1, percentage=100,
+            )
+            invalidate_habit_streaks(self.user.pk) # The streaks' own cache, not the response's
+        elif scope == 'events':
+            start = timezone.now() + datetime.timedelta(seconds=30)
+            Event.objects.create(user=self.user, subject='Quiet', start_time=start, end_time=start)
+        elif scope == 'journal':
+            JournalEntry.objects.create(user_id=self.user, title='Quiet', content='...', entry_date=today)
+
+    def get_data(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_a_write_to_a_scope_makes_the_cached_responses_unreachable(self):
+        for url, scopes in self.CACHED_ENDPOINTS.items():
+            for scope in scopes:
+                with self.subTest(url=url, scope=scope):
+                    cached = self.get_data(url)
+                    self.write_behind_the_cache(scope)
+                    self.assertEqual(self.get_data(url), cached)
+
+                    bump_data_versions(self.user.pk, scope)
+
+                    self.assertNotEqual(self.get_data(url), cached)
+
+    def test_writes_to_other_scopes_keep_the_cached_response(self):
+        cached = self.get_data('/api/tasks/status-counts/')
+        self.write_behind_the_cache('tasks')
+
+        bump_data_versions(self.user.pk, 'habits', 'events', 'journal')
+
+        self.assertEqual(self.get_data('/api/tasks/status-counts/'), cached)
+
+    def test_the_period_rolls_the_cache_key(self):
+        for url, next_period in (
+            ('/api/tasks/status-counts/', self.now + datetime.timedelta(days=1)),
+            ('/api/events/upcoming/', self.now + datetime.timedelta(minutes=1)),
+        ):
+            with self.subTest(url=url):
+                self.cache_clock.now.return_value = self.now
+                cached = self.get_data(url)
+                self.write_behind_the_cache('tasks' if 'tasks' in url else 'events')
+                self.assertEqual(self.get_data(url), cached)
+
+                self.cache_clock.now.return_value = next_period
+
+                self.assertNotEqual(self.get_data(url), cached)
+
+    def test_responses_are_cached_per_user(self):
+        self.write_behind_the_cache('tasks')
+        self.get_data('/api/tasks/status-counts/')
+        other = User.objects.create_user('other', 'other@example.com', 'pw')
+        self.client.force_authenticate(other)
+
+        self.assertEqual(self.get_data('/api/tasks/status-counts/'), [])
@@ -0,0 +1,80 @@
+import datetime
+import io
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from kanbanapi.models import TaskCard, Event, JournalEntry, UserActivityCounters
+from kanbanapi.counters_logic import rebuild_counters, get_counters
+
+
+User = get_user_model()
+
+
+def counter_values(user):
+    counters = UserActivityCounters.objects.get(user=user)
+    return {
+        field.name: getattr(counters, field.name)
+        for field in counters._meta.concrete_fields if field.name not in ('id', 'user', 'updated_at')
+    }
+
+
+class CountersTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('counter', 'counter@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_api_writes_keep_the_counters_equal_to_a_rebuild(self):
+        ids = [
+            self.client.post('/api/tasks/', {'title': f'Task {n}', 'priority': 'high'}, format='json').data['id']
+            for n in range(3)
+        ]
+        self.client.put(f'/api/tasks/{ids[0]}/', {'title': 'Task 0', 'status': 'done', 'task_type': 'financial'}, format='json')
+        self.client.delete(f'/api/tasks/{ids[1]}/')
+        self.client.post('/api/tasks/bulk/', {'operations': [
+            {'op': 'create', 'data': {'title': 'Bulk', 'status': 'processing'}},
+            {'op': 'update', 'id': ids[2], 'data': {'priority': 'low'}},
+        ]}, format='json')
+        event_id = self.client.post('/api/events/', {
+            'subject': 'Standup', 'start_time': '2026-03-01T09:00:00Z', 'end_time': '2026-03-01T09:15:00Z',
+        }, format='json').data['id']
+        self.client.post('/api/events/', {
+            'subject': 'Review', 'start_time': '2026-03-02T09:00:00Z', 'end_time': '2026-03-02T10:00:00Z',
+        }, format='json')
+        self.client.delete(f'/api/events/{event_id}/')
+        self.client.post('/api/journalentries/today/', {'title': 'Today', 'content': 'Wrote tests'}, format='json')
+        counters = counter_values(self.user)
+
+        rebuild_counters([self.user.pk])
+
+        self.assertEqual(counter_values(self.user), counters)
+        self.assertEqual(
+            (counters['tasks_done'], counters['tasks_processing'], counters['tasks_to_do'], counters['tasks_high']),
+            (1, 1, 1, 1),
+        )
+        self.assertEqual((counters['events_created'], counters['journal_days']), (1, 1))
+
+    def test_rebuild_repairs_drift_and_computes_journal_streaks(self):
+        today = timezone.now().date()
+        get_counters(self.user)
+        TaskCard.objects.create(user=self.user, title='Added in the admin', status='done')
+        Event.objects.create(user=self.user, subject='Imported', start_time=timezone.now(), end_time=timezone.now())
+        for days_ago in (0, 1, 2, 5, 6):
+            JournalEntry.objects.create(user_id=self.user, title='Day', content='...', entry_date=today - datetime.timedelta(days=days_ago))
+
+        call_command('rebuild_activity_counters', stdout=io.StringIO())
+
+        counters = counter_values(self.user)
+        self.assertEqual((counters['tasks_done'], counters['events_created']), (1, 1))
+        self.assertEqual(
+            (counters['journal_days'], counters['journal_last_date'], counters['journal_streak'], counters['journal_longest_streak']),
+            (5, today, 3, 3),
+        )
+
+    def test_counters_row_is_built_on_first_use(self):
+        TaskCard.objects.create(user=self.user, title='Before the counters', status='to_do')
+
+        self.assertEqual(get_counters(self.user).tasks_to_do, 1)
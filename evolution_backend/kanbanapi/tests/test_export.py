@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+import zipfile
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from kanbanapi.models import TaskCard, Event, JournalEntry
+from kanbanapi.export_logic import iter_export
+
+
+User = get_user_model()
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('exporter', 'exporter@example.com', 'pw')
+        for n in range(5):
+            TaskCard.objects.create(user=self.user, title=f'Task {n}', summary='Line one\nline, two')
+        Event.objects.create(user=self.user, subject='Dentist', start_time=timezone.now(), end_time=timezone.now())
+        JournalEntry.objects.create(user_id=self.user, title='Today', content='Quiet day')
+        other = User.objects.create_user('other', 'other@example.com', 'pw')
+        TaskCard.objects.create(user=other, title='Not mine')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def download(self, export_format):
+        response = self.client.get('/api/export/', {'export_format': export_format})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment; filename="evolution-export-exporter-', response['Content-Disposition'])
+        return b''.join(response.streaming_content)
+
+    def test_ndjson_export_has_one_line_per_row(self):
+        lines = [json.loads(line) for line in self.download('ndjson').decode().splitlines()]
+
+        self.assertEqual(lines[0]['type'], 'export')
+        self.assertEqual(lines[0]['data']['username'], 'exporter')
+        types = [line['type'] for line in lines[1:]]
+        self.assertEqual((types.count('tasks'), types.count('events'), types.count('journal_entries')), (5, 1, 1))
+        titles = [line['data']['title'] for line in lines if line['type'] == 'tasks']
+        self.assertEqual(titles, [f'Task {n}' for n in range(5)])
+
+    def test_csv_export_is_a_zip_of_one_file_per_table(self):
+        archive = zipfile.ZipFile(io.BytesIO(self.download('csv')))
+
+        self.assertIn('tasks.csv', archive.namelist())
+        rows = list(csv.DictReader(io.TextIOWrapper(archive.open('tasks.csv'), encoding='utf-8', newline='')))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['summary'], 'Line one\nline, two')
+        events = list(csv.DictReader(io.TextIOWrapper(archive.open('events.csv'), encoding='utf-8', newline='')))
+        self.assertEqual([event['subject'] for event in events], ['Dentist'])
+
+    def test_small_chunks_give_the_same_export(self):
+        chunked = b''.join(iter_export(self.user, 'ndjson', chunk_size=2)).decode().splitlines()
+        whole = b''.join(iter_export(self.user, 'ndjson')).decode().splitlines()
+
+        self.assertEqual(chunked[1:], whole[1:]) # The header carries the export time
+
+    def test_unknown_format_is_rejected(self):
+        self.assertEqual(self.client.get('/api/export/', {'export_format': 'xml'}).status_code, 400)
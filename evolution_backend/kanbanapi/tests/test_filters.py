@@ -0,0 +1,107 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+from kanbanapi.models import TaskCard, Event
+
+
+User = get_user_model()
+
+
+class FilterTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('filterer', 'filterer@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def listed(self, url, params, key):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(item[key] for item in response.data)
+
+    def assert_rejected(self, url, params):
+        for name, value in params:
+            with self.subTest(**{name: value}):
+                response = self.client.get(url, {name: value})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(name, response.data)
+
+
+class TaskFilterTests(FilterTestCase):
+
+    def setUp(self):
+        super().setUp()
+        TaskCard.objects.create(user=self.user, title='a', status='to_do', priority='high', task_type='personal', due_date=datetime.date(2026, 1, 10))
+        TaskCard.objects.create(user=self.user, title='b', status='processing', priority='low', task_type='financial', due_date=datetime.date(2026, 1, 20), is_event=True)
+        TaskCard.objects.create(user=self.user, title='c', status='done', priority='medium', task_type='other', is_habit=True)
+
+    def titles(self, **params):
+        return self.listed('/api/tasks/', params, 'title')
+
+    def test_choice_filters_take_comma_separated_values(self):
+        self.assertEqual(self.titles(status='to_do,done'), ['a', 'c'])
+        self.assertEqual(self.titles(priority='low'), ['b'])
+        self.assertEqual(self.titles(task_type='personal,financial'), ['a', 'b'])
+        self.assertEqual(self.titles(status='to_do,processing', priority='low'), ['b'])
+
+    def test_due_date_bounds_are_inclusive(self):
+        self.assertEqual(self.titles(due_after='2026-01-15'), ['b'])
+        self.assertEqual(self.titles(due_before='2026-01-10'), ['a'])
+        self.assertEqual(self.titles(due_after='2026-01-10', due_before='2026-01-20'), ['a', 'b'])
+        self.assertEqual(self.titles(due_after='2026-01-11', due_before='2026-01-19'), [])
+
+    def test_boolean_filters(self):
+        self.assertEqual(self.titles(is_habit='true'), ['c'])
+        self.assertEqual(self.titles(is_habit='0'), ['a', 'b'])
+        self.assertEqual(self.titles(is_event='True'), ['b'])
+        self.assertEqual(self.titles(is_event='false'), ['a', 'c'])
+
+    def test_empty_values_are_ignored(self):
+        self.assertEqual(self.titles(status='', due_after='', is_habit=''), ['a', 'b', 'c'])
+
+    def test_invalid_values_are_rejected(self):
+        self.assert_rejected('/api/tasks/', [
+            ('status', 'to_do,later'),
+            ('priority', 'urgent'),
+            ('task_type', 'Personal'),
+            ('due_after', '2026-02-30'),
+            ('due_before', 'soon'),
+            ('is_habit', 'maybe'),
+            ('is_event', 'yes'),
+            ('fields', 'title,owner'),
+        ])
+
+    def test_filters_only_apply_to_the_list(self):
+        task = TaskCard.objects.get(title='a')
+
+        self.assertEqual(self.client.get(f'/api/tasks/{task.pk}/', {'status': 'done'}).status_code, 200)
+
+
+class EventFilterTests(FilterTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for day in (1, 2, 3):
+            start = datetime.datetime(2026, 3, day, 9, tzinfo=datetime.timezone.utc)
+            Event.objects.create(user=self.user, subject=f'March {day}', start_time=start, end_time=start + datetime.timedelta(hours=1))
+
+    def subjects(self, **params):
+        return self.listed('/api/events/', params, 'subject')
+
+    def test_start_window(self):
+        self.assertEqual(self.subjects(start_after='2026-03-02T09:00:00Z'), ['March 2', 'March 3'])
+        # The upper bound is exclusive
+        self.assertEqual(self.subjects(start_before='2026-03-02T09:00:00Z'), ['March 1'])
+        self.assertEqual(self.subjects(start_after='2026-03-01T10:00:00Z', start_before='2026-03-03T00:00:00Z'), ['March 2'])
+
+    def test_dates_and_naive_datetimes_are_read_in_the_current_time_zone(self):
+        self.assertEqual(self.subjects(start_after='2026-03-02'), ['March 2', 'March 3'])
+        self.assertEqual(self.subjects(start_before='2026-03-01T09:30:00'), ['March 1'])
+
+    def test_invalid_values_are_rejected(self):
+        self.assert_rejected('/api/events/', [
+            ('start_after', 'tomorrow'),
+            ('start_before', '2026-13-01'),
+            ('start_before', '2026-03-01T25:00:00'),
+        ])
@@ -0,0 +1,127 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from kanbanapi.models import Job, TaskCard, HabitList, HabitTracker, HabitDaySummary, UserActivityCounters
+from kanbanapi.habits_logic import rollover_users, set_habit_completion
+from kanbanapi.counters_logic import get_counters
+from kanbanapi.badges_logic import badge_types_reached
+
+
+User = get_user_model()
+
+
+@override_settings(JOB_QUEUE={'EAGER': False})
+class HabitTaskSyncTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('syncer', 'syncer@example.com', 'pw')
+        HabitList.objects.create(user=self.user, habit_name='Journal')
+        HabitList.objects.create(user=self.user, habit_name='Walk')
+        get_counters(self.user)
+        rollover_users([self.user.pk], datetime.date.today())
+        self.tracker = HabitTracker.objects.filter(habit__habit_name='Journal').get()
+        self.task = TaskCard.objects.get(habit_tracker=self.tracker)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def toggle_tracker(self, completed):
+        response = self.client.put(f'/api/habittrackers/{self.tracker.pk}/', {'is_completed': completed}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assert_synced(self, completed):
+        self.tracker.refresh_from_db()
+        self.task.refresh_from_db()
+        self.assertEqual(self.tracker.is_completed, completed)
+        self.assertEqual(self.task.status, 'done' if completed else 'to_do')
+        summary = HabitDaySummary.objects.get(user=self.user, date=datetime.date.today())
+        self.assertEqual((summary.completed, summary.percentage), (1, 50) if completed else (0, 0))
+        counters = UserActivityCounters.objects.get(user=self.user)
+        self.assertEqual((counters.tasks_done, counters.tasks_to_do), (1, 1) if completed else (0, 2))
+
+    def test_completing_the_tracker_completes_its_task(self):
+        self.toggle_tracker(True)
+        self.assert_synced(True)
+
+        self.toggle_tracker(False)
+        self.assert_synced(False)
+
+    def test_completing_the_task_completes_its_tracker(self):
+        response = self.client.put(f'/api/tasks/{self.task.pk}/', {'title': 'Journal', 'status': 'done'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assert_synced(True)
+
+    def test_todays_trackers_are_listed_without_a_per_tracker_percentage(self):
+        trackers = self.client.get('/api/habittrackers/').data
+
+        self.assertEqual(sorted(tracker['habit_name'] for tracker in trackers), ['Journal', 'Walk'])
+        self.assertNotIn('completion_percentage', trackers[0])
+
+    def test_toggling_twice_changes_nothing_more(self):
+        self.toggle_tracker(True)
+        self.toggle_tracker(True)
+
+        self.assert_synced(True)
+
+    def test_a_replayed_toggle_read_before_the_first_one_changes_nothing(self):
+        # Both requests of a double click read the tracker and its task before either writes
+        stale_reads = [
+            (HabitTracker.objects.get(pk=self.tracker.pk), TaskCard.objects.get(pk=self.task.pk)) for _ in range(2)
+        ]
+
+        toggled = [set_habit_completion(self.user.pk, tracker, True, task) for tracker, task in stale_reads]
+
+        self.assertEqual(toggled, [True, False])
+        self.assert_synced(True)
+
+    def test_tracker_toggle_query_count(self):
+        # Tracker + task + counters read, then one UPDATE each for the tracker, the day summary, the task,
+        # the counters and the data versions; the savepoint pair is the view's transaction.
+        with self.assertNumQueries(8):
+            self.toggle_tracker(True)
+
+    def test_task_badge_check_is_only_queued_when_a_threshold_is_reached(self):
+        self.toggle_tracker(True)
+        self.assertFalse(Job.objects.exists())
+
+        self.toggle_tracker(False)
+        UserActivityCounters.objects.filter(user=self.user).update(tasks_done=9)
+        self.toggle_tracker(True)
+
+        self.assertEqual(list(Job.objects.values_list('dedupe_key', flat=True)), [f'check_badges:{self.user.pk}:task'])
+
+    def test_deleting_a_tracker_syncs_its_deletion(self):
+        self.toggle_tracker(True)
+        etag = self.client.get('/api/habittrackers/')['ETag']
+        # Date the task's toggle a minute back, out of the sync cursor's overlap window
+        TaskCard.objects.update(updated_at=timezone.now() - datetime.timedelta(minutes=1))
+        cursor = timezone.now().isoformat()
+
+        response = self.client.delete(f'/api/habittrackers/{self.tracker.pk}/')
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.get('/api/habittrackers/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        summary = HabitDaySummary.objects.get(user=self.user, date=datetime.date.today())
+        self.assertEqual((summary.total, summary.completed, summary.percentage), (1, 0, 0))
+        delta = self.client.get('/api/sync/', {'since': cursor}).data
+        self.assertEqual(delta['habitTrackers']['deleted'], [self.tracker.pk])
+        self.assertEqual([task['id'] for task in delta['tasks']['changed']], [self.task.pk])
+        self.task.refresh_from_db()
+        self.assertIsNone(self.task.habit_tracker_id)
+
+    def test_trackers_are_not_created_through_the_api(self):
+        response = self.client.post('/api/habittrackers/', {'habit': self.tracker.habit_id}, format='json')
+
+        self.assertEqual(response.status_code, 405)
+
+
+class BadgeThresholdTests(TestCase):
+
+    def test_badge_types_reached(self):
+        self.assertEqual(badge_types_reached('tasks_done', 9, 10), ['task'])
+        self.assertEqual(badge_types_reached('tasks_done', 10, 11), [])
+        self.assertEqual(badge_types_reached('tasks_done', None, 1), ['task'])
+        self.assertEqual(badge_types_reached('events_created', 0, 25), ['schedule'])
@@ -0,0 +1,88 @@
+import base64
+import datetime
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from kanbanapi.models import HabitList, HabitTracker, HabitYearBitmap
+from kanbanapi.habits_logic import rollover_users
+
+
+User = get_user_model()
+
+
+def completed_offsets(bits):
+    """
+    Offsets of the set bits of a heatmap habit's base64 `bits` (bit i of byte i // 8 is day start + i).
+    """
+    packed = base64.b64decode(bits)
+    return [offset for offset in range(len(packed) * 8) if packed[offset // 8] & (1 << (offset % 8))]
+
+
+@override_settings(JOB_QUEUE={'EAGER': False})
+class HabitHeatmapTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('mapper', 'mapper@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.running = HabitList.objects.create(user=self.user, habit_name='Run')
+        self.reading = HabitList.objects.create(user=self.user, habit_name='Read')
+        # Roll over across the year boundary, completing habits before each next rollover
+        completions = {
+            datetime.date(2025, 12, 30): [self.running],
+            datetime.date(2025, 12, 31): [self.running, self.reading],
+            datetime.date(2026, 1, 1): [],
+        }
+        for day, habits in completions.items():
+            rollover_users([self.user.pk], day)
+            HabitTracker.objects.filter(habit__in=habits, tracking_date=day).update(is_completed=True)
+        rollover_users([self.user.pk], datetime.date(2026, 1, 2))
+
+    def heatmap(self, **params):
+        response = self.client.get('/api/habits/heatmap/', {'start': '2025-12-29', 'end': '2026-01-02', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_rollover_fills_both_years_bitmaps(self):
+        self.assertEqual(
+            sorted(HabitYearBitmap.objects.values_list('habit__habit_name', 'year')),
+            [('Read', 2025), ('Read', 2026), ('Run', 2025), ('Run', 2026)],
+        )
+        run_2025 = HabitYearBitmap.objects.get(habit=self.running, year=2025)
+        self.assertEqual(
+            [run_2025.is_completed(datetime.date(2025, 12, day)) for day in (29, 30, 31)],
+            [False, True, True],
+        )
+
+    def test_heatmap_spans_the_year_boundary(self):
+        data = self.heatmap()
+
+        self.assertEqual(data['days'], [0, 50, 100, 0, 0])
+        self.assertEqual(
+            {habit['habit_name']: completed_offsets(habit['bits']) for habit in data['habits']},
+            {'Run': [1, 2], 'Read': [2]},
+        )
+
+    def test_toggling_a_past_day_updates_its_bit_and_percentage(self):
+        tracker = HabitTracker.objects.get(habit=self.running, tracking_date=datetime.date(2026, 1, 1))
+        self.heatmap() # Cached until the toggle
+
+        response = self.client.put(f'/api/habittrackers/{tracker.pk}/', {'is_completed': True}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(HabitYearBitmap.objects.get(habit=self.running, year=2026).is_completed(datetime.date(2026, 1, 1)))
+        data = self.heatmap()
+        self.assertEqual(data['days'], [0, 50, 100, 50, 0])
+        self.assertEqual(completed_offsets(data['habits'][0]['bits']), [1, 2, 3])
+
+    def test_heatmap_of_one_habit(self):
+        data = self.heatmap(habit=self.reading.pk)
+
+        self.assertEqual([habit['habit_name'] for habit in data['habits']], ['Read'])
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({'start': '2026-02-30'}, {'start': '2026-01-03'}, {'habit': 'run'}, {'start': '2015-01-01'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/habits/heatmap/', {'end': '2026-01-02', **params}).status_code, 400)
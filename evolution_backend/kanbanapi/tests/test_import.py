@@ -0,0 +1,106 @@
+import datetime
+import io
+import zipfile
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APIClient
+from kanbanapi.models import TaskCard, Event
+from kanbanapi.counters_logic import get_counters
+
+
+User = get_user_model()
+
+TASKS_CSV = (
+    'id,title,summary,status,priority,task_type,due_date,position\n'
+    '91,Pay rent,"Before the 5th, by transfer",to_do,high,financial,2026-03-05,zz\n'
+    '92,Read,,done,low,educational,,\n'
+    '93,Stretch,,processing,medium,health_wellness,,\n'
+)
+
+EVENTS_ICS = (
+    'BEGIN:VCALENDAR\r\n'
+    'VERSION:2.0\r\n'
+    'BEGIN:VEVENT\r\n'
+    'SUMMARY:Team sync\\, weekly\r\n'
+    'DTSTART:20260302T090000Z\r\n'
+    'DTEND:20260302T093000Z\r\n'
+    'DESCRIPTION:Agenda in the\r\n'
+    '  shared doc\r\n'
+    'END:VEVENT\r\n'
+    'BEGIN:VEVENT\r\n'
+    'SUMMARY:Holiday\r\n'
+    'DTSTART;VALUE=DATE:20260310\r\n'
+    'END:VEVENT\r\n'
+    'END:VCALENDAR\r\n'
+)
+
+
+class ImportTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('importer', 'importer@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, name, content, **data):
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post('/api/import/', {'file': upload, **data}, format='multipart')
+
+    def test_csv_tasks_are_created_with_positions_and_counters(self):
+        response = self.upload('tasks.csv', TASKS_CSV, kind='tasks')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 3)
+        rent = TaskCard.objects.get(user=self.user, title='Pay rent')
+        self.assertEqual((rent.summary, rent.due_date), ('Before the 5th, by transfer', datetime.date(2026, 3, 5)))
+        self.assertNotEqual(rent.pk, 91) # Export ids and positions are ignored
+        self.assertNotEqual(rent.position, 'zz')
+        counters = get_counters(self.user)
+        self.assertEqual((counters.tasks_to_do, counters.tasks_done, counters.tasks_financial), (1, 1, 1))
+
+    def test_invalid_row_cancels_the_import(self):
+        content = TASKS_CSV + '94,,,to_do,,,,\n95,Bad status,,later,,,,\n'
+
+        response = self.upload('tasks.csv', content, kind='tasks')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((response.data['created'], response.data['error_count']), (0, 2))
+        self.assertEqual([error['row'] for error in response.data['errors']], [4, 5])
+        self.assertFalse(TaskCard.objects.exists())
+
+    def test_skip_invalid_imports_the_valid_rows(self):
+        content = TASKS_CSV + '95,Bad status,,later,,,,\n'
+
+        response = self.upload('tasks.csv', content, kind='tasks', skip_invalid='true')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['error_count']), (3, 1))
+        self.assertEqual(TaskCard.objects.filter(user=self.user).count(), 3)
+
+    def test_ics_events_are_imported(self):
+        response = self.upload('calendar.ics', EVENTS_ICS, kind='events')
+
+        self.assertEqual(response.status_code, 201)
+        sync, holiday = Event.objects.filter(user=self.user).order_by('start_time')
+        self.assertEqual(sync.subject, 'Team sync, weekly')
+        self.assertEqual(sync.description, 'Agenda in the shared doc')
+        self.assertEqual(sync.end_time - sync.start_time, datetime.timedelta(minutes=30))
+        self.assertEqual(holiday.end_time - holiday.start_time, datetime.timedelta(days=1)) # All-day event
+        self.assertEqual(get_counters(self.user).events_created, 2)
+
+    def test_ics_files_only_hold_events(self):
+        response = self.upload('calendar.ics', EVENTS_ICS, kind='tasks')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(TaskCard.objects.exists())
+
+    def test_exported_csv_can_be_imported_again(self):
+        TaskCard.objects.create(user=self.user, title='Round trip', priority='high')
+        export = b''.join(self.client.get('/api/export/', {'export_format': 'csv'}).streaming_content)
+        tasks_csv = zipfile.ZipFile(io.BytesIO(export)).read('tasks.csv').decode()
+
+        response = self.upload('tasks.csv', tasks_csv, kind='tasks')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(list(TaskCard.objects.filter(title='Round trip').values_list('priority', flat=True)), ['high', 'high'])
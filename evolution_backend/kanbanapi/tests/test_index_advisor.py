@@ -0,0 +1,37 @@
+import io
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase
+from kanbanapi.models import TaskCard
+from kanbanapi.index_advisor_logic import capture_endpoint_queries
+
+
+class AdviseIndexesCommandTests(TestCase):
+
+    def test_reports_and_rolls_back_the_seeded_data(self):
+        stdout = io.StringIO()
+
+        call_command('advise_indexes', users=2, tasks=5, days=3, stdout=stdout)
+
+        self.assertIn('Explained', stdout.getvalue())
+        self.assertFalse(TaskCard.objects.exists())
+
+    def test_unsupported_database_is_rejected_before_seeding(self):
+        connection = connections['default']
+        with mock.patch.object(connection, 'vendor', 'oracle'), mock.patch.object(connection, 'display_name', 'Oracle'):
+            with self.assertRaisesMessage(CommandError, "can't read Oracle query plans"):
+                call_command('advise_indexes', stdout=io.StringIO())
+
+        self.assertFalse(TaskCard.objects.exists())
+
+    def test_failed_replayed_requests_are_logged(self):
+        user = get_user_model().objects.create_user('advised', 'advised@example.com', 'pw')
+
+        with self.assertLogs('kanbanapi.index_advisor_logic', level='WARNING') as logs:
+            captured = capture_endpoint_queries(user, [('/api/tasks/', {'status': 'later'}), ('/api/events/', {})])
+
+        self.assertEqual(logs.output, ['WARNING:kanbanapi.index_advisor_logic:Index advisor: /api/tasks/ returned 400'])
+        self.assertIn('/api/events/', {path for path, _ in captured})
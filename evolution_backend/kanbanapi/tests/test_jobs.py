@@ -0,0 +1,162 @@
+import datetime
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from kanbanapi.models import Job, HabitList, HabitTracker, TaskCard
+from kanbanapi.jobs_logic import enqueue, claim_jobs, run_job, JOB_HANDLERS, JOB_LOCK_TIMEOUT
+
+
+User = get_user_model()
+
+
+def failing_job(**payload):
+    raise RuntimeError('handler broke')
+
+
+class LoginJobTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('worker', 'worker@example.com', 'pw')
+        HabitList.objects.create(user=self.user, habit_name='Meditate')
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post('/api/login/', {'username': 'worker', 'password': 'pw'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(JOB_QUEUE={'EAGER': True})
+    def test_eager_login_rolls_the_user_over_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.login()
+
+        self.assertEqual(len(callbacks), 2) # Rollover and badge check
+        self.assertFalse(Job.objects.exists())
+        self.assertTrue(HabitTracker.objects.filter(habit__user=self.user, tracking_date=datetime.date.today()).exists())
+        self.assertEqual(TaskCard.objects.filter(user=self.user, is_habit=True).count(), 1)
+
+    @override_settings(JOB_QUEUE={}, DEBUG=True)
+    def test_eager_is_the_default_with_debug(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.login()
+
+        self.assertFalse(Job.objects.exists())
+        self.assertTrue(HabitTracker.objects.filter(habit__user=self.user).exists())
+
+    @override_settings(JOB_QUEUE={'EAGER': False})
+    def test_queued_login_work_runs_in_the_worker(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.login()
+            self.login() # Deduplicated while pending
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(sorted(Job.objects.values_list('kind', flat=True)), ['check_badges', 'rollover_user'])
+        self.assertFalse(HabitTracker.objects.exists())
+
+        for job_id in claim_jobs(10, 'test'):
+            self.assertTrue(run_job(job_id))
+
+        self.assertFalse(Job.objects.exists())
+        self.assertTrue(HabitTracker.objects.filter(habit__user=self.user).exists())
+
+
+@override_settings(JOB_QUEUE={'EAGER': False})
+class JobQueueTests(TestCase):
+
+    def test_claimed_jobs_are_not_claimed_again(self):
+        enqueue('rebalance_positions', {'user_id': 1, 'status': 'to_do'})
+
+        self.assertEqual(len(claim_jobs(10, 'a')), 1)
+        self.assertEqual(claim_jobs(10, 'b'), [])
+
+    def test_jobs_due_later_are_not_claimed(self):
+        enqueue('rebalance_positions', {'user_id': 1, 'status': 'to_do'})
+        Job.objects.update(run_after=timezone.now() + datetime.timedelta(minutes=1))
+
+        self.assertEqual(claim_jobs(10, 'a'), [])
+
+    def test_stale_running_jobs_are_claimed_again_once_per_dedupe_key(self):
+        stale_time = timezone.now() - JOB_LOCK_TIMEOUT - datetime.timedelta(minutes=1)
+        Job.objects.bulk_create([
+            Job(kind='check_badges', payload={'user_id': 1, 'badge_types': None}, dedupe_key='check_badges:1:all',
+                status='running', locked_by='crashed', locked_at=stale_time)
+            for _ in range(2)
+        ] + [
+            Job(kind='rebalance_positions', payload={'user_id': 1, 'status': 'to_do'},
+                status='running', locked_by='crashed', locked_at=stale_time)
+            for _ in range(2)
+        ])
+
+        claimed = claim_jobs(10, 'a')
+
+        self.assertEqual(len(claimed), 3)
+        self.assertEqual(Job.objects.filter(dedupe_key='check_badges:1:all').count(), 1)
+
+    def test_stale_job_is_dropped_when_the_same_work_is_pending(self):
+        enqueue('check_badges', {'user_id': 1, 'badge_types': None}, dedupe_key='check_badges:1:all')
+        Job.objects.create(
+            kind='check_badges', payload={'user_id': 1, 'badge_types': None}, dedupe_key='check_badges:1:all',
+            status='running', locked_by='crashed', locked_at=timezone.now() - JOB_LOCK_TIMEOUT * 2,
+        )
+
+        self.assertEqual(len(claim_jobs(10, 'a')), 1)
+        self.assertEqual(Job.objects.count(), 1)
+
+
+@override_settings(JOB_QUEUE={'EAGER': False})
+@mock.patch.dict(JOB_HANDLERS, {'check_badges': 'kanbanapi.tests.test_jobs.failing_job'})
+class JobFailureTests(TestCase):
+
+    def run_claimed(self):
+        with self.assertLogs('kanbanapi.jobs_logic', level='ERROR') as logs:
+            for job_id in claim_jobs(10, 'a'):
+                self.assertFalse(run_job(job_id))
+        self.assertIn('handler broke', logs.output[0])
+
+    def test_failed_job_is_retried_later_with_its_traceback(self):
+        enqueue('check_badges', {'user_id': 1}, dedupe_key='check_badges:1:all')
+
+        self.run_claimed()
+
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), ('pending', 1))
+        self.assertIn('RuntimeError: handler broke', job.last_error)
+        self.assertGreater(job.run_after, timezone.now())
+
+    def test_job_fails_for_good_after_max_attempts(self):
+        enqueue('check_badges', {'user_id': 1})
+        Job.objects.update(attempts=4)
+
+        self.run_claimed()
+
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), ('failed', 5))
+        self.assertIn('handler broke', job.last_error)
+
+    def test_error_is_kept_on_the_pending_duplicate(self):
+        enqueue('check_badges', {'user_id': 1}, dedupe_key='check_badges:1:all')
+        claimed = claim_jobs(10, 'a')
+        enqueue('check_badges', {'user_id': 1}, dedupe_key='check_badges:1:all') # Queued again while running
+
+        with self.assertLogs('kanbanapi.jobs_logic', level='ERROR'):
+            self.assertFalse(run_job(claimed[0]))
+
+        job = Job.objects.get()
+        self.assertNotEqual(job.pk, claimed[0])
+        self.assertIn('handler broke', job.last_error)
+
+    @override_settings(JOB_QUEUE={'EAGER': True})
+    def test_failing_eager_job_is_logged_and_the_request_succeeds(self):
+        user = User.objects.create_user('eager', 'eager@example.com', 'pw')
+        HabitList.objects.create(user=user, habit_name='Meditate')
+        client = APIClient()
+
+        with self.assertLogs('kanbanapi.jobs_logic', level='ERROR') as logs:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post('/api/login/', {'username': 'eager', 'password': 'pw'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('handler broke', logs.output[0])
+        # The login's other job, the rollover, still ran
+        self.assertTrue(HabitTracker.objects.filter(habit__user=user).exists())
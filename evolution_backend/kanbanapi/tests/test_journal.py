@@ -0,0 +1,190 @@
+import datetime
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, connection
+from django.db.models import QuerySet
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from kanbanapi.models import JournalEntry, Tombstone, UserActivityCounters
+from kanbanapi.journal_logic import save_journal_entry
+from kanbanapi.counters_logic import journal_metrics
+
+
+User = get_user_model()
+
+
+class JournalUpsertTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('writer', 'writer@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_posting_today_twice_updates_the_same_entry(self):
+        first = self.client.post('/api/journalentries/today/', {'title': 'Monday', 'content': 'Draft'}, format='json')
+        second = self.client.post('/api/journalentries/today/', {'title': 'Monday', 'content': 'Final'}, format='json')
+
+        self.assertEqual((first.status_code, second.status_code), (201, 200))
+        self.assertEqual(first.data['journal_entry_id'], second.data['journal_entry_id'])
+        entry = JournalEntry.objects.get(user_id=self.user)
+        self.assertEqual((entry.content, entry.entry_date), ('Final', timezone.now().date()))
+        self.assertEqual(self.client.get('/api/journalentries/today/').data['content'], 'Final')
+
+    def test_day_is_counted_once_and_extends_the_streak(self):
+        today = timezone.now().date()
+        save_journal_entry(self.user, today - datetime.timedelta(days=1), {'title': 'a', 'content': 'a'})
+        save_journal_entry(self.user, today, {'title': 'b', 'content': 'b'})
+        _, created = save_journal_entry(self.user, today, {'title': 'c', 'content': 'c'})
+
+        self.assertFalse(created)
+        counters = UserActivityCounters.objects.get(user=self.user)
+        self.assertEqual((counters.journal_days, counters.journal_streak, counters.journal_longest_streak), (2, 2, 2))
+
+    def test_losing_a_create_race_updates_the_winners_entry(self):
+        today = timezone.now().date()
+        JournalEntry.objects.create(user_id=self.user, entry_date=today, title='Winner', content='First')
+        update = QuerySet.update
+        calls = []
+
+        def update_before_the_winner_committed(queryset, **kwargs):
+            # The first UPDATE ran before the concurrent create committed, so it matched nothing
+            calls.append(kwargs)
+            return 0 if len(calls) == 1 else update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', update_before_the_winner_committed):
+            entry, created = save_journal_entry(self.user, today, {'title': 'Loser', 'content': 'Second'})
+
+        self.assertFalse(created)
+        self.assertEqual(len([kwargs for kwargs in calls if 'content' in kwargs]), 2) # The miss and the retry
+        self.assertEqual((entry.title, entry.content), ('Loser', 'Second'))
+        self.assertEqual(JournalEntry.objects.filter(user_id=self.user).count(), 1)
+
+    def test_other_integrity_errors_are_raised_without_retrying_forever(self):
+        with mock.patch.object(JournalEntry.objects, 'create', side_effect=IntegrityError('NOT NULL constraint failed')) as create:
+            with self.assertRaises(IntegrityError):
+                save_journal_entry(self.user, timezone.now().date(), {'title': 'a', 'content': 'a'})
+
+        self.assertEqual(create.call_count, 1)
+        self.assertFalse(JournalEntry.objects.exists())
+
+    def test_today_is_404_until_written(self):
+        self.assertEqual(self.client.get('/api/journalentries/today/').status_code, 404)
+
+
+class JournalStatsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('stats', 'stats@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def write_days(self, user, days):
+        for day in days:
+            JournalEntry.objects.create(user_id=user, title=day.isoformat(), content='...', entry_date=day)
+
+    def test_streaks_across_a_gap(self):
+        # A 4-day streak, a gap, then 3 days up to Tuesday 2026-03-10
+        self.write_days(self.user, [datetime.date(2026, 3, day) for day in (1, 2, 3, 4, 8, 9, 10)])
+
+        metrics = journal_metrics([self.user.pk], datetime.date(2026, 3, 11))[self.user.pk]
+
+        self.assertEqual(metrics, {
+            'days': 7,
+            'last_date': datetime.date(2026, 3, 10),
+            'last_streak': 3,
+            'current_streak': 3,
+            'longest_streak': 4,
+            'entries_this_week': 2,
+            'entries_this_month': 7,
+        })
+
+    def test_a_missed_day_ends_the_current_streak_only(self):
+        self.write_days(self.user, [datetime.date(2026, 3, day) for day in (1, 2, 3, 4, 8, 9, 10)])
+
+        metrics = journal_metrics([self.user.pk], datetime.date(2026, 3, 12))[self.user.pk]
+
+        self.assertEqual((metrics['last_streak'], metrics['current_streak'], metrics['longest_streak']), (3, 0, 4))
+
+    def test_metrics_of_several_users_in_one_query(self):
+        other = User.objects.create_user('other', 'other@example.com', 'pw')
+        self.write_days(self.user, [datetime.date(2026, 3, 1)])
+        self.write_days(other, [datetime.date(2026, 3, 1), datetime.date(2026, 3, 2)])
+
+        with self.assertNumQueries(1):
+            metrics = journal_metrics([self.user.pk, other.pk], datetime.date(2026, 3, 2))
+
+        self.assertEqual((metrics[self.user.pk]['days'], metrics[self.user.pk]['current_streak']), (1, 1))
+        self.assertEqual((metrics[other.pk]['days'], metrics[other.pk]['current_streak']), (2, 2))
+
+    def test_stats_endpoint_sees_a_saved_entry_at_once(self):
+        today = timezone.now().date()
+        self.write_days(self.user, [today - datetime.timedelta(days=1)])
+        self.assertEqual(self.client.get('/api/journalentries/stats/').data['journalDays'], 1)
+
+        self.client.post('/api/journalentries/today/', {'title': 'Today', 'content': 'Wrote'}, format='json')
+        stats = self.client.get('/api/journalentries/stats/').data
+
+        self.assertEqual(
+            (stats['journalDays'], stats['currentStreak'], stats['longestStreak'], stats['lastEntryDate']),
+            (2, 2, 2, today),
+        )
+
+        self.client.post('/api/journalentries/today/', {'title': 'Today', 'content': 'Rewrote'}, format='json')
+        self.assertEqual(self.client.get('/api/journalentries/stats/').data['journalDays'], 2)
+
+
+class JournalEntryDateMigrationTests(TransactionTestCase):
+    """
+    0027 backfills entry_date and merges same-day entries written under the old timestamp-based constraint.
+    """
+    migrate_from = ('kanbanapi', '0026_taskcard_habit_tracker_one_to_one')
+    migrate_to = ('kanbanapi', '0027_journalentry_entry_date')
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([self.migrate_from])
+        apps = executor.loader.project_state(self.migrate_from).apps
+        OldUser = apps.get_model('kanbanapi', 'CustomUser')
+        OldJournalEntry = apps.get_model('kanbanapi', 'JournalEntry')
+        self.user_id = OldUser.objects.create(username='journaler').pk
+        morning = datetime.datetime(2026, 3, 1, 8, tzinfo=datetime.timezone.utc)
+        rows = [
+            ('Morning', 'Woke up early', morning),
+            ('Evening', 'Went running', morning + datetime.timedelta(hours=12)),
+            ('Next day', 'Rested', morning + datetime.timedelta(days=1)),
+        ]
+        for index, (title, content, created) in enumerate(rows):
+            entry = OldJournalEntry.objects.create(user_id_id=self.user_id, title=title, content=content)
+            # Oldest entry last updated first
+            OldJournalEntry.objects.filter(pk=entry.pk).update(
+                date_created=created, updated_at=created + datetime.timedelta(minutes=index),
+            )
+        self.evening_id = OldJournalEntry.objects.get(title='Evening').pk
+        self.morning_id = OldJournalEntry.objects.get(title='Morning').pk
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([self.migrate_to])
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_same_day_entries_are_merged_into_the_latest(self):
+        entries = {
+            row['title']: row for row in
+            JournalEntry.objects.filter(user_id=self.user_id).values('journal_entry_id', 'title', 'content', 'entry_date')
+        }
+
+        self.assertEqual(set(entries), {'Evening', 'Next day'})
+        evening = entries['Evening']
+        self.assertEqual(evening['journal_entry_id'], self.evening_id)
+        self.assertEqual(evening['entry_date'], datetime.date(2026, 3, 1))
+        self.assertIn('Went running', evening['content'])
+        self.assertIn('Morning\n\nWoke up early', evening['content'])
+        self.assertEqual(entries['Next day']['entry_date'], datetime.date(2026, 3, 2))
+        self.assertTrue(Tombstone.objects.filter(model_name='journal_entry', object_id=self.morning_id).exists())
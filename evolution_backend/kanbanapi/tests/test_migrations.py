@@ -0,0 +1,60 @@
+import datetime
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from kanbanapi.models import TaskCard, Tombstone, UserActivityCounters
+
+
+class HabitTaskDedupeMigrationTests(TransactionTestCase):
+    """
+    0025 removes the duplicate habit tasks created by concurrent rollovers before the tracker link becomes unique.
+    """
+    migrate_from = ('kanbanapi', '0024_job')
+    migrate_to = ('kanbanapi', '0025_taskcard_unique_habit_tracker')
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([self.migrate_from])
+        apps = executor.loader.project_state(self.migrate_from).apps
+        OldUser = apps.get_model('kanbanapi', 'CustomUser')
+        OldHabitList = apps.get_model('kanbanapi', 'HabitList')
+        OldHabitTracker = apps.get_model('kanbanapi', 'HabitTracker')
+        OldTaskCard = apps.get_model('kanbanapi', 'TaskCard')
+        OldCounters = apps.get_model('kanbanapi', 'UserActivityCounters')
+        user = OldUser.objects.create(username='doubled')
+        self.user_id = user.pk
+        # Tasks in creation order per tracker; the tracker of the second habit is completed
+        self.task_ids = {}
+        for habit_name, is_completed, statuses in (
+            ('Stretch', False, ('to_do', 'to_do', 'done')),
+            ('Read', True, ('to_do', 'done', 'done')),
+        ):
+            habit = OldHabitList.objects.create(user=user, habit_name=habit_name)
+            tracker = OldHabitTracker.objects.create(habit=habit, tracking_date=datetime.date(2026, 3, 1), is_completed=is_completed)
+            self.task_ids[habit_name] = [
+                OldTaskCard.objects.create(user=user, title=habit_name, is_habit=True, habit_tracker=tracker, status=status).pk
+                for status in statuses
+            ]
+        OldCounters.objects.create(user=user, tasks_to_do=3, tasks_done=3, tasks_medium=6, tasks_other=6)
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([self.migrate_to])
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_oldest_task_in_step_with_its_tracker_is_kept(self):
+        kept_ids = [self.task_ids['Stretch'][0], self.task_ids['Read'][1]]
+        self.assertEqual(list(TaskCard.objects.order_by('id').values_list('id', flat=True)), kept_ids)
+        self.assertEqual(TaskCard.objects.get(pk=self.task_ids['Read'][1]).status, 'done')
+        all_ids = self.task_ids['Stretch'] + self.task_ids['Read']
+        self.assertEqual(
+            sorted(Tombstone.objects.filter(model_name='task').values_list('object_id', flat=True)),
+            sorted(set(all_ids) - set(kept_ids)),
+        )
+        counters = UserActivityCounters.objects.get(user_id=self.user_id)
+        self.assertEqual(
+            (counters.tasks_to_do, counters.tasks_done, counters.tasks_medium, counters.tasks_other), (1, 1, 2, 2),
+        )
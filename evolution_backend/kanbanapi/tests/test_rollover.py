@@ -0,0 +1,112 @@
+import io
+import datetime
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from kanbanapi.models import TaskCard, HabitList, HabitTracker, HabitDaySummary, UserActivityCounters
+from kanbanapi.habits_logic import rollover_users, compute_habit_streaks
+from kanbanapi.counters_logic import rebuild_counters, get_counters
+
+
+User = get_user_model()
+
+DAY_1 = datetime.date(2026, 3, 1)
+DAY_2 = DAY_1 + datetime.timedelta(days=1)
+DAY_3 = DAY_2 + datetime.timedelta(days=1)
+
+
+def counter_values(user):
+    counters = UserActivityCounters.objects.get(user=user)
+    return {field.name: getattr(counters, field.name) for field in counters._meta.fields if field.name not in ('id', 'user', 'updated_at')}
+
+
+class RolloverTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('rolly', 'rolly@example.com', 'pw')
+        self.habits = [
+            HabitList.objects.create(user=self.user, habit_name='Read'),
+            HabitList.objects.create(user=self.user, habit_name='Run', habit_description='5k'),
+        ]
+        get_counters(self.user)
+
+    def complete_day(self, day, count):
+        for tracker in HabitTracker.objects.filter(habit__user=self.user, tracking_date=day).order_by('id')[:count]:
+            tracker.is_completed = True
+            tracker.save()
+
+    def test_rollover_materializes_trackers_and_habit_tasks(self):
+        self.assertEqual(rollover_users([self.user.pk], DAY_1), 1)
+
+        self.assertEqual(HabitTracker.objects.filter(habit__user=self.user, tracking_date=DAY_1).count(), 2)
+        tasks = TaskCard.objects.filter(user=self.user, is_habit=True)
+        self.assertEqual(sorted(tasks.values_list('title', flat=True)), ['Read', 'Run'])
+        self.assertTrue(all(task.habit_tracker_id and task.status == 'to_do' and task.position for task in tasks))
+        summary = HabitDaySummary.objects.get(user=self.user, date=DAY_1)
+        self.assertEqual((summary.total, summary.completed), (2, 0))
+
+    def test_rollover_is_idempotent(self):
+        rollover_users([self.user.pk], DAY_1)
+        counters = counter_values(self.user)
+
+        self.assertEqual(rollover_users([self.user.pk], DAY_1), 0)
+
+        self.assertEqual(HabitTracker.objects.filter(habit__user=self.user).count(), 2)
+        self.assertEqual(TaskCard.objects.filter(user=self.user, is_habit=True).count(), 2)
+        self.assertEqual(counter_values(self.user), counters)
+
+    def test_next_day_replaces_habit_tasks_and_finalizes_the_previous_day(self):
+        rollover_users([self.user.pk], DAY_1)
+        old_task_ids = set(TaskCard.objects.filter(user=self.user).values_list('id', flat=True))
+        self.complete_day(DAY_1, 2)
+
+        rollover_users([self.user.pk], DAY_2)
+
+        tasks = TaskCard.objects.filter(user=self.user)
+        self.assertEqual(tasks.count(), 2)
+        self.assertFalse(old_task_ids & set(tasks.values_list('id', flat=True)))
+        self.assertTrue(all(task.due_date == DAY_2 for task in tasks))
+        summary = HabitDaySummary.objects.get(user=self.user, date=DAY_1)
+        self.assertEqual((summary.completed, summary.percentage, summary.streak_at_day), (2, 100, 1))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.habit_streak, 1)
+
+    def test_counters_match_a_rebuild_after_rollovers(self):
+        rollover_users([self.user.pk], DAY_1)
+        rollover_users([self.user.pk], DAY_2)
+        counters = counter_values(self.user)
+
+        rebuild_counters([self.user.pk])
+
+        self.assertEqual(counter_values(self.user), counters)
+        self.assertEqual(counters['tasks_to_do'], 2)
+
+    def test_streaks_grow_on_completed_days_and_reset_on_missed_ones(self):
+        rollover_users([self.user.pk], DAY_1)
+        self.complete_day(DAY_1, 2)
+        rollover_users([self.user.pk], DAY_2)
+        self.complete_day(DAY_2, 2)
+        rollover_users([self.user.pk], DAY_3)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.habit_streak, 2)
+        streaks = compute_habit_streaks(self.user, DAY_3)
+        self.assertEqual((streaks['current'], streaks['longest']), (2, 2))
+        self.assertEqual(streaks['top'][0]['start'], DAY_1)
+
+        # Half of the habits (below STREAK_PERCENTAGE) breaks the streak
+        self.complete_day(DAY_3, 1)
+        rollover_users([self.user.pk], DAY_3 + datetime.timedelta(days=1))
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.habit_streak, 0)
+        self.assertEqual(HabitDaySummary.objects.get(user=self.user, date=DAY_3).streak_at_day, 0)
+
+    def test_rollover_command_runs_every_user(self):
+        other = User.objects.create_user('other', 'other@example.com', 'pw')
+        HabitList.objects.create(user=other, habit_name='Stretch')
+
+        call_command('rollover_habits', date=DAY_1.isoformat(), stdout=io.StringIO())
+
+        self.assertEqual(HabitTracker.objects.filter(tracking_date=DAY_1).count(), 3)
+        self.assertEqual(TaskCard.objects.filter(user=other, is_habit=True).count(), 1)
@@ -0,0 +1,82 @@
+import datetime
+import re
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from kanbanapi.models import TaskCard, JournalEntry
+from kanbanapi.serializers import PREVIEW_LENGTH
+
+
+User = get_user_model()
+
+
+class SparseFieldsTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('sparse', 'sparse@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.long_text = ''.join(str(n % 10) for n in range(PREVIEW_LENGTH * 3))
+        self.long_task = TaskCard.objects.create(user=self.user, title='Long', summary=self.long_text)
+        TaskCard.objects.create(user=self.user, title='Short', summary='Brief')
+        self.entry = JournalEntry.objects.create(user_id=self.user, title='Long', content=self.long_text, entry_date=datetime.date(2026, 3, 1))
+        JournalEntry.objects.create(user_id=self.user, title='Short', content='Brief', entry_date=datetime.date(2026, 3, 2))
+
+    def list_sql(self, url, table, params=None):
+        """
+        Returns the list's response and the SQL of its query on `table`, without the preview expressions.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        [sql] = [query['sql'] for query in queries.captured_queries if f'FROM "{table}"' in query['sql']]
+        return response, re.sub(r'SUBSTR\(.*?\)', 'SUBSTR()', sql, flags=re.IGNORECASE)
+
+    def test_task_list_skips_the_summary_column(self):
+        response, sql = self.list_sql('/api/tasks/', 'kanbanapi_taskcard', {'fields': 'id,title,summary_preview'})
+
+        self.assertNotIn('"kanbanapi_taskcard"."summary"', sql)
+        self.assertIn('SUBSTR()', sql.upper())
+        tasks = {task['title']: task for task in response.data}
+        self.assertEqual(set(tasks['Long']), {'id', 'title', 'summary_preview'})
+        self.assertEqual(tasks['Long']['summary_preview'], self.long_text[:PREVIEW_LENGTH])
+        self.assertEqual(tasks['Short']['summary_preview'], 'Brief')
+
+    def test_task_list_without_fields_is_unchanged(self):
+        response, sql = self.list_sql('/api/tasks/', 'kanbanapi_taskcard')
+
+        self.assertIn('"kanbanapi_taskcard"."summary"', sql)
+        long_task = next(task for task in response.data if task['title'] == 'Long')
+        self.assertEqual(long_task['summary'], self.long_text)
+        self.assertNotIn('summary_preview', long_task)
+
+    def test_journal_list_skips_the_content_column(self):
+        response, sql = self.list_sql(
+            '/api/journalentries/', 'kanbanapi_journalentry', {'fields': 'journal_entry_id,title,content_preview'},
+        )
+
+        self.assertNotIn('"kanbanapi_journalentry"."content"', sql)
+        self.assertEqual(
+            [(entry['title'], entry['content_preview']) for entry in response.data],
+            [('Short', 'Brief'), ('Long', self.long_text[:PREVIEW_LENGTH])],
+        )
+
+    def test_sparse_list_query_count_does_not_grow_with_the_rows(self):
+        params = {'fields': 'journal_entry_id,content_preview'}
+        with CaptureQueriesContext(connection) as two_entries:
+            self.client.get('/api/journalentries/', params)
+        for day in range(3, 10):
+            JournalEntry.objects.create(user_id=self.user, title='More', content=self.long_text, entry_date=datetime.date(2026, 3, day))
+
+        with self.assertNumQueries(len(two_entries)):
+            self.client.get('/api/journalentries/', params)
+
+    def test_detail_endpoints_return_the_full_text(self):
+        entry = self.client.get(f'/api/journalentries/{self.entry.pk}/').data
+        task = self.client.get(f'/api/tasks/{self.long_task.pk}/').data
+
+        self.assertEqual(entry['content'], self.long_text)
+        self.assertEqual(task['summary'], self.long_text)
+        self.assertNotIn('content_preview', entry)
@@ -0,0 +1,68 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from kanbanapi.models import TaskCard, HabitList, HabitTracker, HabitDaySummary
+from kanbanapi.habits_logic import compute_habit_streaks, rebuild_day_summaries
+
+
+User = get_user_model()
+
+
+class HabitStreakTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('streaker', 'streaker@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = datetime.date.today()
+
+    def summarize(self, percentages_by_days_ago):
+        for days_ago, percentage in percentages_by_days_ago.items():
+            HabitDaySummary.objects.create(
+                user=self.user, date=self.today - datetime.timedelta(days=days_ago),
+                total=10, completed=percentage // 10, percentage=percentage,
+            )
+
+    def test_islands_give_the_current_and_longest_streaks(self):
+        # A 4-day streak, a day below the threshold, then 2 days up to yesterday; today doesn't count yet
+        self.summarize({9: 100, 8: 80, 7: 90, 6: 100, 5: 50, 4: 100, 2: 80, 1: 100, 0: 100})
+
+        streaks = compute_habit_streaks(self.user)
+
+        self.assertEqual((streaks['current'], streaks['longest']), (2, 4))
+        self.assertEqual(
+            [(island['start'], island['length']) for island in streaks['top']],
+            [(self.today - datetime.timedelta(days=9), 4), (self.today - datetime.timedelta(days=2), 2), (self.today - datetime.timedelta(days=4), 1)],
+        )
+
+    def test_a_missed_yesterday_resets_the_current_streak_only(self):
+        self.summarize({4: 100, 3: 100, 2: 100, 1: 40})
+
+        streaks = compute_habit_streaks(self.user)
+
+        self.assertEqual((streaks['current'], streaks['longest']), (0, 3))
+
+    def test_streaks_are_cached_for_the_day(self):
+        self.summarize({1: 100})
+        self.assertEqual(compute_habit_streaks(self.user)['current'], 1)
+        self.summarize({2: 100}) # Written behind the cache's back
+
+        with self.assertNumQueries(0):
+            self.assertEqual(compute_habit_streaks(self.user)['current'], 1)
+
+    def test_toggling_a_past_tracker_invalidates_todays_streaks(self):
+        habit = HabitList.objects.create(user=self.user, habit_name='Read')
+        yesterday = self.today - datetime.timedelta(days=1)
+        tracker = HabitTracker.objects.create(habit=habit, tracking_date=yesterday, is_completed=False)
+        TaskCard.objects.create(user=self.user, title='Read', is_habit=True, habit_tracker=tracker)
+        rebuild_day_summaries(self.user.pk, [yesterday])
+        self.assertEqual(self.client.get('/api/habits/streak/').data['habitStreak'], 0)
+
+        response = self.client.put(f'/api/habittrackers/{tracker.pk}/', {'is_completed': True}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(compute_habit_streaks(self.user)['current'], 1)
+        self.assertEqual(self.client.get('/api/habits/streak/').data['habitStreak'], 1)
@@ -0,0 +1,79 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from kanbanapi.models import TaskCard, Event, Tombstone
+from kanbanapi.sync_logic import purge_tombstones, TOMBSTONE_RETENTION
+
+
+User = get_user_model()
+
+
+class SyncTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('syncer', 'syncer@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.task_ids = [
+            self.client.post('/api/tasks/', {'title': title}, format='json').data['id'] for title in ('a', 'b', 'c')
+        ]
+        self.event_id = self.client.post('/api/events/', {
+            'subject': 'Gym', 'start_time': '2026-03-01T18:00:00Z', 'end_time': '2026-03-01T19:00:00Z',
+        }, format='json').data['id']
+
+    def cursor_after_setup(self):
+        # The setup's rows are dated a minute back, out of the cursor's overlap window
+        a_minute_ago = timezone.now() - datetime.timedelta(minutes=1)
+        TaskCard.objects.update(updated_at=a_minute_ago)
+        Event.objects.update(updated_at=a_minute_ago)
+        return timezone.now().isoformat()
+
+    def sync(self, since=None):
+        response = self.client.get('/api/sync/', {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_first_sync_is_a_full_snapshot(self):
+        data = self.sync()
+
+        self.assertTrue(data['reset'])
+        self.assertEqual(sorted(task['id'] for task in data['tasks']['changed']), self.task_ids)
+        self.assertEqual([event['id'] for event in data['events']['changed']], [self.event_id])
+
+    def test_delta_returns_changes_and_tombstones_since_the_cursor(self):
+        cursor = self.cursor_after_setup()
+        self.client.put(f'/api/tasks/{self.task_ids[0]}/', {'title': 'a', 'status': 'done'}, format='json')
+        self.client.delete(f'/api/tasks/{self.task_ids[1]}/')
+        self.client.post('/api/tasks/bulk/', {'operations': [{'op': 'delete', 'id': self.task_ids[2]}]}, format='json')
+        self.client.delete(f'/api/events/{self.event_id}/')
+
+        data = self.sync(cursor)
+
+        self.assertFalse(data['reset'])
+        self.assertEqual([task['id'] for task in data['tasks']['changed']], [self.task_ids[0]])
+        self.assertEqual(sorted(data['tasks']['deleted']), self.task_ids[1:])
+        self.assertEqual(data['events'], {'changed': [], 'deleted': [self.event_id]})
+
+    def test_unchanged_data_syncs_empty(self):
+        data = self.sync(self.cursor_after_setup())
+
+        self.assertEqual(data['tasks'], {'changed': [], 'deleted': []})
+        self.assertEqual(data['journalEntries'], {'changed': [], 'deleted': []})
+
+    def test_cursor_older_than_the_tombstone_retention_resets(self):
+        cursor = (timezone.now() - TOMBSTONE_RETENTION - datetime.timedelta(days=1)).isoformat()
+
+        self.assertTrue(self.sync(cursor)['reset'])
+
+    def test_invalid_cursor_is_rejected(self):
+        self.assertEqual(self.client.get('/api/sync/', {'since': 'yesterday'}).status_code, 400)
+
+    def test_purge_keeps_recent_tombstones(self):
+        self.client.delete(f'/api/tasks/{self.task_ids[0]}/')
+        self.client.delete(f'/api/tasks/{self.task_ids[1]}/')
+        Tombstone.objects.filter(object_id=self.task_ids[0]).update(deleted_at=timezone.now() - TOMBSTONE_RETENTION * 2)
+
+        self.assertEqual(purge_tombstones(), 1)
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [self.task_ids[1]])
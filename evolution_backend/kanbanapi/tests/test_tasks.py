@@ -0,0 +1,171 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+from kanbanapi.models import TaskCard, HabitList, HabitTracker, HabitDaySummary, Tombstone
+from kanbanapi.counters_logic import get_counters
+from kanbanapi.habits_logic import rollover_users
+from kanbanapi.tasks_logic import MAX_BULK_OPERATIONS
+from kanbanapi.positions_logic import rebalance_positions, MAX_POSITION_LENGTH
+
+
+User = get_user_model()
+
+
+class TaskTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('mover', 'mover@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_task(self, title, status='to_do', **data):
+        response = self.client.post('/api/tasks/', {'title': title, 'status': status, **data}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def column(self, status):
+        return list(TaskCard.objects.filter(user=self.user, status=status).order_by('position', 'id').values_list('title', flat=True))
+
+
+class MoveTests(TaskTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.ids = {title: self.create_task(title) for title in ('a', 'b', 'c')}
+        self.done_id = self.create_task('d', status='done')
+
+    def move(self, title, **data):
+        return self.client.post(f'/api/tasks/{self.ids[title]}/move/', data, format='json')
+
+    def test_move_within_a_column(self):
+        response = self.move('c', after_id=self.ids['a'], before_id=self.ids['b'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column('to_do'), ['a', 'c', 'b'])
+
+    def test_move_to_another_column(self):
+        response = self.move('a', status='done', before_id=self.done_id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column('done'), ['a', 'd'])
+        self.assertEqual(self.column('to_do'), ['b', 'c'])
+
+    def test_ids_given_as_strings_are_accepted(self):
+        response = self.move('a', after_id=str(self.ids['c']))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column('to_do'), ['b', 'c', 'a'])
+
+    def test_malformed_ids_are_rejected(self):
+        for bad_id in ('x', [1], {'id': 1}, True, -3, 1.5):
+            with self.subTest(bad_id=bad_id):
+                response = self.move('a', after_id=bad_id)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('after_id', response.data)
+        self.assertEqual(self.column('to_do'), ['a', 'b', 'c'])
+
+    def test_moving_next_to_itself_or_a_card_of_another_column_is_rejected(self):
+        self.assertEqual(self.move('a', after_id=self.ids['a']).status_code, 400)
+        self.assertEqual(self.move('a', after_id=self.done_id).status_code, 400)
+
+
+class RebalanceTests(TaskTestCase):
+
+    def test_rebalance_keeps_the_order_with_short_keys(self):
+        for title, position in (('a', 'i' * 20), ('b', 'i' * 21), ('c', 'j')):
+            TaskCard.objects.create(user=self.user, title=title, position=position)
+
+        with self.assertLogs('kanbanapi.positions_logic', level='INFO') as logs:
+            self.assertEqual(rebalance_positions(self.user.pk, 'to_do'), 3)
+
+        self.assertEqual(self.column('to_do'), ['a', 'b', 'c'])
+        positions = TaskCard.objects.values_list('position', flat=True)
+        self.assertTrue(all(len(position) <= MAX_POSITION_LENGTH for position in positions))
+        self.assertIn("Rebalanced 3 'to_do' card positions", logs.output[0])
+
+
+class TaskPaginationTests(TaskTestCase):
+
+    def test_pages_walk_each_column_in_card_order(self):
+        for title in ('t1', 't2'):
+            self.create_task(title)
+        self.create_task('p1', status='processing')
+        self.create_task('d1', status='done')
+        self.create_task('t3')
+        titles = []
+        url = '/api/tasks/?page_size=2'
+        while url:
+            page = self.client.get(url).data
+            titles += [task['title'] for task in page['results']]
+            url = page['next']
+
+        self.assertEqual(titles, ['d1', 'p1', 't1', 't2', 't3'])
+
+
+class BulkTests(TaskTestCase):
+
+    def bulk(self, operations):
+        return self.client.post('/api/tasks/bulk/', {'operations': operations}, format='json')
+
+    def test_mixed_operations_are_applied_together(self):
+        keep_id, delete_id = self.create_task('keep'), self.create_task('drop')
+
+        response = self.bulk([
+            {'op': 'create', 'data': {'title': 'new', 'status': 'processing'}},
+            {'op': 'update', 'id': keep_id, 'data': {'status': 'done', 'priority': 'high'}},
+            {'op': 'delete', 'id': delete_id},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['status'] for result in response.data['results']], ['created', 'updated', 'deleted'])
+        self.assertEqual(self.column('processing'), ['new'])
+        self.assertEqual(self.column('done'), ['keep'])
+        self.assertEqual(self.column('to_do'), [])
+        self.assertTrue(Tombstone.objects.filter(model_name='task', object_id=delete_id).exists())
+        counters = get_counters(self.user)
+        self.assertEqual((counters.tasks_to_do, counters.tasks_processing, counters.tasks_done, counters.tasks_high), (0, 1, 1, 1))
+
+    def test_one_invalid_operation_cancels_the_request(self):
+        task_id = self.create_task('stays')
+
+        response = self.bulk([
+            {'op': 'update', 'id': task_id, 'data': {'status': 'done'}},
+            {'op': 'create', 'data': {'status': 'nope'}},
+            {'op': 'update', 'id': task_id, 'data': {'title': 'twice'}},
+            {'op': 'archive', 'id': task_id},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        results = response.data['results']
+        self.assertEqual([result['status'] for result in results], ['ok', 'error', 'error', 'error'])
+        self.assertIn('title', results[1]['errors'])
+        self.assertIn('id', results[2]['errors'])
+        self.assertIn('op', results[3]['errors'])
+        self.assertEqual(self.column('to_do'), ['stays'])
+
+    def test_other_users_tasks_are_not_found(self):
+        other = User.objects.create_user('other', 'other@example.com', 'pw')
+        foreign = TaskCard.objects.create(user=other, title='theirs')
+
+        response = self.bulk([{'op': 'delete', 'id': foreign.pk}])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(TaskCard.objects.filter(pk=foreign.pk).exists())
+
+    def test_operation_list_is_required_and_bounded(self):
+        self.assertEqual(self.bulk([]).status_code, 400)
+        too_many = [{'op': 'create', 'data': {'title': str(n)}} for n in range(MAX_BULK_OPERATIONS + 1)]
+        self.assertEqual(self.bulk(too_many).status_code, 400)
+        self.assertFalse(TaskCard.objects.exists())
+
+    def test_completing_a_habit_task_completes_its_tracker(self):
+        habit = HabitList.objects.create(user=self.user, habit_name='Floss')
+        rollover_users([self.user.pk], datetime.date.today())
+        task = TaskCard.objects.get(user=self.user, is_habit=True)
+
+        response = self.bulk([{'op': 'update', 'id': task.pk, 'data': {'status': 'done'}}])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(HabitTracker.objects.get(habit=habit).is_completed)
+        self.assertEqual(HabitDaySummary.objects.get(user=self.user, date=datetime.date.today()).completed, 1)
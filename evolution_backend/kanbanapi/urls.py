@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from kanbanapi.views import UserRegistrationView, UserLoginView, UserProfileView, TaskCardViewSet, HabitListViewSet, HabitTrackerViewSet, EventViewSet, TodayJournalEntryView, JournalEntryListView, BadgeListView, UserBadgeListView,HabitCompletionWeeklyView, HabitStreakView,TaskTypeCountsView,TaskPriorityCountsView,TaskStatusCountsView, TaskCompletionRateView, UpcomingEventsView
+from kanbanapi.views import UserRegistrationView, UserLoginView, UserProfileView, TaskCardViewSet, HabitListViewSet, HabitTrackerViewSet, EventViewSet, TodayJournalEntryView, JournalStatsView, JournalEntryListView, JournalEntryDetailView, BadgeListView, UserBadgeListView,HabitCompletionWeeklyView, HabitStreakView,TaskTypeCountsView,TaskPriorityCountsView,TaskStatusCountsView, TaskCompletionRateView, UpcomingEventsView, DashboardView, TaskCompletionSeriesView, HabitHeatmapView, SyncView, ExportView, ImportView
 
 
 router = DefaultRouter()
@@ -16,17 +16,25 @@ urlpatterns = [
     path('login/', UserLoginView.as_view(), name='login'),       # URL for user login
     path('user/profile/', UserProfileView.as_view(), name='user-profile'), # ADD THIS LINE for user profile endpoint
     path('journalentries/today/', TodayJournalEntryView.as_view(), name='today-journal-entry'),
+    path('journalentries/stats/', JournalStatsView.as_view(), name='journal-stats'),
+    path('journalentries/<int:pk>/', JournalEntryDetailView.as_view(), name='journal-detail'),
     path('journalentries/', JournalEntryListView.as_view(), name='journal-list'), # URL for listing all journal entries
     path('badges/', BadgeListView.as_view(), name='badge-list'), # URL for listing all badges - accessible at /api/badges/
     path('users/badges/', UserBadgeListView.as_view(), name='user-badge-list'), # NEW URL for user badges
 
     path('habits/weekly-completion/', HabitCompletionWeeklyView.as_view(), name='habit-weekly-completion'),
     path('habits/streak/', HabitStreakView.as_view(), name='habit-streak'),
+    path('habits/heatmap/', HabitHeatmapView.as_view(), name='habit-heatmap'),
     path('tasks/status-counts/', TaskStatusCountsView.as_view(), name='task-status-counts'), # New URL
     path('tasks/priority-counts/', TaskPriorityCountsView.as_view(), name='task-priority-counts'), # New URL
     path('tasks/type-counts/', TaskTypeCountsView.as_view(), name='task-type-counts'), # New URL
     path('tasks/completion-rate/', TaskCompletionRateView.as_view(), name='task-completion-rate'),
+    path('tasks/completion-series/', TaskCompletionSeriesView.as_view(), name='task-completion-series'),
     path('events/upcoming/', UpcomingEventsView.as_view(), name='events-upcoming'),
+    path('dashboard/', DashboardView.as_view(), name='dashboard'), # All dashboard analytics in one request
+    path('sync/', SyncView.as_view(), name='sync'), # Delta sync: rows changed/deleted since a cursor
+    path('export/', ExportView.as_view(), name='export'), # Streaming download of all the user's data
+    path('import/', ImportView.as_view(), name='import'), # Bulk import of tasks / events from CSV or iCalendar
 
     path('', include(router.urls)), # Include URLs generated by the router
     
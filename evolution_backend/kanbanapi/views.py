@@ -6,18 +6,36 @@ from rest_framework.response import Response
 from rest_framework import status, viewsets, generics,permissions # Removed serializers import, added viewsets
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework.authtoken.models import Token
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.authentication import TokenAuthentication
+from .authentication import CachedTokenAuthentication
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.conf import settings
 from .serializers import UserRegistrationSerializer, TaskCardSerializer, HabitListSerializer, HabitTrackerSerializer, EventSerializer, JournalEntrySerializer, BadgeSerializer, UserBadgeSerializer,UserProfileUpdateSerializer # <---- Import serializers from serializers.py
 from .models import TaskCard, HabitList, HabitTracker, Event, JournalEntry, Badge, UserBadge
 from django.utils import timezone
-from .badges_logic import check_and_award_badges
-from django.db.models import Count, Case, When, DateField
+from django.http import StreamingHttpResponse
+from .jobs_logic import enqueue, enqueue_badge_check
+from .counters_logic import get_counters, record_task_change, apply_counter_deltas
+from .cache_logic import bump_data_versions, cache_per_user, ConditionalListMixin
+from .journal_logic import save_journal_entry
+from .habits_logic import set_habit_completion, rebuild_day_summaries, habit_heatmap
+from .sync_logic import record_deletions, sync_data, parse_cursor
+from .pagination import TaskCursorPagination, EventCursorPagination, JournalEntryCursorPagination
+from .filters_logic import choice_param, bool_param, id_param, date_param, datetime_param
+from .tasks_logic import apply_task_operations, MAX_BULK_OPERATIONS
+from .positions_logic import next_positions, move_position, needs_rebalance
+from .export_logic import iter_export, export_filename, EXPORT_FORMATS
+from .import_logic import import_rows, iter_import_rows, guess_import_format, ImportFileError
+from .analytics_logic import (
+    task_counts_data, task_completion_week_data, habit_completion_week_data, habit_streak_data, journal_stats_data, upcoming_events_data,
+    dashboard_data, DASHBOARD_SECTIONS, task_completion_series, completion_periods, current_week,
+    COMPLETION_GRANULARITIES, MAX_COMPLETION_PERIODS,
+)
+from django.db.models import F, Count, Case, When, DateField
 from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser # Make sure these are imported
+from rest_framework.decorators import action
 from collections import defaultdict
 
 
@@ -80,86 +98,11 @@ class UserLoginView(APIView):
 
         if user is not None:
             token, created = Token.objects.get_or_create(user=user)
-
-            # --- Habit Tracking Logic Start ---
-            today_date = datetime.date.today()
-            yesterday_date = today_date - datetime.timedelta(days=1)
-
-            # 1. Delete previous day's habit task cards
-            previous_day_habit_tasks = TaskCard.objects.filter(
-                user=user,
-                is_habit=True,
-                due_date__lt=today_date
-            )
-            deleted_count, _ = previous_day_habit_tasks.delete()
-            if deleted_count > 0:
-                print(f"Deleted {deleted_count} habit task(s) from {yesterday_date} for user {user.username}.")
-
-            last_tracker_entry = HabitTracker.objects.filter(habit__user=user).order_by('-tracking_date').first()
-
-            if last_tracker_entry:
-                last_tracking_date = last_tracker_entry.tracking_date
-            else:
-                last_tracking_date = None # No habit tracking data yet
-
-            if last_tracking_date != today_date: # It's a new day!
-                # 2. Calculate and Save Previous Day's Completion Percentage (if there was a previous day)
-                if last_tracking_date:
-                    previous_day_trackers = HabitTracker.objects.filter(habit__user=user, tracking_date=last_tracking_date)
-                    total_habits_previous_day = previous_day_trackers.count()
-                    completed_habits_previous_day = previous_day_trackers.filter(is_completed=True).count()
-                    if total_habits_previous_day > 0:
-                        previous_day_completion_percentage = (completed_habits_previous_day / total_habits_previous_day) * 100
-                        for tracker in previous_day_trackers: # Update all trackers for previous day with percentage
-                            tracker.completion_percentage = previous_day_completion_percentage
-                            tracker.save()
-
-                 # --- Habit Streak Calculation ---
-                if previous_day_completion_percentage is not None and previous_day_completion_percentage >= 80:
-                    user.habit_streak += 1
-                else:
-                    user.habit_streak = 0
-                user.save()
-                # --- End of Habit Streak Calculation ---
-
-                # 3. Create HabitTracker entries for today (using get_or_create to avoid duplicates)
-                user_habits = HabitList.objects.filter(user=user)
-                for habit in user_habits:
-                    habit_tracker_entry, created_tracker = HabitTracker.objects.get_or_create(
-                        habit=habit,
-                        tracking_date=today_date,
-                        defaults={'is_completed': False, 'completion_percentage': 0.00} # Set defaults for new entries
-                    )
-
-                    # 4. Create corresponding TaskCard objects for today's habits (if they don't exist) and link them
-                    existing_task = TaskCard.objects.filter(
-                        user=user,
-                        is_habit=True,
-                        title=habit.habit_name,
-                        due_date=today_date,
-                        habit_tracker=habit_tracker_entry # Also check for the linked habit tracker
-                    ).first()
-
-                    if not existing_task:
-                        task_card = TaskCard.objects.create(
-                            user=user,
-                            is_habit=True,
-                            title=habit.habit_name,
-                            summary=habit.habit_description if habit.habit_description else "", # Optional description
-                            due_date=today_date,
-                            status='to_do', # You can set a default status for habit-tasks
-                            habit_tracker=habit_tracker_entry # Link the TaskCard to the HabitTracker entry
-                        )
-                        print(f"Created task card '{task_card.title}' and linked to HabitTracker entry.")
-                    elif existing_task and existing_task.habit_tracker is None:
-                        # If task exists but is not linked, link it (this might happen from previous implementations)
-                        existing_task.habit_tracker = habit_tracker_entry
-                        existing_task.save()
-                        print(f"Linked existing task card '{existing_task.title}' to HabitTracker entry.")
-
-            # --- Habit Tracking Logic End ---
-
-            check_and_award_badges(user) # Call the function to check and award badges for the logged-in user
+            # Catch-up work runs in the background (`run_jobs` worker), so login stays a credential check:
+            # today's habits for users the nightly `rollover_habits` run hasn't reached yet, and a full badge check.
+            with transaction.atomic():
+                enqueue('rollover_user', {'user_id': user.pk}, dedupe_key=f'rollover_user:{user.pk}')
+                enqueue_badge_check(user.pk)
 
             return Response(
                 {'message': 'Login successful!', 'token': token.key},
@@ -180,7 +123,7 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     Supports partial updates (PATCH).
     """
     serializer_class = UserProfileUpdateSerializer # Use the serializer for updates
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     # Add parsers for handling file uploads (like profile image)
 
@@ -201,89 +144,215 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
 # --- End of replacement code for UserProfileView ---
 
 
-class TaskCardViewSet(viewsets.ModelViewSet):
+class TaskCardViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     """
     API ViewSet for CRUD operations on TaskCard model.
     Requires authentication.
     """
+    etag_scope = 'tasks'
     queryset = TaskCard.objects.all() # Get all tasks initially, filter in get_queryset
     serializer_class = TaskCardSerializer # Use the TaskCardSerializer we just created/moved
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskCursorPagination # Only when ?page_size= is given
 
     def get_queryset(self):
         """
         Override get_queryset to filter tasks for the current user only.
+        The list also supports ?status=, ?priority=, ?task_type= (comma-separated), ?due_after=, ?due_before=,
+        ?is_habit= and ?is_event=, and ?fields= (e.g. ?fields=id,title,status,position,summary_preview) to skip the summaries.
         """
-        return TaskCard.objects.filter(user=self.request.user)
+        queryset = TaskCard.objects.filter(user=self.request.user).select_related('user')
+        if self.action != 'list':
+            return queryset
+        params = self.request.query_params
+        for field, choices in (
+            ('status', TaskCard.STATUS_CHOICES),
+            ('priority', TaskCard.PRIORITY_CHOICES),
+            ('task_type', TaskCard.TASK_TYPE_CHOICES),
+        ):
+            values = choice_param(params, field, choices)
+            if values:
+                queryset = queryset.filter(**{f'{field}__in': values})
+        due_after = date_param(params, 'due_after')
+        if due_after:
+            queryset = queryset.filter(due_date__gte=due_after)
+        due_before = date_param(params, 'due_before')
+        if due_before:
+            queryset = queryset.filter(due_date__lte=due_before)
+        for field in ('is_habit', 'is_event'):
+            value = bool_param(params, field)
+            if value is not None:
+                queryset = queryset.filter(**{field: value})
+        queryset = queryset.order_by('status', 'position', 'id') # Each column in card order
+        return TaskCardSerializer.sparse_queryset(queryset, self.request)
 
     def perform_create(self, serializer):
         """
         Override perform_create to automatically set the user when creating a task.
         """
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            status_value = serializer.validated_data.get('status', 'to_do')
+            task_card = serializer.save(user=self.request.user, position=next_positions(self.request.user.pk, status_value)[0])
+            record_task_change(self.request.user.pk, new=task_card)
+            bump_data_versions(self.request.user.pk, 'tasks')
+            if task_card.status == 'done':
+                enqueue_badge_check(self.request.user.pk, ['task'])
 
     def update(self, request, pk=None):
         """
         Override the update method to handle status changes for habit tasks and sync with HabitTracker.
         """
         try:
-            task_card = TaskCard.objects.get(pk=pk, user=request.user)
+            task_card = TaskCard.objects.select_related('habit_tracker').get(pk=pk, user=request.user)
         except TaskCard.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
+        task_card.user = request.user # Serializer output reads user.username
 
+        previous_status = task_card.status
+        previous_counts = {'status': task_card.status, 'priority': task_card.priority, 'task_type': task_card.task_type}
         serializer = self.get_serializer(task_card, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                new_status = serializer.validated_data.get('status', previous_status)
+                if new_status != previous_status:
+                    serializer.save(position=next_positions(request.user.pk, new_status)[0]) # Changing column: append
+                else:
+                    serializer.save()
+                record_task_change(request.user.pk, old=previous_counts, new=task_card)
 
-            # --- Habit Tracker Sync (Task to Habit) ---
-            if task_card.is_habit and task_card.habit_tracker: # Check if it's a habit task and linked
-                habit_tracker = task_card.habit_tracker
-                if serializer.validated_data.get('status') == 'done':
-                    habit_tracker.is_completed = True
-                    habit_tracker.save()
-                    print(f"Habit task card '{task_card.title}' marked as done. Habit '{habit_tracker.habit.habit_name}' marked as completed.")
-                elif serializer.validated_data.get('status') == 'to_do':
-                    habit_tracker.is_completed = False
-                    habit_tracker.save()
-                    print(f"Habit task card '{task_card.title}' marked as to_do. Habit '{habit_tracker.habit.habit_name}' marked as not completed.")
+                # --- Habit Tracker Sync (Task to Habit) ---
+                if task_card.is_habit and task_card.habit_tracker and serializer.validated_data.get('status') in ('done', 'to_do'):
+                    # Bumps 'tasks' in the same UPDATE as 'habits'
+                    set_habit_completion(request.user.pk, task_card.habit_tracker, task_card.status == 'done', bump_scopes=['tasks'])
+                else:
+                    bump_data_versions(request.user.pk, 'tasks')
+
+                if task_card.status == 'done' and previous_status != 'done':
+                    enqueue_badge_check(request.user.pk, ['task'])
 
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def perform_destroy(self, instance):
+        """
+        Override perform_destroy to keep the user's task counters in sync.
+        """
+        with transaction.atomic():
+            record_deletions('task', [(self.request.user.pk, instance.pk)])
+            instance.delete()
+            record_task_change(self.request.user.pk, old=instance)
+            bump_data_versions(self.request.user.pk, 'tasks')
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Applies several create/update/delete operations (e.g. a multi-card drag-and-drop) in one transaction.
+        Body: {"operations": [{"op": "update", "id": 1, "data": {"status": "done"}}, ...]}.
+        All operations are validated first: if any is invalid, nothing is written and 400 lists the per-item errors.
+        """
+        operations = request.data.get('operations')
+        if not isinstance(operations, list) or not operations:
+            return Response({'error': "'operations' must be a non-empty list."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(operations) > MAX_BULK_OPERATIONS:
+            return Response({'error': f"At most {MAX_BULK_OPERATIONS} operations per request."}, status=status.HTTP_400_BAD_REQUEST)
+
+        results, ok = apply_task_operations(request.user, operations)
+        return Response({'results': results}, status=status.HTTP_200_OK if ok else status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=['post'])
+    def move(self, request, pk=None):
+        """
+        Moves a card within its column or to another one: {"status": "done", "after_id": 3, "before_id": 7}.
+        `after_id` / `before_id` are the cards that end up directly above / below it (omit them for the end of the column).
+        Only the moved card is written.
+        """
+        try:
+            task_card = TaskCard.objects.get(pk=pk, user=request.user)
+        except TaskCard.DoesNotExist:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        new_status = request.data.get('status', task_card.status)
+        after_id, before_id = id_param(request.data, 'after_id'), id_param(request.data, 'before_id')
+        if task_card.pk in (after_id, before_id):
+            return Response({'error': 'A card cannot be moved next to itself.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            position = move_position(request.user, new_status, after_id, before_id)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        results, ok = apply_task_operations(
+            request.user, [{'op': 'update', 'id': task_card.pk, 'data': {'status': new_status}, 'position': position}]
+        )
+        if not ok:
+            return Response(results[0]['errors'], status=status.HTTP_400_BAD_REQUEST)
+        if needs_rebalance(position):
+            enqueue(
+                'rebalance_positions', {'user_id': request.user.pk, 'status': new_status},
+                dedupe_key=f'rebalance_positions:{request.user.pk}:{new_status}',
+            )
+        return Response(results[0]['data'])
     
         
 
-class HabitListViewSet(viewsets.ModelViewSet):
+class HabitListViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     """
     API ViewSet for CRUD operations on HabitList model.
     Requires authentication.
     """
+    etag_scope = 'habits'
     queryset = HabitList.objects.all() # Get all habits initially, filter in get_queryset
     serializer_class = HabitListSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         """
         Override get_queryset to filter habits for the current user only.
         """
-        return HabitList.objects.filter(user=self.request.user)
+        queryset = HabitList.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            queryset = HabitListSerializer.sparse_queryset(queryset, self.request)
+        return queryset
 
     def perform_create(self, serializer):
         """
         Override perform_create to automatically set the user when creating a habit.
         """
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            serializer.save(user=self.request.user)
+            bump_data_versions(self.request.user.pk, 'habits')
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+            bump_data_versions(self.request.user.pk, 'habits')
+
+    def perform_destroy(self, instance):
+        """
+        Override perform_destroy to refresh today's habit summary, since the habit's trackers are deleted with it.
+        """
+        with transaction.atomic():
+            user_id = self.request.user.pk
+            record_deletions('habit', [(user_id, instance.pk)])
+            record_deletions('habit_tracker', [(user_id, tracker_id) for tracker_id in instance.habittracker_set.values_list('id', flat=True)])
+            instance.delete()
+            rebuild_day_summaries(self.request.user.pk, [datetime.date.today()])
+            bump_data_versions(self.request.user.pk, 'habits')
 
 
 # --- HabitTracker ViewSet ---
-class HabitTrackerViewSet(viewsets.ModelViewSet): # Keep using ModelViewSet for update action
+class HabitTrackerViewSet(ConditionalListMixin, viewsets.ModelViewSet): # Keep using ModelViewSet for update action
     """
-    API ViewSet for retrieving and updating HabitTracker entries.
+    API ViewSet for retrieving, updating and deleting HabitTracker entries.
+    Trackers are only created by the daily rollover, so POST is not allowed.
     Requires authentication.
     """
+    etag_scope = 'habits'
+    etag_daily = True # The list shows today's trackers
+    http_method_names = ['get', 'put', 'delete', 'head', 'options']
     serializer_class = HabitTrackerSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -294,61 +363,92 @@ class HabitTrackerViewSet(viewsets.ModelViewSet): # Keep using ModelViewSet for
         return HabitTracker.objects.filter(habit__user=self.request.user, tracking_date=today_date)
 
 
-    def list(self, request, *args, **kwargs):
-        """
-        Override list action to return Habits for Today.
-        """
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
-
-
     def update(self, request, pk=None): # Add the 'update' action to handle PUT requests
         """
         Update the is_completed status of a HabitTracker entry and sync with TaskCard.
         """
         try:
-            tracker_entry = HabitTracker.objects.get(pk=pk, habit__user=request.user) # Get tracker entry, verify user ownership
+            # Tracker entry, its task and the user's done task count (for the badge thresholds) in one query; verifies ownership
+            tracker_entry = (
+                HabitTracker.objects.select_related('habit', 'task_card')
+                .annotate(tasks_done=F('habit__user__activity_counters__tasks_done'))
+                .get(pk=pk, habit__user=request.user)
+            )
         except HabitTracker.DoesNotExist:
             return Response({'error': 'HabitTracker entry not found.'}, status=status.HTTP_404_NOT_FOUND)
 
         serializer = self.get_serializer(tracker_entry, data=request.data, partial=True) # Use partial=True to allow partial updates
         if serializer.is_valid():
-            serializer.save() # Save the updated is_completed status
-
-            # --- TaskCard Sync (Habit to Task) ---
-            task_card = tracker_entry.task_card.first() # Access the linked TaskCard
-
-            if task_card:
-                if serializer.validated_data.get('is_completed') is True:
-                    task_card.status = 'done'
-                    task_card.save()
-                    print(f"Habit '{tracker_entry.habit.habit_name}' completed. Task card '{task_card.title}' marked as done.")
-                elif serializer.validated_data.get('is_completed') is False:
-                    task_card.status = 'to_do'
-                    task_card.save()
-                    print(f"Habit '{tracker_entry.habit.habit_name}' marked as not completed. Task card '{task_card.title}' set to to_do.")
+            completed = serializer.validated_data.get('is_completed')
+            if completed is not None: # is_completed is the only writable field
+                with transaction.atomic():
+                    # --- TaskCard Sync (Habit to Task) ---
+                    task_card = getattr(tracker_entry, 'task_card', None) # None when the tracker has no task
+                    set_habit_completion(request.user.pk, tracker_entry, completed, task_card, tasks_done=tracker_entry.tasks_done)
 
             return Response(serializer.data, status=status.HTTP_200_OK) # Return updated tracker entry
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST) # Return serializer validation errors
-        
 
+    def perform_destroy(self, instance):
+        """
+        Override perform_destroy to refresh the day's habit summary and unlink the tracker's task.
+        """
+        with transaction.atomic():
+            user_id = self.request.user.pk
+            record_deletions('habit_tracker', [(user_id, instance.pk)])
+            # Deleting the tracker unlinks its task (SET_NULL); touch it so delta sync re-sends it
+            TaskCard.objects.filter(habit_tracker=instance).update(habit_tracker=None, updated_at=timezone.now())
+            instance.delete()
+            rebuild_day_summaries(user_id, [instance.tracking_date])
+            bump_data_versions(user_id, 'habits', 'tasks')
 
 
-class EventViewSet(viewsets.ModelViewSet):
+
+class EventViewSet(ConditionalListMixin, viewsets.ModelViewSet):
+    etag_scope = 'events'
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticated] # Ensure only authenticated users can access events
+    pagination_class = EventCursorPagination # Only when ?page_size= is given
 
     def get_queryset(self):
         """
         This view should return a list of all events for the currently authenticated user.
+        The list can be restricted to events starting in a window with ?start_after= and/or ?start_before=.
         """
-        return Event.objects.filter(user=self.request.user)
+        queryset = Event.objects.filter(user=self.request.user)
+        if self.action != 'list':
+            return queryset
+        start_after = datetime_param(self.request.query_params, 'start_after')
+        if start_after:
+            queryset = queryset.filter(start_time__gte=start_after)
+        start_before = datetime_param(self.request.query_params, 'start_before')
+        if start_before:
+            queryset = queryset.filter(start_time__lt=start_before)
+        return EventSerializer.sparse_queryset(queryset.order_by('start_time', 'id'), self.request)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            serializer.save(user=self.request.user)
+            apply_counter_deltas(self.request.user.pk, {'events_created': 1})
+            bump_data_versions(self.request.user.pk, 'events')
+            enqueue_badge_check(self.request.user.pk, ['schedule'])
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+            bump_data_versions(self.request.user.pk, 'events')
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            record_deletions('event', [(self.request.user.pk, instance.pk)])
+            # Deleting the event unlinks its tasks (SET_NULL); touch them so delta sync re-sends them
+            if TaskCard.objects.filter(related_event=instance).update(related_event=None, updated_at=timezone.now()):
+                bump_data_versions(self.request.user.pk, 'tasks')
+            instance.delete()
+            apply_counter_deltas(self.request.user.pk, {'events_created': -1})
+            bump_data_versions(self.request.user.pk, 'events')
 
 
 
@@ -359,40 +459,75 @@ class TodayJournalEntryView(generics.GenericAPIView):
     def get(self, request):
         today_date = timezone.now().date()
         try:
-            journal_entry = JournalEntry.objects.get(user_id=request.user, date_created__date=today_date)
+            journal_entry = JournalEntry.objects.get(user_id=request.user, entry_date=today_date)
             serializer = self.get_serializer(journal_entry)
             return Response(serializer.data)
         except JournalEntry.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND, data={'detail': 'No journal entry found for today.'})
 
     def post(self, request):
+        """
+        Creates today's journal entry, or replaces its title and content if it already exists.
+        """
         today_date = timezone.now().date()
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            try:
-                # Check if an entry exists for today
-                journal_entry = JournalEntry.objects.get(user_id=request.user, date_created__date=today_date)
-                # Update existing entry
-                serializer.update(journal_entry, serializer.validated_data) # Use serializer.update to update
-                return Response(self.get_serializer(journal_entry).data, status=status.HTTP_200_OK) # Return updated entry
-            except JournalEntry.DoesNotExist:
-                # Create a new entry
-                serializer.save(user_id=request.user) # Pass user to serializer's save method
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
+            journal_entry, created = save_journal_entry(request.user, today_date, serializer.validated_data)
+            return Response(
+                self.get_serializer(journal_entry).data,
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+            )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 
 
+class JournalStatsView(APIView):
+    """
+    API endpoint for the user's journal metrics: days written, current and longest streak, entries this week and month.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @cache_per_user(['journal'])
+    def get(self, request):
+        return Response(journal_stats_data(request.user, timezone.now().date()))
+
+
 # NEW VIEW FOR LISTING ALL JOURNAL ENTRIES
-class JournalEntryListView(generics.ListAPIView):
+class JournalEntryListView(ConditionalListMixin, generics.ListAPIView):
+    etag_scope = 'journal'
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = JournalEntrySerializer
+    pagination_class = JournalEntryCursorPagination # Only when ?page_size= is given
 
     def get_queryset(self):
         """
         This view should return a list of all journal entries for the currently authenticated user.
+        ?date_from= and ?date_to= restrict it to entries written between two dates (inclusive).
+        ?fields=journal_entry_id,title,entry_date,content_preview lists entries without loading their content,
+        which is then read from /journalentries/<id>/.
         """
-        return JournalEntry.objects.filter(user_id=self.request.user).order_by('-date_created') # Order by date, newest first
+        queryset = JournalEntry.objects.filter(user_id=self.request.user)
+        # Filter and order on entry_date, so the unique (user_id, entry_date) index serves the whole query
+        date_from = date_param(self.request.query_params, 'date_from')
+        if date_from:
+            queryset = queryset.filter(entry_date__gte=date_from)
+        date_to = date_param(self.request.query_params, 'date_to')
+        if date_to:
+            queryset = queryset.filter(entry_date__lte=date_to)
+        queryset = queryset.order_by('-entry_date') # Order by date, newest first
+        return JournalEntrySerializer.sparse_queryset(queryset, self.request)
+
+
+class JournalEntryDetailView(generics.RetrieveAPIView):
+    """
+    API endpoint for one journal entry with its full content (for lists fetched with ?fields=).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = JournalEntrySerializer
+
+    def get_queryset(self):
+        return JournalEntry.objects.filter(user_id=self.request.user)
     
 
 
@@ -405,10 +540,11 @@ class BadgeListView(generics.ListAPIView):
     serializer_class = BadgeSerializer
 
 
-class UserBadgeListView(generics.ListAPIView):
+class UserBadgeListView(ConditionalListMixin, generics.ListAPIView):
     """
     API endpoint to retrieve the list of badges earned by the logged-in user.
     """
+    etag_scope = 'badges'
     serializer_class = UserBadgeSerializer
     permission_classes = [permissions.IsAuthenticated] # Only logged-in users can access
 
@@ -423,173 +559,227 @@ class UserBadgeListView(generics.ListAPIView):
 
 
 class HabitCompletionWeeklyView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @cache_per_user(['habits'])
     def get(self, request):
-        user = request.user
         today = timezone.now().date()
-        start_of_week = today - datetime.timedelta(days=today.weekday())
-        end_of_week = start_of_week + datetime.timedelta(days=6)
-        weekly_data = []
-        for i in range(7):
-            current_date = start_of_week + datetime.timedelta(days=i)
-            completed_habits_count = HabitTracker.objects.filter(
-                habit__user=user,
-                tracking_date=current_date,
-                is_completed=True
-            ).count()
-            weekly_data.append({
-                'day': current_date.strftime('%a'),  # Abbreviated day name
-                'completedHabits': completed_habits_count,
-            })
-        return Response(weekly_data)
+        return Response(habit_completion_week_data(request.user, today))
+
+class HabitHeatmapView(APIView):
+    """
+    API endpoint for per-day habit completion over a date range (up to several years), for the user and per habit.
+    Query params: start, end (YYYY-MM-DD, default to the last 365 days) and optionally habit (a habit id).
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    # Longest range a single heatmap request may cover.
+    MAX_DAYS = 5 * 366
+
+    @cache_per_user(['habits'])
+    def get(self, request):
+        today = datetime.date.today()
+        try:
+            end = date.fromisoformat(request.query_params.get('end', today.isoformat()))
+            start = date.fromisoformat(request.query_params.get('start', (end - timedelta(days=364)).isoformat()))
+        except ValueError:
+            return Response({'error': 'start and end must be dates in YYYY-MM-DD format.'}, status=status.HTTP_400_BAD_REQUEST)
+        if start > end:
+            return Response({'error': 'start must not be after end.'}, status=status.HTTP_400_BAD_REQUEST)
+        if (end - start).days + 1 > self.MAX_DAYS:
+            return Response({'error': f'The range may cover at most {self.MAX_DAYS} days.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        habit_id = request.query_params.get('habit')
+        if habit_id is not None:
+            if not habit_id.isdigit():
+                return Response({'error': 'habit must be a habit id.'}, status=status.HTTP_400_BAD_REQUEST)
+            habit_id = int(habit_id)
+
+        return Response(habit_heatmap(request.user, start, end, habit_id))
+
 
 class HabitStreakView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @cache_per_user(['habits'])
     def get(self, request):
-        user = request.user
-        today = date.today()
-
-        # Fetch past habit tracker entries (excluding today), most recent first
-        trackers = HabitTracker.objects.filter(
-            habit__user=user,
-            tracking_date__lt=today
-        ).order_by('-tracking_date')
-
-        streak = 0
-        expected_date = today - timedelta(days=1)
-
-        seen_dates = set()
-
-        for tracker in trackers:
-            track_date = tracker.tracking_date
-            if track_date in seen_dates:
-                continue  # Skip duplicates (multiple habits per day)
-            seen_dates.add(track_date)
-
-            # If there's a gap between expected and this track_date, break the streak
-            if track_date != expected_date:
-                break
-
-            # Get all trackers for that date and calculate completion
-            day_trackers = HabitTracker.objects.filter(habit__user=user, tracking_date=track_date)
-            total = day_trackers.count()
-            completed = day_trackers.filter(is_completed=True).count()
-            percentage = (completed / total) * 100 if total else 0
-
-            if percentage >= 80:
-                streak += 1
-                expected_date -= timedelta(days=1)
-            else:
-                break  # streak broken due to low completion
-
-        return Response({'habitStreak': streak})
+        return Response(habit_streak_data(request.user))
     
 
 class TaskStatusCountsView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @cache_per_user(['tasks'])
     def get(self, request):
-        user = request.user
-        status_counts = TaskCard.objects.filter(user=user).values('status').annotate(count=Count('id'))
-        formatted_data = [{'name': item['status'], 'value': item['count']} for item in status_counts]
+        counters = get_counters(request.user)
+        formatted_data = task_counts_data(counters, TaskCard.STATUS_CHOICES)
         return Response(formatted_data)
     
 class TaskPriorityCountsView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @cache_per_user(['tasks'])
     def get(self, request):
-        user = request.user
-        priority_counts = TaskCard.objects.filter(user=user).values('priority').annotate(count=Count('id'))
-        formatted_data = [{'name': item['priority'], 'value': item['count']} for item in priority_counts]
+        counters = get_counters(request.user)
+        formatted_data = task_counts_data(counters, TaskCard.PRIORITY_CHOICES)
         return Response(formatted_data)
     
 class TaskTypeCountsView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @cache_per_user(['tasks'])
     def get(self, request):
-        user = request.user
-        task_type_counts = TaskCard.objects.filter(user=user).values('task_type').annotate(count=Count('id'))
-        formatted_data = [{'name': item['task_type'], 'value': item['count']} for item in task_type_counts]
+        counters = get_counters(request.user)
+        formatted_data = task_counts_data(counters, TaskCard.TASK_TYPE_CHOICES)
         return Response(formatted_data)
     
 class TaskCompletionRateView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @cache_per_user(['tasks'])
     def get(self, request):
-        user = request.user
         today = timezone.now().date()
-
-        # Calculate the start and end of the current week (Monday to Sunday)
-        start_of_week = today - datetime.timedelta(days=today.weekday())
-        end_of_week = start_of_week + datetime.timedelta(days=6)
-
-        # Generate a list of all dates in the current week
-        all_dates = []
-        current_date = start_of_week
-        while current_date <= end_of_week:
-            all_dates.append(current_date)
-            current_date += datetime.timedelta(days=1)
-
-        # Query task completion status for each day of the current week
-        weekly_completion_data = []
-        for date in all_dates:
-            done_count = TaskCard.objects.filter(
-                user=user,
-                due_date=date,
-                status='done'
-            ).count()
-            todo_count = TaskCard.objects.filter(
-                user=user,
-                due_date=date,
-                status__in=['to_do'] # Adjust status values as needed
-            ).count()
-            weekly_completion_data.append({
-                'dueDate': date.isoformat(),
-                'Done': done_count,
-                'ToDo': todo_count,
-            })
-
-        return Response(weekly_completion_data)
+        return Response(task_completion_week_data(request.user, today))
     
 
+class TaskCompletionSeriesView(APIView):
+    """
+    API endpoint for task counts per status over any date range, grouped by due date.
+    Query params: start, end (YYYY-MM-DD, default to the current week) and granularity (day, week or month).
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @cache_per_user(['tasks'])
+    def get(self, request):
+        granularity = request.query_params.get('granularity', 'day')
+        if granularity not in COMPLETION_GRANULARITIES:
+            return Response(
+                {'error': f"granularity must be one of: {', '.join(COMPLETION_GRANULARITIES)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        start_of_week, end_of_week = current_week(timezone.now().date())
+        try:
+            start = date.fromisoformat(request.query_params.get('start', start_of_week.isoformat()))
+            end = date.fromisoformat(request.query_params.get('end', end_of_week.isoformat()))
+        except ValueError:
+            return Response({'error': 'start and end must be dates in YYYY-MM-DD format.'}, status=status.HTTP_400_BAD_REQUEST)
+        if start > end:
+            return Response({'error': 'start must not be after end.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(completion_periods(start, end, granularity)) > MAX_COMPLETION_PERIODS:
+            return Response(
+                {'error': f'The range covers more than {MAX_COMPLETION_PERIODS} periods, use a coarser granularity.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(task_completion_series(request.user, start, end, granularity))
+
+
 class UpcomingEventsView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @cache_per_user(['events'], period='minute')
     def get(self, request):
-        user = request.user
-        now = timezone.now() # Get the current date and time (with timezone)
+        return Response(upcoming_events_data(request.user, timezone.now()))
+
 
-        # To get the end of the current month (exclusive), we go to the start of the next month.
-        if now.month == 12:
-            next_month_start = now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+class DashboardView(APIView):
+    """
+    API endpoint returning all dashboard analytics in one payload.
+    Clients can ask for a subset with ?sections=statusCounts,habitStreak (comma-separated).
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @cache_per_user(['tasks', 'habits', 'events'], period='minute')
+    def get(self, request):
+        sections = request.query_params.get('sections')
+        if sections:
+            sections = [name.strip() for name in sections.split(',') if name.strip()]
+            unknown = [name for name in sections if name not in DASHBOARD_SECTIONS]
+            if unknown:
+                return Response(
+                    {'error': f"Unknown dashboard section(s): {', '.join(unknown)}. Available: {', '.join(DASHBOARD_SECTIONS)}."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         else:
-            next_month_start = now.replace(month=now.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        upcoming_events = Event.objects.filter(
-            user=user,
-            start_time__gte=now,          # Filter for events starting from the current date and time onwards
-            start_time__lt=next_month_start # Filter for events starting before the beginning of the next month
-        ).order_by('start_time')
-
-        data = [
-            {
-                'id': event.id,
-                'title': event.subject,
-                'location': event.location,
-                'start_time': event.start_time.isoformat(), # Send full ISO 8601 string
-                'end_time': event.end_time.isoformat(),     # Send full ISO 8601 string
-                'description': event.description,
-                'category_color': event.category_color,
-            }
-            for event in upcoming_events
-        ]
-        return Response(data)
\ No newline at end of file
+            sections = None
+        return Response(dashboard_data(request.user, sections))
+
+
+class SyncView(APIView):
+    """
+    Delta sync for offline-first clients: GET /api/sync/?since=<cursor> returns the tasks, events, habits,
+    habit trackers and journal entries changed or deleted since the cursor returned by the previous call.
+    Without `since`, returns a full snapshot.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = parse_cursor(since)
+            except ValueError:
+                return Response({'error': "Invalid 'since' cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(sync_data(request.user, since or None))
+
+
+class ExportView(APIView):
+    """
+    Streams a download of all of the user's data (tasks, habits, habit trackers, events, journal entries, badges).
+    ?export_format=ndjson (default) gives newline-delimited JSON, ?export_format=csv a zip with one CSV per table.
+    Rows are read and written in chunks, so memory use doesn't grow with the size of the history.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return Response({'error': f"export_format must be one of: {', '.join(EXPORT_FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+        response = StreamingHttpResponse(
+            iter_export(request.user, export_format),
+            content_type='application/x-ndjson' if export_format == 'ndjson' else 'application/zip',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{export_filename(request.user, export_format)}"'
+        return response
+
+
+class ImportView(APIView):
+    """
+    Bulk import of tasks or events from an uploaded file: POST multipart with `file` (CSV with a header row,
+    or an iCalendar .ics file for events), `kind` ('tasks' or 'events') and optionally `skip_invalid`.
+    CSV columns are the serializer field names (an /api/export/ CSV can be imported as is).
+    Rows are validated like POST /tasks/ and /events/ and inserted in batches; the response lists the row errors.
+    Without skip_invalid, any invalid row cancels the whole import (400).
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = (MultiPartParser, FormParser)
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'Upload the file to import as `file`.'}, status=status.HTTP_400_BAD_REQUEST)
+        kind = request.data.get('kind', 'tasks')
+        skip_invalid = bool_param(request.data, 'skip_invalid') or False
+        file_format = request.data.get('file_format') or guess_import_format(upload.name)
+        try:
+            report = import_rows(request.user, kind, iter_import_rows(upload, kind, file_format), skip_invalid=skip_invalid)
+        except ImportFileError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        except UnicodeDecodeError:
+            return Response({'error': 'The file must be UTF-8 encoded.'}, status=status.HTTP_400_BAD_REQUEST)
+        if report['error_count'] and not skip_invalid:
+            return Response(report, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK)